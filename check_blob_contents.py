@@ -1,8 +1,11 @@
 import os
+import sys
 import json
 from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient
-from urllib.parse import urlparse
+
+# Gleicher Modulpfad wie in document_training (ein blob_access-Modul, ein Client-Pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from blob_access import get_container_client, parse_sas_url
 
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
@@ -10,19 +13,13 @@ load_dotenv('config.env')
 blob_sas_url = os.getenv('BLOBSASURL')
 print(f"Blob URL: {blob_sas_url}")
 
-# Erstelle BlobServiceClient mit SAS URL
-blob_service_client = BlobServiceClient(account_url=blob_sas_url)
-
-# Parse die SAS URL um Container-Name zu extrahieren
-parsed_url = urlparse(blob_sas_url)
-container_name = parsed_url.path.split('/')[-1]
-if not container_name:
-    container_name = "container2"  # Fallback falls Container-Name nicht extrahiert werden kann
+# Container-Name aus der SAS URL (Fallback: container2)
+container_name = parse_sas_url(blob_sas_url).container_name
 
 print(f"Container Name: {container_name}")
 
-# Erstelle Container Client
-container_client = blob_service_client.get_container_client(container_name)
+# Gemeinsamer, gepoolter Container Client
+container_client = get_container_client(sas_url=blob_sas_url)
 
 # Liste alle Blobs im Container
 print("\nAktuelle Blobs im Container:")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Korpusweiter Vergleich der PDF-Extraktion (PyPDF2, pdfplumber, PyMuPDF)
+
+- Jede PDF wird pro Backend genau einmal extrahiert (Prozess-Pool) und im Cache
+  abgelegt; Schlüssel ist der SHA-256 des PDF-Inhalts
+- Danach paarweise Wort-Ausrichtung und Muster-Zählung je Dokument (ebenfalls parallel)
+- Ergebnis ist ein aggregierter Bericht: Übereinstimmung je Muster,
+  Ähnlichkeit je Backend-Paar, Extraktionszeit je Backend
+
+Verwendung:
+    python compare_extraction_corpus.py <ordner> [--workers N] [--cache-dir DIR] [--diff-dir DIR]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import statistics
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pdf_extraction_comparison import (
+    extract_with_pypdf2, extract_with_pdfplumber, extract_with_pymupdf,
+    align_texts, difference_statistics, count_patterns, write_differences_report
+)
+
+BACKENDS = {
+    'pypdf2': extract_with_pypdf2,
+    'pdfplumber': extract_with_pdfplumber,
+    'pymupdf': extract_with_pymupdf
+}
+
+DEFAULT_CACHE_DIR = '.extraction_cache'
+DEFAULT_REPORT = 'extraction_corpus_report.json'
+
+
+def pdf_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(cache_dir, backend, digest):
+    return os.path.join(cache_dir, backend, f"{digest}.json")
+
+
+def load_cached(cache_dir, backend, digest):
+    try:
+        with open(cache_path(cache_dir, backend, digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _extract_task(pdf_path, backend, digest, cache_dir):
+    """Worker: extrahiert eine PDF mit einem Backend und schreibt das Ergebnis in den Cache"""
+    start_time = time.perf_counter()
+    text = BACKENDS[backend](pdf_path)
+    seconds = time.perf_counter() - start_time
+
+    # Die Extraktionsfunktionen liefern Fehler als Text zurück
+    error = text if text.startswith('Fehler bei ') else None
+    entry = {
+        'pdf': os.path.basename(pdf_path),
+        'backend': backend,
+        'seconds': round(seconds, 4),
+        'error': error,
+        'text': '' if error else text
+    }
+
+    path = cache_path(cache_dir, backend, digest)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return backend, digest, entry['seconds'], error
+
+
+def _compare_task(pdf_name, digest, backends, cache_dir, diff_dir):
+    """Worker: Muster-Zählung je Backend und paarweise Ausrichtung für ein Dokument"""
+    texts = {}
+    for backend in backends:
+        entry = load_cached(cache_dir, backend, digest)
+        if entry and not entry['error']:
+            texts[backend] = entry['text']
+
+    patterns = {backend: {name: result['count'] for name, result in count_patterns(text, 0).items()}
+                for backend, text in texts.items()}
+
+    pairs = {}
+    for backend1, backend2 in itertools.combinations([b for b in backends if b in texts], 2):
+        text1, text2 = texts[backend1], texts[backend2]
+        if diff_dir:
+            stem = os.path.splitext(pdf_name)[0]
+            result = write_differences_report(
+                os.path.join(diff_dir, f"{stem}.{backend1}_vs_{backend2}_differences.json"),
+                text1, text2, backend1, backend2
+            )
+            stats = result['statistics']
+        else:
+            stats = difference_statistics(text1, text2, align_texts(text1, text2), backend1, backend2)
+        pairs[f"{backend1}_vs_{backend2}"] = {
+            'similarity': stats['similarity'],
+            'length_diff': stats['length_diff'],
+            'difference_blocks': stats['insertions'] + stats['deletions'] + stats['replacements']
+        }
+
+    return {'pdf': pdf_name, 'patterns': patterns, 'pairs': pairs}
+
+
+def aggregate(documents, extraction_times, extraction_errors, backends):
+    """Verdichtet die Ergebnisse je Dokument zu Kennzahlen je Backend, Paar und Muster"""
+    report_backends = {}
+    for backend in backends:
+        times = extraction_times.get(backend, [])
+        report_backends[backend] = {
+            'documents': len(times),
+            'errors': len(extraction_errors.get(backend, [])),
+            'total_seconds': round(sum(times), 3),
+            'mean_seconds': round(statistics.mean(times), 4) if times else None,
+            'max_seconds': round(max(times), 4) if times else None
+        }
+
+    report_pairs = {}
+    for pair in sorted({pair for doc in documents for pair in doc['pairs']}):
+        values = [(doc['pairs'][pair]['similarity'], doc['pdf']) for doc in documents if pair in doc['pairs']]
+        similarities = [value for value, _ in values]
+        report_pairs[pair] = {
+            'documents': len(values),
+            'mean_similarity': round(statistics.mean(similarities), 4),
+            'min_similarity': round(min(similarities), 4),
+            'least_similar': [pdf for _, pdf in sorted(values)[:5]]
+        }
+
+    report_patterns = {}
+    pattern_names = sorted({name for doc in documents for counts in doc['patterns'].values() for name in counts})
+    for name in pattern_names:
+        compared = [doc for doc in documents if len(doc['patterns']) >= 2]
+        agreeing = [doc for doc in compared if len({counts[name] for counts in doc['patterns'].values()}) == 1]
+        pairwise = {}
+        for backend1, backend2 in itertools.combinations(backends, 2):
+            both = [doc for doc in compared if backend1 in doc['patterns'] and backend2 in doc['patterns']]
+            if both:
+                same = sum(1 for doc in both if doc['patterns'][backend1][name] == doc['patterns'][backend2][name])
+                pairwise[f"{backend1}_vs_{backend2}"] = round(same / len(both), 4)
+        report_patterns[name] = {
+            'agreement_rate': round(len(agreeing) / len(compared), 4) if compared else None,
+            'pairwise_agreement': pairwise,
+            'total_matches': {backend: sum(doc['patterns'].get(backend, {}).get(name, 0) for doc in documents)
+                              for backend in backends},
+            'disagreeing_documents': [doc['pdf'] for doc in compared if doc not in agreeing][:10]
+        }
+
+    return report_backends, report_pairs, report_patterns
+
+
+def run_corpus(folder, backends=tuple(BACKENDS), workers=None, cache_dir=DEFAULT_CACHE_DIR, diff_dir=None):
+    """
+    Vergleicht alle PDFs eines Ordners
+
+    Returns:
+        dict: Aggregierter Bericht
+    """
+    start_time = time.perf_counter()
+    pdf_files = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith('.pdf'))
+    if not pdf_files:
+        raise ValueError(f"Keine PDF-Dateien in {folder} gefunden")
+    if diff_dir:
+        os.makedirs(diff_dir, exist_ok=True)
+
+    print(f"📁 {len(pdf_files)} PDF-Dateien, Backends: {', '.join(backends)}")
+    digests = {path: pdf_sha256(path) for path in pdf_files}
+
+    extraction_times = {backend: [] for backend in backends}
+    extraction_errors = {backend: [] for backend in backends}
+    tasks = []
+    for path, backend in itertools.product(pdf_files, backends):
+        cached = load_cached(cache_dir, backend, digests[path])
+        if cached is None:
+            tasks.append((path, backend))
+        else:
+            extraction_times[backend].append(cached['seconds'])
+            if cached['error']:
+                extraction_errors[backend].append(os.path.basename(path))
+
+    print(f"💾 {len(pdf_files) * len(backends) - len(tasks)} Extraktionen aus dem Cache, {len(tasks)} neu")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_extract_task, path, backend, digests[path], cache_dir): path
+                   for path, backend in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            backend, digest, seconds, error = future.result()
+            extraction_times[backend].append(seconds)
+            if error:
+                extraction_errors[backend].append(os.path.basename(futures[future]))
+            print(f"   🔄 Extraktion {done}/{len(tasks)}", end='\r')
+        if tasks:
+            print()
+
+        print("🔍 Vergleiche Backends...")
+        futures = [executor.submit(_compare_task, os.path.basename(path), digests[path], backends, cache_dir, diff_dir)
+                   for path in pdf_files]
+        documents = sorted((future.result() for future in as_completed(futures)), key=lambda doc: doc['pdf'])
+
+    report_backends, report_pairs, report_patterns = aggregate(
+        documents, extraction_times, extraction_errors, backends
+    )
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'folder': folder,
+        'document_count': len(pdf_files),
+        'seconds': round(time.perf_counter() - start_time, 3),
+        'backends': report_backends,
+        'pairs': report_pairs,
+        'patterns': report_patterns,
+        'documents': documents
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Korpusweiter Vergleich der PDF-Extraktions-Backends')
+    parser.add_argument('folder', nargs='?', default='input', help='Ordner mit PDF-Dateien (Standard: input)')
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--workers', type=int, default=None, help='Anzahl Prozesse (Standard: CPU-Kerne)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Cache für extrahierte Texte')
+    parser.add_argument('--diff-dir', help='Optional: *_differences.json je Dokument und Paar hier ablegen')
+    parser.add_argument('--output', default=DEFAULT_REPORT, help='Ausgabedatei des Berichts')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"❌ Ordner nicht gefunden: {args.folder}")
+        sys.exit(1)
+
+    print('=== KORPUS-EXTRAKTIONSVERGLEICH ===')
+    report = run_corpus(args.folder, args.backends, args.workers, args.cache_dir, args.diff_dir)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print('\n=== ZUSAMMENFASSUNG ===')
+    print('Extraktionszeit je Backend:')
+    for backend, values in report['backends'].items():
+        print(f"  {backend}: {values['total_seconds']:.2f}s gesamt, "
+              f"{values['mean_seconds'] or 0:.3f}s/Dokument, {values['errors']} Fehler")
+    print('Ähnlichkeit je Paar (wortweise):')
+    for pair, values in report['pairs'].items():
+        print(f"  {pair}: Ø {values['mean_similarity']:.1%}, min {values['min_similarity']:.1%}")
+    print('Übereinstimmung der Muster-Zählungen (alle Backends gleich):')
+    for name, values in report['patterns'].items():
+        rate = values['agreement_rate']
+        print(f"  {name}: {rate:.0%}" if rate is not None else f"  {name}: -")
+    print(f"\n⏱️  {report['seconds']:.1f}s für {report['document_count']} Dokumente")
+    print(f"💾 Bericht gespeichert in: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
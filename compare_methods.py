@@ -1,9 +1,10 @@
 import PyPDF2
 import pdfplumber
 import fitz
-import re
 import os
 
+from document_training.protocol_patterns import ANWESENHEIT_SECTION, TOP_NUMBER
+
 # Teste alle drei Methoden auf derselben PDF
 pdf_file = '2023_Juli_Stadtverordnetenversammlung_Niederschrift_STV.pdf'
 pdf_path = os.path.join('input', pdf_file)
@@ -77,7 +78,7 @@ print('\n=== TESTE SPEZIFISCHE MUSTER ===')
 
 # Teste Anwesenheitsliste
 print('Anwesenheitsliste (PyPDF2):')
-anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', pypdf2_text, re.DOTALL | re.IGNORECASE)
+anwesen_match = ANWESENHEIT_SECTION.search(pypdf2_text)
 if anwesen_match:
     anwesen_text = anwesen_match.group(1).strip()
     print('   Gefunden:', len(anwesen_text), 'Zeichen')
@@ -87,7 +88,7 @@ else:
 print()
 
 print('Anwesenheitsliste (pdfplumber):')
-anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', pdfplumber_text, re.DOTALL | re.IGNORECASE)
+anwesen_match = ANWESENHEIT_SECTION.search(pdfplumber_text)
 if anwesen_match:
     anwesen_text = anwesen_match.group(1).strip()
     print('   Gefunden:', len(anwesen_text), 'Zeichen')
@@ -97,7 +98,7 @@ else:
 print()
 
 print('Anwesenheitsliste (pymupdf):')
-anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', pymupdf_text, re.DOTALL | re.IGNORECASE)
+anwesen_match = ANWESENHEIT_SECTION.search(pymupdf_text)
 if anwesen_match:
     anwesen_text = anwesen_match.group(1).strip()
     print('   Gefunden:', len(anwesen_text), 'Zeichen')
@@ -108,19 +109,19 @@ print()
 
 # Teste TOP-Erkennung
 print('TOP-Erkennung (PyPDF2):')
-top_matches = re.findall(r'TOP\s+(\d+(?:\.\d+)?)', pypdf2_text, re.IGNORECASE)
+top_matches = TOP_NUMBER.findall(pypdf2_text)
 print('   Gefundene TOPs:', len(top_matches))
 print('   Erste 5 TOPs:', top_matches[:5])
 print()
 
 print('TOP-Erkennung (pdfplumber):')
-top_matches = re.findall(r'TOP\s+(\d+(?:\.\d+)?)', pdfplumber_text, re.IGNORECASE)
+top_matches = TOP_NUMBER.findall(pdfplumber_text)
 print('   Gefundene TOPs:', len(top_matches))
 print('   Erste 5 TOPs:', top_matches[:5])
 print()
 
 print('TOP-Erkennung (pymupdf):')
-top_matches = re.findall(r'TOP\s+(\d+(?:\.\d+)?)', pymupdf_text, re.IGNORECASE)
+top_matches = TOP_NUMBER.findall(pymupdf_text)
 print('   Gefundene TOPs:', len(top_matches))
 print('   Erste 5 TOPs:', top_matches[:5])
 print()
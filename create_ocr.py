@@ -1,10 +1,13 @@
 import os
+import sys
 import json
 from dotenv import load_dotenv
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
-from azure.storage.blob import BlobServiceClient
-from urllib.parse import urlparse
+
+# Gleicher Modulpfad wie in document_training (ein blob_access-Modul, ein Client-Pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from blob_access import get_container_client
 
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
@@ -17,9 +20,6 @@ blob_sas_url = os.getenv('BLOBSASURL')
 # Erstelle DocumentIntelligenceClient
 client = DocumentIntelligenceClient(endpoint=endpoint, credential=AzureKeyCredential(key))
 
-# Erstelle BlobServiceClient mit SAS URL
-blob_service_client = BlobServiceClient(account_url=blob_sas_url)
-
 def create_ocr(pdf_path, output_path=None):
     """
     Erstellt OCR-Daten aus einer PDF-Datei und speichert sie als JSON.
@@ -65,14 +65,8 @@ def get_pdf_blobs_without_ocr():
         list: Liste von Blob-Namen (PDF-Dateien ohne OCR)
     """
     try:
-        # Parse die SAS URL um Container-Name zu extrahieren
-        parsed_url = urlparse(blob_sas_url)
-        container_name = parsed_url.path.split('/')[-1]
-        if not container_name:
-            container_name = "container2"  # Fallback falls Container-Name nicht extrahiert werden kann
-        
-        # Erstelle Container Client
-        container_client = blob_service_client.get_container_client(container_name)
+        # Gemeinsamer, gecachter Container Client
+        container_client = get_container_client(sas_url=blob_sas_url)
         
         # Liste alle Blobs im Container
         blobs = container_client.list_blobs()
@@ -115,18 +109,12 @@ def download_blob_to_temp(blob_name, temp_path):
         str: Pfad zur heruntergeladenen Datei
     """
     try:
-        # Parse die SAS URL um Container-Name zu extrahieren
-        parsed_url = urlparse(blob_sas_url)
-        container_name = parsed_url.path.split('/')[-1]
-        if not container_name:
-            container_name = "container2"  # Fallback falls Container-Name nicht extrahiert werden kann
-        
-        # Erstelle Container Client
-        container_client = blob_service_client.get_container_client(container_name)
+        # Gemeinsamer, gecachter Container Client
+        container_client = get_container_client(sas_url=blob_sas_url)
         
         # Lade Blob herunter
         with open(temp_path, "wb") as download_file:
-            download_file.write(container_client.download_blob(blob_name).readall())
+            container_client.download_blob(blob_name).readinto(download_file)
         
         print(f"Blob heruntergeladen: {blob_name} -> {temp_path}")
         return temp_path
@@ -145,14 +133,8 @@ def upload_ocr_to_blob(local_ocr_path, blob_name):
         blob_name (str): Name für die Blob-Datei (mit .ocr.json Extension)
     """
     try:
-        # Parse die SAS URL um Container-Name zu extrahieren
-        parsed_url = urlparse(blob_sas_url)
-        container_name = parsed_url.path.split('/')[-1]
-        if not container_name:
-            container_name = "container2"  # Fallback falls Container-Name nicht extrahiert werden kann
-        
-        # Erstelle Container Client
-        container_client = blob_service_client.get_container_client(container_name)
+        # Gemeinsamer, gecachter Container Client
+        container_client = get_container_client(sas_url=blob_sas_url)
         
         # Lade OCR-Datei hoch
         with open(local_ocr_path, "rb") as data:
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Anwesenheitslisten als strukturierte Einträge und sitzungsübergreifender Personen-Index
+- parse_section: ein Durchlauf über die Zeilen, jede Zeile wird mit einem Muster
+  klassifiziert (protocol_patterns.ATTENDANCE_LINE); Personen werden in Funktion,
+  akad. Titel, Name, Teilnahme an einzelnen TOPs ("ab TOP 5", "TOP 7 bis 10"),
+  Vertretung ("für STV ...") und Zusatz ("(IVC)") zerlegt. Fortsetzungszeilen
+  ("TOP 8 bis 10", getrennte Namen "Slob-" / "be-Schneider") werden angehängt.
+  label behält den Text der Liste (mit TOP-Angabe und Vertretung) für die bisherige Ausgabe.
+- RosterIndex: Person -> Sitzungen als Bitsets (anwesend, entschuldigt, teilweise),
+  persistent als JSON; Abfragen ("An welchen Sitzungen war X?") ohne die Protokolle
+  erneut zu lesen
+
+Verwendung:
+    python attendance.py build ../training/output [--index ../training/roster_index.json]
+    python attendance.py person "Malke Aydin" [--year 2023]
+    python attendance.py session 2023_Juli_Stadtverordnetenversammlung_Niederschrift_STV
+"""
+
+import os
+import sys
+import json
+import argparse
+
+import protocol_patterns as patterns
+from fields_aggregator import write_json_atomic
+
+DEFAULT_INDEX = os.path.join('..', 'training', 'roster_index.json')
+INDEX_VERSION = 1
+
+# Überschriften, unter denen auch Namen ohne Funktionspräfix Personen sind
+_NAME_ONLY_FUNCTIONS = ('Schriftführer', 'Verwaltung')
+
+
+def person_key(name):
+    """Schlüssel einer Person: ohne akad. Titel, Kleinschreibung, einfache Leerzeichen"""
+    name = patterns.ACADEMIC_TITLE.sub('', name.strip())
+    return ' '.join(name.casefold().split())
+
+
+def _apply_range(record, marker):
+    """
+    TOP-Angabe ("ab TOP 5", "TOP 7 bis 10", "bis 3") in den Eintrag übernehmen
+
+    Returns:
+        str: Noch fehlender Teil ('start' / 'end') für eine Fortsetzungszeile oder None
+    """
+    record['partial'] = True
+    match = patterns.TOP_RANGE.match(marker.strip())
+    if not match:
+        return None
+    if match.group('start'):
+        record['from_top'] = int(match.group('start'))
+    if match.group('end'):
+        record['to_top'] = int(match.group('end'))
+    if match.group('bis') and not match.group('end'):
+        return 'end'
+    if record['from_top'] is None and record['to_top'] is None:
+        return 'start'
+    return None
+
+
+def _set_name(record, text):
+    """Name, akad. Titel und Zusatz aus dem Personen-Text (ohne TOP-Angabe und Vertretung)"""
+    note = patterns.PERSON_NOTE.search(text)
+    if note:
+        record['note'] = note.group(1).strip()
+        text = text[:note.start()]
+    name = text.strip(' ,;')
+    title = patterns.ACADEMIC_TITLE.match(name)
+    record['title'] = title.group(1).strip() if title else None
+    record['name'] = name[title.end():].strip() if title else name
+    record['key'] = person_key(record['name'])
+
+
+def parse_person(text, role=None, function='', status='present', scope=None):
+    """
+    Zerlegt den Personen-Text einer Zeile (ohne Funktionspräfix)
+
+    Args:
+        text (str): z.B. "Prof. Dr. Helge Stadelmann für STV Georg Celik" oder "Malke Aydin ab TOP 5"
+        role (str): Funktionspräfix ("STV", "Stadtrat", ...)
+        function (str): Funktionsüberschrift ("Von der Stadtverordnetenversammlung")
+        status (str): "present" oder "excused"
+        scope (tuple): (von, bis) aus einer "Zu TOP n:"-Überschrift
+
+    Returns:
+        tuple: (Eintrag als Dictionary, noch fehlender Teil der TOP-Angabe oder None)
+    """
+    record = {'name': '', 'key': '', 'role': role, 'title': None, 'function': function, 'status': status,
+              'partial': False, 'from_top': None, 'to_top': None, 'substitute_for': None, 'note': None,
+              'label': f"{role} {text.strip()}" if role else text.strip()}
+    pending = None
+
+    marker = patterns.PRESENCE_MARKER.search(text)
+    if marker:
+        pending = _apply_range(record, marker.group(1))
+        text = text[:marker.start()]
+    elif scope:
+        record['partial'] = True
+        record['from_top'], record['to_top'] = scope
+
+    substitute = patterns.SUBSTITUTE.search(text)
+    if substitute:
+        line = patterns.ATTENDANCE_LINE.match(substitute.group(1).strip())
+        substitute_name = line.group('person') if line and line.group('role') else substitute.group(1)
+        record['substitute_for'] = patterns.ACADEMIC_TITLE.sub('', substitute_name.strip())
+        text = text[:substitute.start()]
+
+    _set_name(record, text)
+    return record, pending
+
+
+def parse_entry(raw, function='', status='present'):
+    """
+    Einzelner Eintrag einer bestehenden Ausgabe (attendance[].name, z.B. "STV Malke Aydin ab TOP")
+
+    Returns:
+        dict: Eintrag oder None, wenn der Text keine Person ist (Seitenzahl, "Zu TOP 3:", ...)
+    """
+    line = patterns.ATTENDANCE_LINE.match(' '.join(raw.split()))
+    if not line:
+        return None
+    if line.group('role'):
+        return parse_person(line.group('person'), ' '.join(line.group('role').split()), function, status)[0]
+    if line.group('other'):
+        abbreviation = patterns.ROLE_ABBREVIATION.match(line.group('other'))
+        if abbreviation:
+            return parse_person(abbreviation.group(2), abbreviation.group(1), function, status)[0]
+        return parse_person(line.group('other'), None, function, status)[0]
+    return None
+
+
+def parse_section(text, status='present'):
+    """
+    Parst einen Anwesenheitsbereich ("Anwesend: ..." bzw. "Entschuldigt: ...")
+
+    Args:
+        text (str): Text des Bereichs (auch mit Seitenmarkierungen / Fußzeilen)
+        status (str): "present" oder "excused"
+
+    Returns:
+        list: Einträge in Reihenfolge der Liste
+    """
+    records = []
+    function = None
+    scope = None
+    last = None
+    pending = None
+
+    for line in patterns.PAGE_MARKER.sub('\n', text).split('\n'):
+        line = ' '.join(line.split())
+        if not line:
+            continue
+        match = patterns.ATTENDANCE_LINE.match(line)
+
+        if match.group('heading'):
+            function, scope, last = line, None, None
+        elif match.group('scope'):
+            start = int(match.group('scope_from'))
+            scope = (start, int(match.group('scope_to') or start))
+            last = None
+        elif match.group('noise'):
+            continue
+        elif match.group('continuation'):
+            # Fortsetzung der TOP-Angabe der vorherigen Person; sonst Seitenzahl, TOP-Zeile o.ä.
+            is_range = not line.isdigit() and ('bis' in line.casefold() or line.casefold().startswith('ab'))
+            if last is None or not (pending or (is_range and not last['partial'])):
+                continue
+            last['label'] += f" {line}"
+            if line.isdigit():
+                last['from_top' if pending == 'start' else 'to_top'] = int(line)
+                pending = None
+            else:
+                pending = _apply_range(last, line)
+        elif match.group('role'):
+            role = ' '.join(match.group('role').split())
+            last, pending = parse_person(match.group('person'), role, function or 'Unbekannt', status, scope)
+            records.append(last)
+        elif last is not None and last['name'].endswith('-') and line[0].islower():
+            # Am Zeilenende getrennter Name: "Simone van Slob-" + "be-Schneider"
+            last['note'] = None
+            _set_name(last, f"{last['title'] or ''} {last['name'][:-1]}{line}")
+            if last['label'].endswith('-'):
+                last['label'] = last['label'][:-1] + line
+        elif scope or (function and any(name in function for name in _NAME_ONLY_FUNCTIONS)):
+            abbreviation = patterns.ROLE_ABBREVIATION.match(line)
+            role, text = (abbreviation.group(1), abbreviation.group(2)) if abbreviation else (None, line)
+            last, pending = parse_person(text, role, function or 'Unbekannt', status, scope)
+            records.append(last)
+        else:
+            last = None
+    return records
+
+
+def group_by_function(records):
+    """Einträge -> bisherige Struktur [{"funktion", "personen": [label, ...]}]"""
+    functions = []
+    for record in records:
+        if not functions or functions[-1]['funktion'] != record['function']:
+            functions.append({'funktion': record['function'], 'personen': []})
+        functions[-1]['personen'].append(record['label'])
+    return functions
+
+
+class RosterIndex:
+    """
+    Personen-Index über alle Sitzungen
+
+    sessions: Liste der Sitzungen (id, date, session_type, source_mtime); die Position ist das Bit
+    people: Personen-Schlüssel -> name, roles, present/excused/partial als int-Bitsets
+    """
+
+    STATUSES = ('present', 'excused', 'partial')
+
+    def __init__(self, path=None):
+        self.path = path
+        self.sessions = []
+        self.people = {}
+        self._positions = {}
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            return
+        self.sessions = data['sessions']
+        self._positions = {session['id']: position for position, session in enumerate(self.sessions)}
+        for key, person in data['people'].items():
+            for status in self.STATUSES:
+                person[status] = int(person[status], 16)
+            self.people[key] = person
+
+    def save(self, path=None):
+        self.path = path or self.path
+        people = {key: dict(person, **{status: format(person[status], 'x') for status in self.STATUSES})
+                  for key, person in self.people.items()}
+        write_json_atomic(self.path, {'version': INDEX_VERSION, 'sessions': self.sessions, 'people': people},
+                          indent=None)
+
+    def session(self, session_id):
+        position = self._positions.get(session_id)
+        return self.sessions[position] if position is not None else None
+
+    def add_session(self, session_id, records, date=None, session_type=None, source_mtime=None):
+        """Übernimmt die Einträge einer Sitzung; eine bereits enthaltene Sitzung wird ersetzt"""
+        entry = {'id': session_id, 'date': date, 'session_type': session_type, 'source_mtime': source_mtime}
+        position = self._positions.get(session_id)
+        if position is None:
+            position = len(self.sessions)
+            self._positions[session_id] = position
+            self.sessions.append(entry)
+        else:
+            self.sessions[position] = entry
+            self._clear(position)
+
+        bit = 1 << position
+        for record in records:
+            if not record.get('key'):
+                continue
+            person = self.people.setdefault(record['key'], {'name': record['name'], 'roles': [],
+                                                            'present': 0, 'excused': 0, 'partial': 0})
+            if record.get('role') and record['role'] not in person['roles']:
+                person['roles'].append(record['role'])
+            person['excused' if record.get('status') == 'excused' else 'present'] |= bit
+            if record.get('partial'):
+                person['partial'] |= bit
+
+    def _clear(self, position):
+        mask = ~(1 << position)
+        for key in list(self.people):
+            person = self.people[key]
+            for status in self.STATUSES:
+                person[status] &= mask
+            if not person['present'] and not person['excused']:
+                del self.people[key]
+
+    def add_document(self, document, source_mtime=None):
+        """Sitzung aus einer Ausgabe-Datei (training/output/*.json, Feld attendance)"""
+        records = []
+        for item in document.get('attendance') or []:
+            record = parse_entry(item.get('name', ''), item.get('function', ''), item.get('status', 'present'))
+            if not record:
+                continue
+            # Strukturierte Angaben der Ausgabe haben Vorrang vor dem Text des Labels
+            for field in ('partial', 'from_top', 'to_top', 'substitute_for'):
+                if field in item:
+                    record[field] = item[field]
+            records.append(record)
+        self.add_session(document['id'], records, document.get('date'), document.get('session_type'),
+                         source_mtime)
+
+    def lookup(self, name):
+        """Personen-Schlüssel zu einem Namen: exakt, sonst alle Schlüssel, die den Namen enthalten"""
+        key = person_key(name)
+        if key in self.people:
+            return [key]
+        return sorted(candidate for candidate in self.people if key in candidate)
+
+    def year_mask(self, year=None):
+        if year is None:
+            return (1 << len(self.sessions)) - 1
+        year = str(year)
+        return sum(1 << position for position, session in enumerate(self.sessions)
+                   if (session.get('date') or '').startswith(year))
+
+    def sessions_of(self, key, status='present', year=None):
+        bits = self.people[key][status] & self.year_mask(year)
+        return [session for position, session in enumerate(self.sessions) if bits >> position & 1]
+
+    def summary(self, key, year=None):
+        """Anzahl Sitzungen je Status (anwesend, entschuldigt, teilweise) und Anwesenheitsquote"""
+        mask = self.year_mask(year)
+        person = self.people[key]
+        counts = {status: bin(person[status] & mask).count('1') for status in self.STATUSES}
+        listed = bin((person['present'] | person['excused']) & mask).count('1')
+        counts['rate'] = counts['present'] / listed if listed else None
+        return counts
+
+    def members(self, session_id, status='present'):
+        position = self._positions.get(session_id)
+        if position is None:
+            return []
+        return sorted(person['name'] for person in self.people.values() if person[status] >> position & 1)
+
+
+def build_index(paths, index_path=DEFAULT_INDEX):
+    """
+    Aktualisiert den Index aus Ausgabe-Dateien; unveränderte Dateien werden übersprungen
+
+    Returns:
+        tuple: (RosterIndex, Anzahl aktualisierter Sitzungen)
+    """
+    index = RosterIndex(index_path)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json')]
+        else:
+            files.append(path)
+
+    updated = 0
+    for path in files:
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        if not isinstance(document, dict) or 'id' not in document or 'attendance' not in document:
+            continue
+        session = index.session(document['id'])
+        if session and session.get('source_mtime') == mtime:
+            continue
+        index.add_document(document, mtime)
+        updated += 1
+
+    if updated or not os.path.exists(index_path):
+        index.save(index_path)
+    return index, updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Anwesenheits-Index über alle Sitzungen')
+    parser.add_argument('--index', default=DEFAULT_INDEX, help='Index-Datei (Standard: %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='Index aus Ausgabe-Dateien (training/output) aktualisieren')
+    build.add_argument('paths', nargs='+', help='Ausgabe-Dateien oder Ordner')
+    person = commands.add_parser('person', help='Sitzungen einer Person')
+    person.add_argument('name')
+    person.add_argument('--year', help='Nur Sitzungen dieses Jahres')
+    session = commands.add_parser('session', help='Anwesende und Entschuldigte einer Sitzung')
+    session.add_argument('session_id')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        index, updated = build_index(args.paths, args.index)
+        print(f"✅ {args.index}: {updated} Sitzungen aktualisiert, "
+              f"{len(index.sessions)} Sitzungen, {len(index.people)} Personen")
+        return 0
+
+    if not os.path.exists(args.index):
+        print(f"❌ Index nicht gefunden: {args.index} (zuerst: python attendance.py build ...)")
+        return 1
+    index = RosterIndex(args.index)
+
+    if args.command == 'session':
+        if index.session(args.session_id) is None:
+            print(f"❌ Sitzung nicht im Index: {args.session_id}")
+            return 1
+        for status, title in (('present', '👥 Anwesend'), ('excused', '❌ Entschuldigt')):
+            names = index.members(args.session_id, status)
+            print(f"{title} ({len(names)}):")
+            for name in names:
+                print(f"   - {name}")
+        return 0
+
+    keys = index.lookup(args.name)
+    if not keys:
+        print(f"❌ Keine Person gefunden: {args.name}")
+        return 1
+    for key in keys:
+        person = index.people[key]
+        counts = index.summary(key, args.year)
+        rate = f"{counts['rate']:.0%}" if counts['rate'] is not None else '-'
+        print(f"👤 {person['name']} ({', '.join(person['roles']) or 'ohne Funktion'}): "
+              f"{counts['present']} anwesend (davon {counts['partial']} teilweise), "
+              f"{counts['excused']} entschuldigt, Quote {rate}")
+        for status in ('present', 'excused'):
+            sessions = sorted(index.sessions_of(key, status, args.year), key=lambda s: s.get('date') or '')
+            for entry in sessions:
+                print(f"   {'✅' if status == 'present' else '❌'} {(entry.get('date') or '')[:10]} {entry['id']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
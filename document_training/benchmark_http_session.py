@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Latenz-Vergleich: einzelne requests.get-Aufrufe vs. gepoolte requests.Session
+Ohne --url wird ein lokaler HTTP-Server verwendet (misst nur den TCP-Aufbau);
+mit --url z.B. gegen den Document Intelligence Endpoint inklusive TLS-Handshake.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# Lade Umgebungsvariablen
+load_dotenv('../config.env')
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"value": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(label, do_request, requests_count):
+    """Führt requests_count Requests aus und liefert die Einzel-Latenzen in ms"""
+    timings = []
+    for _ in range(requests_count):
+        start_time = time.perf_counter()
+        response = do_request()
+        response.content
+        timings.append((time.perf_counter() - start_time) * 1000)
+    print(f"   {label:<28} Median {statistics.median(timings):8.2f} ms | "
+          f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms | "
+          f"Gesamt {sum(timings):9.1f} ms")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latenz-Vergleich requests.get vs. Session')
+    parser.add_argument('--url', help='Ziel-URL (Standard: lokaler Testserver)')
+    parser.add_argument('--requests', type=int, default=50, help='Anzahl Requests pro Variante')
+    args = parser.parse_args()
+
+    server = None
+    headers = {}
+    url = args.url
+    if not url:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _OkHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/documentIntelligence/documentModels"
+    elif os.getenv('DOCUMENTINTELLIGENCE_API_KEY'):
+        headers["Ocp-Apim-Subscription-Key"] = os.getenv('DOCUMENTINTELLIGENCE_API_KEY')
+
+    print(f"🌐 Ziel: {url}")
+    print(f"📊 {args.requests} Requests pro Variante\n")
+
+    try:
+        per_call = measure("requests.get (neu pro Call)",
+                           lambda: requests.get(url, headers=headers, timeout=(10, 60)), args.requests)
+
+        with requests.Session() as session:
+            session.mount('https://', HTTPAdapter(pool_maxsize=16))
+            session.mount('http://', HTTPAdapter(pool_maxsize=16))
+            pooled = measure("requests.Session (Keep-Alive)",
+                             lambda: session.get(url, headers=headers, timeout=(10, 60)), args.requests)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Request fehlgeschlagen: {e}")
+        sys.exit(1)
+    finally:
+        if server:
+            server.shutdown()
+
+    speedup = statistics.median(per_call) / max(statistics.median(pooled), 1e-9)
+    print(f"\n⚡ Session ist im Median {speedup:.1f}x schneller")
+
+
+if __name__ == "__main__":
+    main()
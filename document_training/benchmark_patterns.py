@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark der zentralen Protokoll-Muster (protocol_patterns.py)
+- Vergleicht jedes Muster mit dem bisherigen Inline-Regex der Skripte
+- Prüft auf echten Protokollen, dass die Ergebnisse identisch sind
+- Misst die Laufzeit je Dokument, optional auch auf einem Worst-Case-Text
+
+Verwendung:
+    python benchmark_patterns.py [ordner] [--repeat N] [--stress N]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+import protocol_patterns as patterns
+
+_DOTALL_I = re.DOTALL | re.IGNORECASE
+_VOTE_END = r'(?=\n\n|\nTOP|\nDie Vorsitzende|$)'
+
+# name, bisheriges Muster, bisherige Flags, neues Muster, Art des Aufrufs
+CASES = [
+    ('anwesenheit', r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', _DOTALL_I, patterns.ANWESENHEIT_SECTION, 'findall'),
+    ('abwesend', r'Abwesend[:\s]*(.*?)(?=TOP|Tagesordnung)', _DOTALL_I, patterns.ABWESEND_SECTION, 'findall'),
+    ('tagesordnung', r'Tagesordnung[:\s]*(.*?)(?=TOP\s+1|Beschluss)', _DOTALL_I, patterns.TAGESORDNUNG_SECTION, 'findall'),
+    ('top_numbers', r'TOP\s+(\d+(?:\.\d+)?)', re.IGNORECASE, patterns.TOP_NUMBER, 'findall'),
+    ('top_line_numbers', r'^TOP\s+(\d+(?:\.\d+)?)', re.IGNORECASE | re.MULTILINE, patterns.TOP_LINE_NUMBER, 'findall'),
+    ('top_mentions', r'TOP\s\d+[^\n]*', re.IGNORECASE, patterns.TOP_MENTION, 'findall'),
+    ('datum', r'(\d{1,2}\.\d{1,2}\.\d{4})', _DOTALL_I, patterns.DATE, 'findall'),
+    ('zeit', r'(\d{1,2}:\d{2})', _DOTALL_I, patterns.TIME, 'findall'),
+    ('ort', r'(Pohlheim|Sitzungssaal)', _DOTALL_I, patterns.ORT, 'findall'),
+    ('stv_person', r'STV\s+\w+', 0, patterns.STV_PERSON, 'findall'),
+    ('agenda_heading', r'TAGESORDNUNG\s*:?', re.IGNORECASE, patterns.AGENDA_HEADING, 'search'),
+    ('niederschrift', r'NIEDERSCHRIFT', re.IGNORECASE, patterns.NIEDERSCHRIFT, 'search'),
+    ('sitzung', r'über die Sitzung der ([^\n]+) der Stadt Pohlheim', re.IGNORECASE, patterns.SITZUNG, 'search'),
+    ('tag', r'Tag:\s*([^\n]+)', re.IGNORECASE, patterns.TAG, 'search'),
+    ('dauer', r'Dauer:\s*([^\n]+)', re.IGNORECASE, patterns.DAUER, 'search'),
+    ('ort_feld', r'Ort:\s*([^\n]+)', re.IGNORECASE, patterns.ORT_FIELD, 'search'),
+    ('anwesend_bis_tagesordnung', r'Anwesend:(.*?)Tagesordnung:', _DOTALL_I, patterns.ATTENDANCE_TO_AGENDA, 'search'),
+    ('attendance_1', r'Anwesend:(.*?)(?=TAGESORDNUNG:|Tagesordnung:)', _DOTALL_I, patterns.ATTENDANCE_SECTIONS[0], 'search'),
+    ('attendance_2', r'Anwesend:(.*?)(?=\n\s*TOP\s+1\s)', _DOTALL_I, patterns.ATTENDANCE_SECTIONS[1], 'search'),
+    ('attendance_3', r'Anwesend:(.*?)(?=\n\s*[A-ZÄÖÜ][a-zäöüß]+\s*:|$)', _DOTALL_I, patterns.ATTENDANCE_SECTIONS[2], 'search'),
+    ('attendance_4', r'Anwesend:(.*?)(?=\n\s*\d+\.\s*[A-Z]|$)', _DOTALL_I, patterns.ATTENDANCE_SECTIONS[3], 'search'),
+    ('entschuldigt_1', r'Entschuldigt:(.*?)(?=Tagesordnung:|TOP\s*\d+|Beschluss|Protokoll|$)', _DOTALL_I, patterns.ENTSCHULDIGT_SECTIONS[0], 'search'),
+    ('entschuldigt_2', r'Entschuldigt:(.*?)$', _DOTALL_I, patterns.ENTSCHULDIGT_TO_END, 'search'),
+    ('unterschrift_1', r'Die Vorsitzende.*?Schriftführer', _DOTALL_I, patterns.SIGNATURE_SECTIONS[0], 'search'),
+    ('unterschrift_2', r'Vorsitzende.*?Schriftführer', _DOTALL_I, patterns.SIGNATURE_SECTIONS[1], 'search'),
+    ('unterschrift_4', r'gez\..*?gez\.', _DOTALL_I, patterns.SIGNATURE_SECTIONS[3], 'search'),
+    ('abstimmung_1', r'Abstimmungsergebnis:.*?' + _VOTE_END, _DOTALL_I, patterns.VOTE_SECTIONS[0], 'sub'),
+    ('abstimmung_2', r'Abstimmung:.*?' + _VOTE_END, _DOTALL_I, patterns.VOTE_SECTIONS[1], 'sub'),
+    ('abstimmung_3', r'Einstimmig beschlossen.*?' + _VOTE_END, _DOTALL_I, patterns.VOTE_SECTIONS[2], 'sub'),
+    ('abstimmung_4', r'Mit Stimmenmehrheit beschlossen.*?' + _VOTE_END, _DOTALL_I, patterns.VOTE_SECTIONS[3], 'sub'),
+    ('seitenmarkierung', r'\n--- SEITE \d+ ---\n', 0, patterns.PAGE_MARKER, 'sub'),
+    ('leerzeilen', r'\n\s*\n\s*\n', 0, patterns.BLANK_LINES, 'sub_blank'),
+    ('seitenzahl', r'Seite \d+ von \d+', 0, patterns.PAGE_FOOTER, 'sub'),
+    ('dokument_id', r'STV/\d+/\d+-\d+', 0, patterns.DOCUMENT_ID, 'sub'),
+    ('seitenzahl_zeilenende', r'\s+\d+\s*$', re.MULTILINE, patterns.TRAILING_PAGE_NUMBER, 'sub'),
+]
+
+
+def _normalize(match, with_group):
+    if match is None:
+        return None
+    return match.span(), match.group(0), match.group(1) if with_group else None
+
+
+def run_legacy(pattern, flags, mode, text):
+    if mode == 'findall':
+        return re.findall(pattern, text, flags)
+    if mode == 'search':
+        return _normalize(re.search(pattern, text, flags), re.compile(pattern, flags).groups > 0)
+    if mode == 'sub_blank':
+        return re.sub(pattern, '\n\n', text, flags=flags)
+    return re.sub(pattern, '', text, flags=flags)
+
+
+def run_compiled(pattern, mode, text, with_group=True):
+    if mode == 'findall':
+        return pattern.findall(text)
+    if mode == 'search':
+        return _normalize(pattern.search(text), with_group)
+    if mode == 'sub_blank':
+        return pattern.sub('\n\n', text)
+    return pattern.sub('', text)
+
+
+def load_texts(folder):
+    """Texte aller PDFs (PyMuPDF, mit Seitenmarkierungen) bzw. .txt-Dateien eines Ordners"""
+    texts = {}
+    for file_name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, file_name)
+        if file_name.lower().endswith('.txt'):
+            with open(path, 'r', encoding='utf-8') as f:
+                texts[file_name] = f.read()
+        elif file_name.lower().endswith('.pdf'):
+            import fitz  # pymupdf
+            with fitz.open(path) as doc:
+                texts[file_name] = ''.join(f"\n--- SEITE {page.number + 1} ---\n{page.get_text()}" for page in doc)
+    return texts
+
+
+def stress_text(size):
+    """Worst Case für Abschnitte: viele Anfänge, kein Ende"""
+    return "Anwesend: STV Name, Vorsitzende\nEntschuldigt: gez. Abstimmung:  \n\n  \n" * size
+
+
+def _time(function, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for text in texts:
+            function(text)
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(texts)
+
+
+def benchmark(texts, repeat=20):
+    """
+    Returns:
+        list: Ein Dictionary je Muster (legacy_us, compiled_us, speedup, identical)
+    """
+    results = []
+    documents = list(texts.values())
+    for name, legacy, flags, compiled, mode in CASES:
+        with_group = re.compile(legacy, flags).groups > 0
+        identical = all(run_legacy(legacy, flags, mode, text) == run_compiled(compiled, mode, text, with_group)
+                        for text in documents)
+        legacy_seconds = _time(lambda text: run_legacy(legacy, flags, mode, text), documents, repeat)
+        compiled_seconds = _time(lambda text: run_compiled(compiled, mode, text, with_group), documents, repeat)
+        results.append({
+            'name': name,
+            'legacy_us': legacy_seconds * 1e6,
+            'compiled_us': compiled_seconds * 1e6,
+            'speedup': legacy_seconds / compiled_seconds if compiled_seconds else float('inf'),
+            'identical': identical
+        })
+    return results
+
+
+def print_results(title, results):
+    print(f"\n=== {title} ===")
+    print(f"{'Muster':<28}{'bisher µs':>12}{'neu µs':>12}{'Faktor':>9}  Ergebnis")
+    for result in results:
+        print(f"{result['name']:<28}{result['legacy_us']:>12.1f}{result['compiled_us']:>12.1f}"
+              f"{result['speedup']:>8.1f}x  {'✅ identisch' if result['identical'] else '❌ abweichend'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-Benchmark der Protokoll-Muster')
+    parser.add_argument('folder', nargs='?', default=os.path.join('..', 'training', 'input'),
+                        help='Ordner mit Protokollen (.pdf oder .txt)')
+    parser.add_argument('--repeat', type=int, default=20, help='Wiederholungen je Muster')
+    parser.add_argument('--stress', type=int, default=0,
+                        help='Zusätzlich Worst-Case-Text mit N Abschnitts-Anfängen ohne Ende messen')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"❌ Ordner nicht gefunden: {args.folder}")
+        sys.exit(1)
+
+    texts = load_texts(args.folder)
+    if not texts:
+        print(f"❌ Keine Protokolle in {args.folder} gefunden")
+        sys.exit(1)
+
+    print(f"📄 {len(texts)} Protokolle, {sum(len(t) for t in texts.values())} Zeichen")
+    results = benchmark(texts, args.repeat)
+    print_results('PROTOKOLLE (pro Dokument)', results)
+
+    if args.stress:
+        stress_results = benchmark({'stress': stress_text(args.stress)}, repeat=1)
+        print_results(f'WORST CASE ({args.stress} Anfänge ohne Ende)', stress_results)
+        results += stress_results
+
+    if not all(result['identical'] for result in results):
+        print("\n❌ Mindestens ein Muster liefert abweichende Ergebnisse")
+        sys.exit(1)
+    print("\n✅ Alle Muster liefern identische Ergebnisse")
+
+
+if __name__ == '__main__':
+    main()
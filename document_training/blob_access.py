@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Gemeinsamer Blob-Zugriff für alle Skripte
+- BLOBSASURL wird an einer Stelle ausgewertet (Account, Container, SAS Token)
+- Ein gecachter ContainerClient pro Container über einen gepoolten HTTP-Transport
+- Parallele Helfer für Auflisten, Herunterladen und Hochladen
+- Lokaler, dateisystembasierter Ersatz-Container für Offline-Tests (BLOB_LOCAL_ROOT)
+"""
+
+import os
+import hashlib
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+# Container, falls die SAS URL keinen Container-Pfad enthält
+FALLBACK_CONTAINER = "container2"
+
+# HTTP-Transport: Verbindungen pro Host und Timeouts in Sekunden
+POOL_MAXSIZE = 32
+CONNECTION_TIMEOUT = 10
+READ_TIMEOUT = 120
+
+# Upload-Einstellungen des SDK (Einzel-Request bis 8 MB, darüber 4 MB Blöcke)
+MAX_SINGLE_PUT_SIZE = 8 * 1024 * 1024
+MAX_BLOCK_SIZE = 4 * 1024 * 1024
+
+BlobLocation = namedtuple('BlobLocation', ['account_url', 'container_name', 'sas_token'])
+
+_session = None
+_clients = {}
+_lock = threading.Lock()
+
+
+def resolve_sas_url():
+    """SAS URL aus BLOBSASURL bzw. BLOBCONTAINERURL + BLOBSASTOKEN"""
+    sas_url = os.getenv('BLOBSASURL')
+    if not sas_url and os.getenv('BLOBCONTAINERURL') and os.getenv('BLOBSASTOKEN'):
+        sas_url = f"{os.getenv('BLOBCONTAINERURL')}?{os.getenv('BLOBSASTOKEN').lstrip('?')}"
+    return sas_url
+
+
+def parse_sas_url(sas_url=None, fallback_container=FALLBACK_CONTAINER):
+    """
+    Zerlegt eine (Container-)SAS URL
+
+    Args:
+        sas_url (str): SAS URL (Standard: aus config.env)
+        fallback_container (str): Container, falls die URL keinen Pfad enthält
+
+    Returns:
+        BlobLocation: account_url, container_name, sas_token
+    """
+    sas_url = sas_url or resolve_sas_url()
+    if not sas_url:
+        raise ValueError("BLOBSASURL muss in config.env gesetzt werden")
+
+    parsed_url = urlparse(sas_url)
+    container_name = parsed_url.path.strip('/').split('/')[0] or fallback_container
+    return BlobLocation(f"{parsed_url.scheme}://{parsed_url.netloc}", container_name, parsed_url.query)
+
+
+def get_http_session():
+    """Gemeinsame requests.Session mit Connection-Pool für alle Blob-Zugriffe"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def get_container_client(container_name=None, sas_url=None, local_root=None):
+    """
+    Liefert einen gecachten ContainerClient
+
+    Args:
+        container_name (str): Container (Standard: aus der SAS URL)
+        sas_url (str): SAS URL (Standard: aus config.env)
+        local_root (str): Ordner für den lokalen Ersatz-Container (Standard: BLOB_LOCAL_ROOT)
+
+    Returns:
+        ContainerClient oder LocalContainerClient
+    """
+    local_root = local_root or os.getenv('BLOB_LOCAL_ROOT')
+    if local_root:
+        key = ('local', os.path.abspath(local_root), container_name or FALLBACK_CONTAINER)
+    else:
+        location = parse_sas_url(sas_url)
+        key = (location.account_url, container_name or location.container_name, location.sas_token)
+
+    with _lock:
+        client = _clients.get(key)
+    if client is not None:
+        return client
+
+    if local_root:
+        client = LocalContainerClient(key[1], key[2])
+    else:
+        from azure.storage.blob import ContainerClient
+        from azure.core.pipeline.transport import RequestsTransport
+
+        transport = RequestsTransport(
+            session=get_http_session(), session_owner=False,
+            connection_timeout=CONNECTION_TIMEOUT, read_timeout=READ_TIMEOUT
+        )
+        client = ContainerClient(
+            key[0], key[1], credential=key[2] or None, transport=transport,
+            max_single_put_size=MAX_SINGLE_PUT_SIZE, max_block_size=MAX_BLOCK_SIZE
+        )
+
+    with _lock:
+        return _clients.setdefault(key, client)
+
+
+def list_blobs_parallel(container_client, prefixes, max_workers=8):
+    """
+    Listet mehrere Präfixe parallel auf
+
+    Returns:
+        dict: Präfix -> Liste der BlobProperties
+    """
+    def collect(prefix):
+        return list(container_client.list_blobs(name_starts_with=prefix or None))
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, max(len(prefixes), 1))) as executor:
+        return dict(zip(prefixes, executor.map(collect, prefixes)))
+
+
+def download_blobs(container_client, blob_names, target_dir, max_workers=8):
+    """
+    Lädt Blobs parallel in einen lokalen Ordner (Blob-Pfade bleiben erhalten)
+
+    Returns:
+        dict: Blob-Name -> lokaler Pfad bzw. Exception
+    """
+    def download(blob_name):
+        local_path = os.path.join(target_dir, *blob_name.split('/'))
+        os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
+        with open(local_path, 'wb') as f:
+            container_client.download_blob(blob_name).readinto(f)
+        return local_path
+
+    return _run_parallel(download, blob_names, max_workers)
+
+
+def upload_files(container_client, files, max_workers=8, overwrite=True):
+    """
+    Lädt lokale Dateien parallel hoch
+
+    Args:
+        files (dict): Lokaler Pfad -> Blob-Name
+
+    Returns:
+        dict: Lokaler Pfad -> Blob-Name bzw. Exception
+    """
+    def upload(local_path):
+        with open(local_path, 'rb') as data:
+            container_client.upload_blob(name=files[local_path], data=data, overwrite=overwrite)
+        return files[local_path]
+
+    return _run_parallel(upload, list(files), max_workers)
+
+
+def _run_parallel(function, items, max_workers):
+    def run(item):
+        try:
+            return function(item)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(items, executor.map(run, items)))
+
+
+class LocalContainerClient:
+    """
+    Dateisystem-Ersatz für azure.storage.blob.ContainerClient (Offline-Tests)
+
+    Blobs liegen als Dateien unter <root>/<container_name>/<blob-name>.
+    Unterstützt die in diesem Projekt genutzten Methoden.
+    """
+
+    def __init__(self, root, container_name=FALLBACK_CONTAINER):
+        self.container_name = container_name
+        self.root = os.path.join(root, container_name)
+        self._blocks = {}
+        self._blocks_lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, blob_name):
+        return os.path.join(self.root, *blob_name.split('/'))
+
+    def exists(self):
+        return os.path.isdir(self.root)
+
+    def get_container_properties(self):
+        stat = os.stat(self.root)
+        modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        return SimpleNamespace(name=self.container_name, created=modified, last_modified=modified,
+                               etag=f"0x{stat.st_mtime_ns:X}")
+
+    def list_blobs(self, name_starts_with=None, **kwargs):
+        names = []
+        for directory, _, files in os.walk(self.root):
+            for file_name in files:
+                name = os.path.relpath(os.path.join(directory, file_name), self.root).replace(os.sep, '/')
+                if not name_starts_with or name.startswith(name_starts_with):
+                    names.append(name)
+        for name in sorted(names):
+            yield self.get_blob_client(name).get_blob_properties()
+
+    def get_blob_client(self, blob):
+        return LocalBlobClient(self, getattr(blob, 'name', blob))
+
+    def download_blob(self, blob, **kwargs):
+        return self.get_blob_client(blob).download_blob()
+
+    def upload_blob(self, name, data, overwrite=False, **kwargs):
+        return self.get_blob_client(name).upload_blob(data, overwrite=overwrite, **kwargs)
+
+    def delete_blob(self, blob, **kwargs):
+        self.get_blob_client(blob).delete_blob()
+
+
+class LocalBlobClient:
+    """Dateisystem-Ersatz für azure.storage.blob.BlobClient"""
+
+    def __init__(self, container, blob_name):
+        self.container = container
+        self.container_name = container.container_name
+        self.blob_name = blob_name
+        self.path = container._path(blob_name)
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def get_blob_properties(self):
+        if not self.exists():
+            raise ResourceNotFoundError(f"Blob nicht gefunden: {self.blob_name}")
+        stat = os.stat(self.path)
+        with open(self.path, 'rb') as f:
+            md5 = hashlib.md5(f.read()).digest()
+        return SimpleNamespace(
+            name=self.blob_name, size=stat.st_size,
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            etag=f"0x{stat.st_mtime_ns:X}",
+            content_settings=SimpleNamespace(content_type=None, content_md5=bytearray(md5))
+        )
+
+    def download_blob(self, **kwargs):
+        if not self.exists():
+            raise ResourceNotFoundError(f"Blob nicht gefunden: {self.blob_name}")
+        with open(self.path, 'rb') as f:
+            return _LocalDownloader(f.read())
+
+    def upload_blob(self, data, overwrite=False, **kwargs):
+        if self.exists() and not overwrite:
+            raise ResourceExistsError(f"Blob existiert bereits: {self.blob_name}")
+        if hasattr(data, 'read'):
+            data = data.read()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._write(data)
+        return {"etag": self.get_blob_properties().etag}
+
+    def stage_block(self, block_id, data, length=None, **kwargs):
+        with self.container._blocks_lock:
+            self.container._blocks[(self.blob_name, block_id)] = bytes(data)
+
+    def commit_block_list(self, block_list, **kwargs):
+        with self.container._blocks_lock:
+            parts = [self.container._blocks.pop((self.blob_name, getattr(b, 'id', None) or getattr(b, 'block_id', b)))
+                     for b in block_list]
+        self._write(b''.join(parts))
+
+    def delete_blob(self, **kwargs):
+        if not self.exists():
+            raise ResourceNotFoundError(f"Blob nicht gefunden: {self.blob_name}")
+        os.remove(self.path)
+
+    def _write(self, data):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+
+
+class _LocalDownloader:
+    """Entspricht den genutzten Methoden von StorageStreamDownloader"""
+
+    def __init__(self, data):
+        self._data = data
+        self.size = len(data)
+
+    def readall(self):
+        return self._data
+
+    def readinto(self, stream):
+        stream.write(self._data)
+        return self.size
+
+    def chunks(self):
+        yield self._data
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Paralleler Upload eines lokalen Ordners in einen Blob-Container
+- Begrenzter Worker-Pool für Dateien
+- Große Dateien werden als Block-Blob in Blöcken parallel gestaged (stage_block)
+- Dateien mit identischem MD5 im Container werden übersprungen
+- Fortschritts- und Durchsatzbericht
+"""
+
+import os
+import json
+import time
+import uuid
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from azure.storage.blob import ContentSettings, BlobBlock
+
+# Lokaler Cache der MD5-Summen (Pfad -> Größe, mtime, MD5), damit Re-Syncs nicht alles neu lesen
+MD5_CACHE_FILE = '.blob_sync_md5_cache.json'
+
+CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.json': 'application/json',
+}
+
+
+def file_md5(path, chunk_size=1024 * 1024):
+    """MD5 einer Datei, gestreamt in 1 MB Blöcken"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class ParallelBlobUploader:
+    """
+    Synchronisiert Dateien eines lokalen Ordners in einen Container
+
+    Args:
+        container_client: azure.storage.blob.ContainerClient
+        max_workers (int): Anzahl gleichzeitig hochgeladener Dateien
+        block_workers (int): Anzahl gleichzeitig gestageter Blöcke (über alle Dateien)
+        block_size (int): Blockgröße in Bytes für große Dateien
+        single_put_threshold (int): Dateien bis zu dieser Größe werden in einem Request hochgeladen
+    """
+
+    def __init__(self, container_client, max_workers=8, block_workers=8,
+                 block_size=4 * 1024 * 1024, single_put_threshold=8 * 1024 * 1024):
+        self.container_client = container_client
+        self.max_workers = max_workers
+        self.block_workers = block_workers
+        self.block_size = block_size
+        self.single_put_threshold = single_put_threshold
+        self._progress = {"files": 0, "bytes": 0}
+
+    def sync_folder(self, local_folder, blob_prefix="", suffixes=('.pdf', '.labels.json'), names=(), progress=True):
+        """
+        Lädt alle passenden Dateien hoch, deren Inhalt im Container noch nicht identisch vorliegt
+
+        Args:
+            suffixes (tuple): Dateiendungen (ohne Groß-/Kleinschreibung)
+            names (tuple): Zusätzlich hochzuladende Dateien mit genau diesem Namen (z.B. fields.json)
+
+        Returns:
+            dict: Bericht (uploaded, skipped, failed, bytes_uploaded, seconds, throughput_mb_s, errors)
+        """
+        start_time = time.perf_counter()
+        suffixes = tuple(s.lower() for s in suffixes)
+        files = sorted(
+            f for f in os.listdir(local_folder)
+            if (f.lower().endswith(suffixes) or f in names) and os.path.isfile(os.path.join(local_folder, f))
+        )
+        blob_names = {f: f"{blob_prefix.rstrip('/')}/{f}" if blob_prefix else f for f in files}
+
+        # Ein Listing statt eines Requests pro Datei
+        remote = {}
+        for blob in self.container_client.list_blobs(name_starts_with=blob_prefix or None):
+            md5 = blob.content_settings.content_md5 if blob.content_settings else None
+            remote[blob.name] = (blob.size, bytes(md5) if md5 else None)
+
+        md5_cache = self._load_md5_cache(local_folder)
+        to_upload = []
+        skipped = 0
+        for f in files:
+            path = os.path.join(local_folder, f)
+            local_md5 = self._cached_md5(md5_cache, path)
+            remote_size, remote_md5 = remote.get(blob_names[f], (None, None))
+            if remote_md5 == local_md5 and remote_size == os.path.getsize(path):
+                skipped += 1
+            else:
+                to_upload.append((path, blob_names[f], local_md5))
+        self._save_md5_cache(local_folder, md5_cache)
+
+        total_bytes = sum(os.path.getsize(p) for p, _, _ in to_upload)
+        if progress:
+            print(f"   🔍 {len(files)} Dateien, {skipped} unverändert, "
+                  f"{len(to_upload)} hochzuladen ({total_bytes / 1024 / 1024:.1f} MB)")
+
+        uploaded, errors = 0, []
+        self._progress = {"files": 0, "bytes": 0}
+        if to_upload:
+            with ThreadPoolExecutor(max_workers=self.block_workers) as block_executor, \
+                    ThreadPoolExecutor(max_workers=self.max_workers) as file_executor:
+                futures = {
+                    file_executor.submit(self._upload_file, path, blob_name, md5, block_executor): path
+                    for path, blob_name, md5 in to_upload
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        size = future.result()
+                    except Exception as e:
+                        errors.append({"file": path, "error": str(e)})
+                        if progress:
+                            print(f"   ❌ {os.path.basename(path)}: {e}")
+                        continue
+                    uploaded += 1
+                    self._progress["files"] += 1
+                    self._progress["bytes"] += size
+                    if progress:
+                        elapsed = max(time.perf_counter() - start_time, 1e-9)
+                        print(f"   ✅ [{self._progress['files']}/{len(to_upload)}] {os.path.basename(path)} "
+                              f"({self._progress['bytes'] / 1024 / 1024 / elapsed:.1f} MB/s)")
+
+        seconds = time.perf_counter() - start_time
+        uploaded_bytes = self._progress["bytes"]
+        return {
+            "uploaded": uploaded,
+            "skipped": skipped,
+            "failed": len(errors),
+            "bytes_uploaded": uploaded_bytes,
+            "seconds": round(seconds, 3),
+            "throughput_mb_s": round(uploaded_bytes / 1024 / 1024 / seconds, 2) if seconds else 0.0,
+            "errors": errors
+        }
+
+    def _upload_file(self, path, blob_name, md5, block_executor):
+        """Lädt eine Datei hoch (klein: ein Request, groß: parallele Blöcke) und liefert die Größe"""
+        size = os.path.getsize(path)
+        blob_client = self.container_client.get_blob_client(blob_name)
+        content_settings = ContentSettings(
+            content_type=CONTENT_TYPES.get(os.path.splitext(path)[1].lower(), 'application/octet-stream'),
+            content_md5=bytearray(md5)
+        )
+
+        if size <= self.single_put_threshold:
+            with open(path, 'rb') as data:
+                blob_client.upload_blob(data, overwrite=True, content_settings=content_settings)
+            return size
+
+        # Eindeutiges Präfix pro Upload, Block-IDs müssen innerhalb eines Blobs gleich lang sein
+        upload_id = uuid.uuid4().hex[:8]
+        offsets = list(range(0, size, self.block_size))
+        block_ids = [base64.b64encode(f"{upload_id}-{i:06d}".encode()).decode() for i in range(len(offsets))]
+
+        futures = [
+            block_executor.submit(self._stage_block, blob_client, path, block_id, offset)
+            for block_id, offset in zip(block_ids, offsets)
+        ]
+        for future in futures:
+            future.result()
+
+        blob_client.commit_block_list([BlobBlock(block_id=b) for b in block_ids],
+                                      content_settings=content_settings)
+        return size
+
+    def _stage_block(self, blob_client, path, block_id, offset):
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(self.block_size)
+        blob_client.stage_block(block_id, data, length=len(data))
+
+    @staticmethod
+    def _load_md5_cache(local_folder):
+        try:
+            with open(os.path.join(local_folder, MD5_CACHE_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_md5_cache(local_folder, cache):
+        try:
+            with open(os.path.join(local_folder, MD5_CACHE_FILE), 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _cached_md5(cache, path):
+        """MD5 aus dem Cache, falls Größe und Änderungszeit unverändert sind"""
+        stat = os.stat(path)
+        key = os.path.basename(path)
+        entry = cache.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return base64.b64decode(entry["md5"])
+        md5 = file_md5(path)
+        cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "md5": base64.b64encode(md5).decode()}
+        return md5
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Nicht-blockierendes Debug-Logging für die Document Intelligence Skripte
+Log-Einträge landen in einer Queue und werden von einem Hintergrund-Thread
+in eine größenbasiert rotierende Datei (und optional die Konsole) geschrieben.
+Dazu Hilfsfunktionen zum Kürzen und Schwärzen von Request-/Response-Bodies.
+"""
+
+import re
+import atexit
+import itertools
+import logging
+import logging.handlers
+import queue
+
+# Schlüssel, deren Werte nie im Log erscheinen sollen
+REDACTED_KEYS = {'ocp-apim-subscription-key', 'api-key', 'authorization', 'sig'}
+
+# SAS-Signaturen in URLs
+SAS_SIGNATURE_PATTERN = re.compile(r'(sig=)[^&\s"]+', re.IGNORECASE)
+
+_logger_ids = itertools.count()
+
+
+def setup_queue_logger(log_file, level=logging.DEBUG, console_level=logging.INFO,
+                       max_bytes=10 * 1024 * 1024, backup_count=5, name='document_intelligence'):
+    """
+    Erstellt einen Logger, dessen Handler über eine Queue im Hintergrund schreiben
+
+    Args:
+        log_file (str): Pfad der Log-Datei (None = keine Datei)
+        level (int|str): Minimales Level für die Datei
+        console_level (int|str|None): Minimales Level für die Konsole (None = keine Konsolenausgabe)
+        max_bytes (int): Dateigröße, ab der rotiert wird
+        backup_count (int): Anzahl aufbewahrter rotierter Dateien
+
+    Returns:
+        tuple: (logging.Logger, logging.handlers.QueueListener)
+    """
+    handlers = []
+    if log_file is not None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+        )
+        file_handler.setLevel(level)
+        file_handler.setFormatter(logging.Formatter('[%(asctime)s.%(msecs)03d] %(message)s', '%Y-%m-%d %H:%M:%S'))
+        handlers.append(file_handler)
+
+    if console_level is not None:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(logging.Formatter('🔍 %(levelname)s: %(message)s'))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+
+    # Eigener Logger pro Instanz, damit sich Handler mehrerer Trainer nicht mischen
+    logger = logging.getLogger(f"{name}.{next(_logger_ids)}")
+    logger.setLevel(min((h.level for h in handlers), default=logging.CRITICAL + 1))
+    logger.propagate = False
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return logger, listener
+
+
+def stop_listener(listener):
+    """Stoppt einen QueueListener und schreibt ausstehende Einträge (mehrfacher Aufruf erlaubt)"""
+    if getattr(listener, '_thread', None) is not None:
+        listener.stop()
+
+
+def redact_url(url):
+    """Ersetzt SAS-Signaturen in URLs"""
+    return SAS_SIGNATURE_PATTERN.sub(r'\1***', url) if url else url
+
+
+def truncate_text(text, max_chars):
+    """Kürzt Text auf max_chars Zeichen mit Hinweis auf die Originallänge"""
+    if text is None or max_chars is None or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} Zeichen gekürzt]"
+
+
+def summarize_payload(value, max_chars=200, max_items=20):
+    """
+    Erzeugt eine kompakte, geschwärzte Kopie einer JSON-Struktur
+
+    Lange Strings (z.B. base64-PDFs) werden auf max_chars gekürzt,
+    lange Listen auf max_items Einträge, Schlüssel aus REDACTED_KEYS geschwärzt.
+    """
+    if isinstance(value, dict):
+        return {
+            key: '***' if str(key).lower() in REDACTED_KEYS else summarize_payload(item, max_chars, max_items)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        summary = [summarize_payload(item, max_chars, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            summary.append(f"... [{len(value) - max_items} weitere Einträge]")
+        return summary
+    if isinstance(value, str):
+        return redact_url(truncate_text(value, max_chars))
+    return value
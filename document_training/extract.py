@@ -1,4 +1,3 @@
-import re
 import os
 import json
 import base64
@@ -8,9 +7,22 @@ from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
 
+import protocol_patterns as patterns
+import attendance
+from layout_index import LayoutIndex, layout_pages
+
 # Lade Umgebungsvariablen
 load_dotenv('../config.env')
 
+# Metadaten-Felder im Trainingsformat: Feldname, Typ, Schlüssel in extract_metadata
+METADATA_FIELDS = [
+    ("document_type", "string", "dokumenttyp"),
+    ("session_type", "string", "sitzungsart"),
+    ("date", "date", "tag"),
+    ("duration", "string", "dauer"),
+    ("location", "string", "ort")
+]
+
 class DocumentAnalyzer:
     def __init__(self):
         """Initialisiert den Document Intelligence Client"""
@@ -68,7 +80,7 @@ class DocumentAnalyzer:
             dict: Strukturierte Anwesenheitsdaten
         """
         # Finde den Anwesenheitsbereich (zwischen "Anwesend:" und "Tagesordnung:")
-        attendance_section = re.search(r"Anwesend:(.*?)Tagesordnung:", text, re.DOTALL | re.IGNORECASE)
+        attendance_section = patterns.ATTENDANCE_TO_AGENDA.search(text)
         
         if not attendance_section:
             return {"error": "Anwesenheitsbereich nicht gefunden"}
@@ -79,11 +91,12 @@ class DocumentAnalyzer:
         result = {
             "anwesend": [],
             "entschuldigt": [],
-            "funktionen": {}
+            "funktionen": {},
+            "personen": []  # Strukturierte Einträge (attendance.py)
         }
         
         # Teile in Anwesend und Entschuldigt
-        entschuldigt_match = re.search(r"Entschuldigt:(.*?)$", attendance_text, re.DOTALL | re.IGNORECASE)
+        entschuldigt_match = patterns.ENTSCHULDIGT_TO_END.search(attendance_text)
         
         if entschuldigt_match:
             anwesend_text = attendance_text[:entschuldigt_match.start()]
@@ -93,62 +106,31 @@ class DocumentAnalyzer:
             entschuldigt_text = ""
         
         # Parse Anwesende
-        result["anwesend"] = self._parse_attendance_section(anwesend_text)
+        result["anwesend"] = self._parse_attendance_section(anwesend_text, "present", result["personen"])
         
         # Parse Entschuldigte
         if entschuldigt_text:
-            result["entschuldigt"] = self._parse_attendance_section(entschuldigt_text)
+            result["entschuldigt"] = self._parse_attendance_section(entschuldigt_text, "excused", result["personen"])
         
         return result
     
-    def _parse_attendance_section(self, text):
+    def _parse_attendance_section(self, text, status="present", records=None):
         """
         Parst einen Anwesenheitsbereich und extrahiert Funktionen und Personen
+        (ein Muster je Zeile, TOP-Angaben und Vertretungen strukturiert, siehe attendance.py)
         
         Args:
             text (str): Text des Anwesenheitsbereichs
+            status (str): "present" oder "excused"
+            records (list): Sammelt die strukturierten Einträge (optional)
             
         Returns:
             list: Liste der Funktionen mit Personen
         """
-        functions = []
-        current_function = None
-        
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Ignoriere Seitennummern und Dokumentennamen
-            if re.match(r"^Seite \d+ von \d+$", line) or re.match(r"^STV/\d+/\d+-\d+$", line):
-                continue
-                
-            # Prüfe ob es eine Funktionsüberschrift ist (erweitert um "Von der Verwaltung:")
-            if re.match(r"^(Von der|Vom|Schriftführer)", line, re.IGNORECASE):
-                current_function = line
-                functions.append({
-                    "funktion": current_function,
-                    "personen": []
-                })
-            # Prüfe ob es eine Person ist (beginnt mit STV, Stadtrat, etc.)
-            elif re.match(r"^(STV|Stadtrat|Bürgermeister|Erster Stadtrat)", line, re.IGNORECASE):
-                if current_function and functions:
-                    functions[-1]["personen"].append(line)
-                else:
-                    # Fallback für Personen ohne Funktionsüberschrift
-                    functions.append({
-                        "funktion": "Unbekannt",
-                        "personen": [line]
-                    })
-            # Spezialfall: Schriftführer oder Verwaltung mit Namen (ohne Funktionspräfix)
-            elif current_function and ("Schriftführer" in current_function or "Verwaltung" in current_function) and not re.match(r"^(STV|Stadtrat|Bürgermeister|Erster Stadtrat)", line, re.IGNORECASE):
-                # Wenn wir bei Schriftführer oder Verwaltung sind und die Zeile nicht mit einer Funktion beginnt, ist es wahrscheinlich der Name
-                if functions and functions[-1]["funktion"] == current_function:
-                    functions[-1]["personen"].append(line)
-        
-        return functions
+        section_records = attendance.parse_section(text, status)
+        if records is not None:
+            records.extend(section_records)
+        return attendance.group_by_function(section_records)
     
     def convert_to_azure_format(self, results):
         """
@@ -166,84 +148,18 @@ class DocumentAnalyzer:
             "fields": {}
         }
         
+        # Positionen der Werte aus dem Layout (Index wird pro Response nur einmal aufgebaut)
+        resolver = results.get('layout_index') or LayoutIndex(results.get('layout_pages', []))
+        unresolved = []
+        
         # Metadaten als Felder hinzufügen
         metadata = results.get('metadata', {})
         if metadata:
-            azure_format["fields"]["document_type"] = {
-                "type": "string",
-                "value": metadata.get('dokumenttyp', ''),
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.1},
-                            {"x": 0.4, "y": 0.1},
-                            {"x": 0.4, "y": 0.15},
-                            {"x": 0.1, "y": 0.15}
-                        ]
-                    }
-                ]
-            }
-            azure_format["fields"]["session_type"] = {
-                "type": "string", 
-                "value": metadata.get('sitzungsart', ''),
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.2},
-                            {"x": 0.6, "y": 0.2},
-                            {"x": 0.6, "y": 0.25},
-                            {"x": 0.1, "y": 0.25}
-                        ]
-                    }
-                ]
-            }
-            azure_format["fields"]["date"] = {
-                "type": "date",
-                "value": metadata.get('tag', ''),
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.3},
-                            {"x": 0.3, "y": 0.3},
-                            {"x": 0.3, "y": 0.35},
-                            {"x": 0.1, "y": 0.35}
-                        ]
-                    }
-                ]
-            }
-            azure_format["fields"]["duration"] = {
-                "type": "string",
-                "value": metadata.get('dauer', ''),
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.4},
-                            {"x": 0.4, "y": 0.4},
-                            {"x": 0.4, "y": 0.45},
-                            {"x": 0.1, "y": 0.45}
-                        ]
-                    }
-                ]
-            }
-            azure_format["fields"]["location"] = {
-                "type": "string",
-                "value": metadata.get('ort', ''),
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.5},
-                            {"x": 0.7, "y": 0.5},
-                            {"x": 0.7, "y": 0.55},
-                            {"x": 0.1, "y": 0.55}
-                        ]
-                    }
-                ]
-            }
+            for field_name, field_type, key in METADATA_FIELDS:
+                value = metadata.get(key, '')
+                azure_format["fields"][field_name] = self._labeled_field(
+                    field_name, field_type, value, resolver.bounding_regions(value), unresolved
+                )
         
         # Anwesenheitsdaten strukturieren
         attendance_data = results.get('attendance_data', {})
@@ -269,37 +185,15 @@ class DocumentAnalyzer:
                         "status": "excused"
                     })
             
-            azure_format["fields"]["attendance_present"] = {
-                "type": "array",
-                "value": anwesend_list,
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.6},
-                            {"x": 0.8, "y": 0.6},
-                            {"x": 0.8, "y": 0.8},
-                            {"x": 0.1, "y": 0.8}
-                        ]
-                    }
-                ]
-            }
+            azure_format["fields"]["attendance_present"] = self._labeled_field(
+                "attendance_present", "array", anwesend_list,
+                resolver.bounding_regions_for_values(p["name"] for p in anwesend_list), unresolved
+            )
             
-            azure_format["fields"]["attendance_excused"] = {
-                "type": "array", 
-                "value": entschuldigt_list,
-                "boundingRegions": [
-                    {
-                        "pageNumber": 1,
-                        "polygon": [
-                            {"x": 0.1, "y": 0.85},
-                            {"x": 0.8, "y": 0.85},
-                            {"x": 0.8, "y": 0.95},
-                            {"x": 0.1, "y": 0.95}
-                        ]
-                    }
-                ]
-            }
+            azure_format["fields"]["attendance_excused"] = self._labeled_field(
+                "attendance_excused", "array", entschuldigt_list,
+                resolver.bounding_regions_for_values(p["name"] for p in entschuldigt_list), unresolved
+            )
             
             # Zusammenfassung
             azure_format["fields"]["attendance_summary"] = {
@@ -316,11 +210,21 @@ class DocumentAnalyzer:
             "analysis_method": results.get('analysis_method', 'unknown'),
             "total_pages": results.get('total_pages', 0),
             "extraction_timestamp": results.get('extraction_timestamp', ''),
-            "document_path": results.get('document_path', '')
+            "document_path": results.get('document_path', ''),
+            "unresolved_fields": unresolved
         }
         
         return azure_format
     
+    def _labeled_field(self, field_name, field_type, value, bounding_regions, unresolved):
+        """Feld im Trainingsformat; ohne gefundene Position bleibt es ungelabelt (keine boundingRegions)"""
+        field = {"type": field_type, "value": value}
+        if bounding_regions:
+            field["boundingRegions"] = bounding_regions
+        elif value:
+            unresolved.append(field_name)
+        return field
+    
     def extract_metadata(self, text):
         """
         Extrahiert Metadaten aus dem Dokument
@@ -340,27 +244,27 @@ class DocumentAnalyzer:
         }
         
         # 1. Dokumenttyp erkennen (nach "NIEDERSCHRIFT")
-        niederschrift_match = re.search(r"NIEDERSCHRIFT", text, re.IGNORECASE)
+        niederschrift_match = patterns.NIEDERSCHRIFT.search(text)
         if niederschrift_match:
             metadata["dokumenttyp"] = "Niederschrift"
         
         # 2. Sitzungsart extrahieren (nach "über die Sitzung der" und vor "der Stadt Pohlheim")
-        sitzung_match = re.search(r"über die Sitzung der ([^\n]+) der Stadt Pohlheim", text, re.IGNORECASE)
+        sitzung_match = patterns.SITZUNG.search(text)
         if sitzung_match:
             metadata["sitzungsart"] = sitzung_match.group(1).strip()
         
         # 3. Tag extrahieren (nach "Tag:")
-        tag_match = re.search(r"Tag:\s*([^\n]+)", text, re.IGNORECASE)
+        tag_match = patterns.TAG.search(text)
         if tag_match:
             metadata["tag"] = tag_match.group(1).strip()
         
         # 4. Dauer extrahieren (nach "Dauer:")
-        dauer_match = re.search(r"Dauer:\s*([^\n]+)", text, re.IGNORECASE)
+        dauer_match = patterns.DAUER.search(text)
         if dauer_match:
             metadata["dauer"] = dauer_match.group(1).strip()
         
         # 5. Ort extrahieren (nach "Ort:")
-        ort_match = re.search(r"Ort:\s*([^\n]+)", text, re.IGNORECASE)
+        ort_match = patterns.ORT_FIELD.search(text)
         if ort_match:
             metadata["ort"] = ort_match.group(1).strip()
         
@@ -405,7 +309,7 @@ class DocumentAnalyzer:
             list: Liste aller Anwesenheits-Vorkommen
         """
         # Finde alle Anwesenheits-Vorkommen
-        attendance_matches = re.findall(r"(STV|Stadtrat|Bürgermeister|Erster Stadtrat)\s+[^\\n]+", text, re.IGNORECASE)
+        attendance_matches = patterns.PERSON_LINE.findall(text)
         return attendance_matches
     
     def find_all_tops_in_text(self, text):
@@ -419,31 +323,32 @@ class DocumentAnalyzer:
             list: Liste aller TOP-Vorkommen
         """
         # Finde alle TOP-Vorkommen
-        top_matches = re.findall(r"TOP\s\d+[^\n]*", text, re.IGNORECASE)
+        top_matches = patterns.TOP_MENTION.findall(text)
         return top_matches
     
-    def extract_tops_from_layout(self, response):
+    def extract_tops_from_layout(self, response, index=None):
         """
         Extrahiert TOPs aus Document Intelligence Layout-Response
         
         Args:
             response: Document Intelligence Response-Objekt
+            index (LayoutIndex): Bereits aufgebauter Index der Response (optional)
             
         Returns:
             list: Liste der gefundenen TOPs mit Metadaten
         """
+        index = index or LayoutIndex.from_response(response)
         tops_found = []
         
-        for page in response.pages:
-            for line in page.lines:
-                if re.match(r"TOP\s\d+:", line.content):
-                    top_info = {
-                        "content": line.content,
-                        "page_number": page.page_number,
-                        "position": line.polygon if hasattr(line, 'polygon') else None,
-                        "confidence": line.confidence if hasattr(line, 'confidence') else None
-                    }
-                    tops_found.append(top_info)
+        # Nur Zeilen prüfen, die mit "TOP" beginnen (Wort-Index statt aller Zeilen)
+        for line in index.lines_starting_with("TOP"):
+            if patterns.TOP_HEADING.match(line.content):
+                tops_found.append({
+                    "content": line.content,
+                    "page_number": line.page_number,
+                    "position": line.polygon,
+                    "confidence": line.confidence
+                })
         
         return tops_found
     
@@ -464,14 +369,15 @@ class DocumentAnalyzer:
         if not response:
             return {"error": "Dokumentanalyse fehlgeschlagen"}
         
+        # Seiten, Zeilen und Wörter mit Polygonen; Index einmal für TOPs und Label-Positionen
+        pages = layout_pages(response)
+        index = LayoutIndex(pages)
+        
         # TOPs aus Layout extrahieren
-        layout_tops = self.extract_tops_from_layout(response)
+        layout_tops = self.extract_tops_from_layout(response, index)
         
-        # Vollständigen Text extrahieren für Regex-Analyse
-        full_text = ""
-        for page in response.pages:
-            for line in page.lines:
-                full_text += line.content + "\n"
+        # Vollständigen Text extrahieren für Regex-Analyse (Offsets entsprechen index.line_at)
+        full_text = index.text
         
         # Anwesenheitsdaten mit Regex extrahieren
         attendance_data = self.extract_attendance_from_text(full_text)
@@ -498,6 +404,8 @@ class DocumentAnalyzer:
                 "all_attendance_matches": all_attendance_matches,
                 "metadata": local_metadata,  # Verwende lokale Metadaten
                 "total_pages": len(response.pages),
+                "layout_pages": pages,
+                "layout_index": index,
                 "full_text": full_text,
                 "local_full_text": local_text,  # Zusätzlich: Lokaler Text
                 "analysis_method": "Azure + Local",
@@ -511,6 +419,8 @@ class DocumentAnalyzer:
                 "all_attendance_matches": all_attendance_matches,
                 "metadata": metadata,
                 "total_pages": len(response.pages),
+                "layout_pages": pages,
+                "layout_index": index,
                 "full_text": full_text,
                 "analysis_method": "Azure only"
             }
@@ -1,4 +1,3 @@
-import re
 import os
 import json
 import base64
@@ -8,6 +7,9 @@ from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
 
+import protocol_patterns as patterns
+import attendance
+
 # Lade Umgebungsvariablen
 load_dotenv('../config.env')
 
@@ -40,7 +42,7 @@ class DocumentAnalyzer:
         
         try:
             # Versuche deutsches Format zu parsen (dd.mm.yyyy)
-            if re.match(r'\d{1,2}\.\d{1,2}\.\d{4}', date_string):
+            if patterns.DATE.match(date_string):
                 date_obj = datetime.strptime(date_string, '%d.%m.%Y')
                 return date_obj.strftime('%Y-%m-%dT00:00:00Z')
             else:
@@ -93,7 +95,7 @@ class DocumentAnalyzer:
             dict: Strukturierte Anwesenheitsdaten
         """
         # Finde den Anwesenheitsbereich (zwischen "Anwesend:" und "Tagesordnung:")
-        attendance_section = re.search(r"Anwesend:(.*?)Tagesordnung:", text, re.DOTALL | re.IGNORECASE)
+        attendance_section = patterns.ATTENDANCE_TO_AGENDA.search(text)
         
         if not attendance_section:
             return {"error": "Anwesenheitsbereich nicht gefunden"}
@@ -104,11 +106,12 @@ class DocumentAnalyzer:
         result = {
             "anwesend": [],
             "entschuldigt": [],
-            "funktionen": {}
+            "funktionen": {},
+            "personen": []  # Strukturierte Einträge (attendance.py)
         }
         
         # Teile in Anwesend und Entschuldigt
-        entschuldigt_match = re.search(r"Entschuldigt:(.*?)$", attendance_text, re.DOTALL | re.IGNORECASE)
+        entschuldigt_match = patterns.ENTSCHULDIGT_TO_END.search(attendance_text)
         
         if entschuldigt_match:
             anwesend_text = attendance_text[:entschuldigt_match.start()]
@@ -118,62 +121,31 @@ class DocumentAnalyzer:
             entschuldigt_text = ""
         
         # Parse Anwesende
-        result["anwesend"] = self._parse_attendance_section(anwesend_text)
+        result["anwesend"] = self._parse_attendance_section(anwesend_text, "present", result["personen"])
         
         # Parse Entschuldigte
         if entschuldigt_text:
-            result["entschuldigt"] = self._parse_attendance_section(entschuldigt_text)
+            result["entschuldigt"] = self._parse_attendance_section(entschuldigt_text, "excused", result["personen"])
         
         return result
     
-    def _parse_attendance_section(self, text):
+    def _parse_attendance_section(self, text, status="present", records=None):
         """
         Parst einen Anwesenheitsbereich und extrahiert Funktionen und Personen
+        (ein Muster je Zeile, TOP-Angaben und Vertretungen strukturiert, siehe attendance.py)
         
         Args:
             text (str): Text des Anwesenheitsbereichs
+            status (str): "present" oder "excused"
+            records (list): Sammelt die strukturierten Einträge (optional)
             
         Returns:
             list: Liste der Funktionen mit Personen
         """
-        functions = []
-        current_function = None
-        
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Ignoriere Seitennummern und Dokumentennamen
-            if re.match(r"^Seite \d+ von \d+$", line) or re.match(r"^STV/\d+/\d+-\d+$", line):
-                continue
-                
-            # Prüfe ob es eine Funktionsüberschrift ist (erweitert um "Von der Verwaltung:")
-            if re.match(r"^(Von der|Vom|Schriftführer)", line, re.IGNORECASE):
-                current_function = line
-                functions.append({
-                    "funktion": current_function,
-                    "personen": []
-                })
-            # Prüfe ob es eine Person ist (beginnt mit STV, Stadtrat, etc.)
-            elif re.match(r"^(STV|Stadtrat|Bürgermeister|Erster Stadtrat)", line, re.IGNORECASE):
-                if current_function and functions:
-                    functions[-1]["personen"].append(line)
-                else:
-                    # Fallback für Personen ohne Funktionsüberschrift
-                    functions.append({
-                        "funktion": "Unbekannt",
-                        "personen": [line]
-                    })
-            # Spezialfall: Schriftführer oder Verwaltung mit Namen (ohne Funktionspräfix)
-            elif current_function and ("Schriftführer" in current_function or "Verwaltung" in current_function) and not re.match(r"^(STV|Stadtrat|Bürgermeister|Erster Stadtrat)", line, re.IGNORECASE):
-                # Wenn wir bei Schriftführer oder Verwaltung sind und die Zeile nicht mit einer Funktion beginnt, ist es wahrscheinlich der Name
-                if functions and functions[-1]["funktion"] == current_function:
-                    functions[-1]["personen"].append(line)
-        
-        return functions
+        section_records = attendance.parse_section(text, status)
+        if records is not None:
+            records.extend(section_records)
+        return attendance.group_by_function(section_records)
     
     def convert_to_custom_format(self, results):
         """
@@ -258,27 +230,27 @@ class DocumentAnalyzer:
         }
         
         # 1. Dokumenttyp erkennen (nach "NIEDERSCHRIFT")
-        niederschrift_match = re.search(r"NIEDERSCHRIFT", text, re.IGNORECASE)
+        niederschrift_match = patterns.NIEDERSCHRIFT.search(text)
         if niederschrift_match:
             metadata["dokumenttyp"] = "Niederschrift"
         
         # 2. Sitzungsart extrahieren (nach "über die Sitzung der" und vor "der Stadt Pohlheim")
-        sitzung_match = re.search(r"über die Sitzung der ([^\n]+) der Stadt Pohlheim", text, re.IGNORECASE)
+        sitzung_match = patterns.SITZUNG.search(text)
         if sitzung_match:
             metadata["sitzungsart"] = sitzung_match.group(1).strip()
         
         # 3. Tag extrahieren (nach "Tag:")
-        tag_match = re.search(r"Tag:\s*([^\n]+)", text, re.IGNORECASE)
+        tag_match = patterns.TAG.search(text)
         if tag_match:
             metadata["tag"] = tag_match.group(1).strip()
         
         # 4. Dauer extrahieren (nach "Dauer:")
-        dauer_match = re.search(r"Dauer:\s*([^\n]+)", text, re.IGNORECASE)
+        dauer_match = patterns.DAUER.search(text)
         if dauer_match:
             metadata["dauer"] = dauer_match.group(1).strip()
         
         # 5. Ort extrahieren (nach "Ort:")
-        ort_match = re.search(r"Ort:\s*([^\n]+)", text, re.IGNORECASE)
+        ort_match = patterns.ORT_FIELD.search(text)
         if ort_match:
             metadata["ort"] = ort_match.group(1).strip()
         
@@ -323,7 +295,7 @@ class DocumentAnalyzer:
             list: Liste aller Anwesenheits-Vorkommen
         """
         # Finde alle Anwesenheits-Vorkommen
-        attendance_matches = re.findall(r"(STV|Stadtrat|Bürgermeister|Erster Stadtrat)\s+[^\\n]+", text, re.IGNORECASE)
+        attendance_matches = patterns.PERSON_LINE.findall(text)
         return attendance_matches
     
     def find_all_tops_in_text(self, text):
@@ -337,7 +309,7 @@ class DocumentAnalyzer:
             list: Liste aller TOP-Vorkommen
         """
         # Finde alle TOP-Vorkommen
-        top_matches = re.findall(r"TOP\s\d+[^\n]*", text, re.IGNORECASE)
+        top_matches = patterns.TOP_MENTION.findall(text)
         return top_matches
     
     def extract_tops_from_layout(self, response):
@@ -354,7 +326,7 @@ class DocumentAnalyzer:
         
         for page in response.pages:
             for line in page.lines:
-                if re.match(r"TOP\s\d+:", line.content):
+                if patterns.TOP_HEADING.match(line.content):
                     top_info = {
                         "content": line.content,
                         "page_number": page.page_number,
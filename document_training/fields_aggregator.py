@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Inkrementelle Ableitung der fields.json aus *.labels.json
+- Pro Label-Datei wird eine Feld-Signatur (Feldname -> Typ, gelabelt ja/nein) im Cache
+  gespeichert, zusammen mit mtime, Größe und SHA-1 der Datei
+- Bei jedem Lauf werden nur neue/geänderte Dateien gelesen; ihre alte Signatur wird aus
+  den Feld-Zählern entfernt und die neue addiert (gelöschte Dateien werden abgezogen)
+- Typkonflikte (ein Feld mit verschiedenen Typen in verschiedenen Dateien) werden mit den
+  betroffenen Dateien gemeldet; verwendet wird der häufigste Typ statt "letzte Datei gewinnt"
+- fields.json und Cache werden atomar geschrieben (temporäre Datei + os.replace)
+
+Verwendung:
+    python fields_aggregator.py ../pohlheim_protokolle/Stavo --output fields.json [--labeled-only]
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+
+CACHE_FILE = '.fields_cache.json'
+CACHE_VERSION = 1
+
+
+def write_json_atomic(path, data, indent=2):
+    """Schreibt JSON in eine temporäre Datei im Zielordner und ersetzt dann das Ziel"""
+    folder = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=folder)
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def field_signature(path):
+    """
+    Feld-Signatur einer Label-Datei
+
+    Returns:
+        dict: Feldname -> [Typ, gelabelt (hat boundingRegions)]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"JSON-Objekt erwartet, gefunden: {type(data).__name__}")
+    fields = data.get('fields')
+    if not isinstance(fields, dict):
+        raise ValueError("Kein 'fields' Objekt gefunden")
+    return {name: [field.get('type', 'unknown'), 'boundingRegions' in field]
+            for name, field in fields.items() if isinstance(field, dict)}
+
+
+class FieldsAggregator:
+    """
+    Feld-Zähler über alle Label-Dateien eines Ordners, inkrementell über einen Cache
+
+    counts: Feldname -> Typ -> [Dateien, Dateien mit boundingRegions]
+    order: Feldnamen in der Reihenfolge ihres ersten Auftretens
+    """
+
+    def __init__(self, labels_path, cache_path=None):
+        self.labels_path = labels_path
+        self.cache_path = cache_path or os.path.join(labels_path, CACHE_FILE)
+        self.files = {}
+        self.counts = {}
+        self.order = []
+        self._load_cache()
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cache.get('version') != CACHE_VERSION:
+            return
+        self.files = cache.get('files', {})
+        self.counts = cache.get('counts', {})
+        self.order = cache.get('order', [])
+
+    def save_cache(self):
+        write_json_atomic(self.cache_path, {'version': CACHE_VERSION, 'files': self.files,
+                                            'counts': self.counts, 'order': self.order}, indent=None)
+
+    def _apply(self, signature, sign):
+        for name, (field_type, labeled) in signature.items():
+            if sign > 0 and name not in self.counts:
+                self.order.append(name)
+            entry = self.counts.setdefault(name, {}).setdefault(field_type, [0, 0])
+            entry[0] += sign
+            entry[1] += sign if labeled else 0
+            if entry[0] <= 0:
+                del self.counts[name][field_type]
+            if not self.counts[name]:
+                del self.counts[name]
+                self.order.remove(name)
+
+    def update(self):
+        """
+        Liest nur neue/geänderte Label-Dateien und aktualisiert die Zähler
+
+        Returns:
+            dict: Listen 'added', 'changed', 'removed', 'unchanged' (Dateinamen) und 'errors' (Name -> Meldung)
+        """
+        status = {'added': [], 'changed': [], 'removed': [], 'unchanged': [], 'errors': {}}
+        current = {}
+        with os.scandir(self.labels_path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.labels.json'):
+                    current[entry.name] = entry.stat()
+
+        for name in sorted(current):
+            stat = current[name]
+            cached = self.files.get(name)
+            path = os.path.join(self.labels_path, name)
+            if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                status['unchanged'].append(name)
+                continue
+
+            try:
+                digest = _sha1(path)
+                if cached and cached['sha1'] == digest:
+                    # Nur berührt (z.B. kopiert): Inhalt gleich, Signatur bleibt
+                    cached.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    status['unchanged'].append(name)
+                    continue
+                signature = field_signature(path)
+            except (OSError, ValueError) as e:
+                # Fehlerhafte Dateien nicht cachen: sie werden bei jedem Lauf erneut gelesen und gemeldet
+                status['errors'][name] = str(e)
+                if cached:
+                    self._apply(self.files.pop(name)['fields'], -1)
+                continue
+
+            # Erst zählen, dann die alte Signatur abziehen: Felder, die die Datei
+            # behält, verlieren so nicht ihre Position in order
+            self._apply(signature, 1)
+            if cached:
+                self._apply(cached['fields'], -1)
+            self.files[name] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                'sha1': digest, 'fields': signature}
+            status['changed' if cached else 'added'].append(name)
+
+        # Gelöschte Dateien zuletzt abziehen (z.B. umbenannte Datei: Felder behalten ihre Position)
+        for name in sorted(set(self.files) - set(current)):
+            self._apply(self.files.pop(name)['fields'], -1)
+            status['removed'].append(name)
+        return status
+
+    def _types(self, name, labeled_only):
+        column = 1 if labeled_only else 0
+        return {field_type: counts[column] for field_type, counts in self.counts[name].items() if counts[column]}
+
+    def conflicts(self, labeled_only=False):
+        """
+        Felder mit mehreren Typen
+
+        Returns:
+            dict: Feldname -> Typ -> Dateinamen
+        """
+        conflicts = {}
+        for name in self.order:
+            if len(self._types(name, labeled_only)) < 2:
+                continue
+            by_type = {}
+            for file_name, cached in sorted(self.files.items()):
+                field = cached['fields'].get(name)
+                if field and (field[1] or not labeled_only):
+                    by_type.setdefault(field[0], []).append(file_name)
+            conflicts[name] = by_type
+        return conflicts
+
+    def fields_json(self, labeled_only=False):
+        """fields.json-Inhalt; bei Konflikten gewinnt der häufigste Typ (bei Gleichstand alphabetisch)"""
+        fields = []
+        for name in self.order:
+            types = self._types(name, labeled_only)
+            if types:
+                field_type = max(sorted(types), key=lambda t: types[t])
+                fields.append({"name": name, "type": field_type})
+        return {"fields": fields}
+
+
+def write_fields_json(output_path, fields_json):
+    """Schreibt fields.json atomar, nur wenn sich der Inhalt geändert hat"""
+    if os.path.exists(output_path):
+        try:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == fields_json:
+                    return False
+        except (OSError, ValueError):
+            pass
+    write_json_atomic(output_path, fields_json)
+    return True
+
+
+def aggregate(labels_path, output_path='fields.json', labeled_only=False, cache_path=None):
+    """
+    Aktualisiert fields.json aus den Label-Dateien eines Ordners
+
+    Returns:
+        dict: fields (fields.json-Inhalt), status (siehe FieldsAggregator.update),
+              conflicts, written (ob fields.json neu geschrieben wurde)
+    """
+    aggregator = FieldsAggregator(labels_path, cache_path)
+    status = aggregator.update()
+    fields_json = aggregator.fields_json(labeled_only)
+    written = write_fields_json(output_path, fields_json)
+    aggregator.save_cache()
+    return {'fields': fields_json, 'status': status, 'conflicts': aggregator.conflicts(labeled_only),
+            'written': written}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='fields.json inkrementell aus *.labels.json ableiten')
+    parser.add_argument('labels_path', help='Ordner mit *.labels.json')
+    parser.add_argument('--output', default='fields.json', help='Ziel-Datei (Standard: fields.json)')
+    parser.add_argument('--labeled-only', action='store_true',
+                        help='Nur Felder mit boundingRegions übernehmen')
+    parser.add_argument('--cache', help=f'Cache-Datei (Standard: {CACHE_FILE} im Label-Ordner)')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.labels_path):
+        print(f"❌ Pfad nicht gefunden: {args.labels_path}")
+        return 1
+
+    result = aggregate(args.labels_path, args.output, args.labeled_only, args.cache)
+    status = result['status']
+    total = len(status['added']) + len(status['changed']) + len(status['unchanged']) + len(status['errors'])
+    if not total:
+        print(f"❌ Keine .labels.json Dateien in {args.labels_path} gefunden")
+        return 1
+
+    print(f"✅ {total} .labels.json Dateien: {len(status['added'])} neu, {len(status['changed'])} geändert, "
+          f"{len(status['removed'])} entfernt, {len(status['unchanged'])} unverändert, "
+          f"{len(status['errors'])} fehlerhaft")
+    for name, message in status['errors'].items():
+        print(f"   ❌ {name}: {message}")
+    for name, by_type in result['conflicts'].items():
+        print(f"   ⚠️ Typkonflikt {name}: " + ', '.join(f"{t} ({len(files)} Dateien, z.B. {files[0]})"
+                                                      for t, files in by_type.items()))
+
+    fields = result['fields']['fields']
+    action = 'geschrieben' if result['written'] else 'unverändert'
+    print(f"📋 {args.output} {action}: {len(fields)} Felder")
+    for field in fields:
+        print(f"   - {field['name']}: {field['type']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
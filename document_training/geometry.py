@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Polygon-Geometrie für Label-Dateien und Visualisierung (NumPy)
+- Polygone werden pro Seite als Array der Form (N, 4, 2) gehalten
+- Umrechnung normalisiert <-> Seiteneinheiten, Polygon -> Rechteck, IoU und
+  Zusammenfassen überlappender Regionen ohne Python-Schleifen über Punkte
+- Laden/Schreiben des boundingRegions-Formats der Label-JSONs ({"x", "y"} Punkte)
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Nachkommastellen beim Schreiben normalisierter Koordinaten
+COORDINATE_DECIMALS = 4
+
+# Regionen einer Seite: Feldnamen, Feldwerte und Polygone (N, 4, 2) in gleicher Reihenfolge
+PageRegions = namedtuple('PageRegions', ['fields', 'values', 'polygons'])
+
+
+def empty_polygons():
+    return np.zeros((0, 4, 2), dtype=float)
+
+
+def polygons_from_flat(flat_polygons):
+    """Flache Polygone [x1, y1, x2, y2, ...] (Document Intelligence) -> (N, 4, 2); erste 4 Punkte"""
+    flat_polygons = [polygon[:8] for polygon in flat_polygons if len(polygon) >= 8]
+    if not flat_polygons:
+        return empty_polygons()
+    return np.asarray(flat_polygons, dtype=float).reshape(-1, 4, 2)
+
+
+def polygons_from_points(point_lists):
+    """Polygone im Label-Format [{"x", "y"}, ...] -> (N, 4, 2); erste 4 Punkte"""
+    coordinates = [[value for point in points[:4] for value in (point["x"], point["y"])]
+                   for points in point_lists if len(points) >= 4]
+    return polygons_from_flat(coordinates)
+
+
+def normalize(polygons, width, height):
+    """Seiteneinheiten -> 0..1"""
+    return polygons / np.array([width, height], dtype=float)
+
+
+def denormalize(polygons, width, height):
+    """0..1 -> Seiteneinheiten (z.B. PDF-Punkte für PyMuPDF)"""
+    return polygons * np.array([width, height], dtype=float)
+
+
+def to_rects(polygons):
+    """(N, 4, 2) -> achsenparallele Rechtecke (N, 4) als x0, y0, x1, y1"""
+    if len(polygons) == 0:
+        return np.zeros((0, 4), dtype=float)
+    return np.concatenate([polygons.min(axis=1), polygons.max(axis=1)], axis=1)
+
+
+def rects_to_polygons(rects):
+    """(N, 4) Rechtecke -> (N, 4, 2) Polygone im Uhrzeigersinn ab oben links"""
+    x0, y0, x1, y1 = rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]
+    return np.stack([np.stack([x0, y0], axis=1), np.stack([x1, y0], axis=1),
+                     np.stack([x1, y1], axis=1), np.stack([x0, y1], axis=1)], axis=1)
+
+
+def areas(rects):
+    return np.clip(rects[:, 2] - rects[:, 0], 0, None) * np.clip(rects[:, 3] - rects[:, 1], 0, None)
+
+
+def intersections(rects_a, rects_b):
+    """Schnittflächen aller Paare: (N, M)"""
+    top_left = np.maximum(rects_a[:, None, :2], rects_b[None, :, :2])
+    bottom_right = np.minimum(rects_a[:, None, 2:], rects_b[None, :, 2:])
+    size = np.clip(bottom_right - top_left, 0, None)
+    return size[..., 0] * size[..., 1]
+
+
+def iou(rects_a, rects_b):
+    """Intersection over Union aller Paare: (N, M)"""
+    intersection = intersections(rects_a, rects_b)
+    union = areas(rects_a)[:, None] + areas(rects_b)[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def union_rect(rects):
+    """Umschließendes Rechteck aller Rechtecke ((N, 4) oder Liste von (x0, y0, x1, y1))"""
+    rects = np.asarray(rects, dtype=float)
+    return np.concatenate([rects[:, :2].min(axis=0), rects[:, 2:].max(axis=0)])
+
+
+def merge_overlapping(rects, min_iou=0.0, gap=0.0):
+    """
+    Fasst überlappende Rechtecke zusammen (transitiv)
+
+    Args:
+        rects (ndarray): (N, 4) oder Liste von (x0, y0, x1, y1)
+        min_iou (float): Mindest-IoU; 0 = jede Berührung/Überlappung zählt
+        gap (float): Abstand, um den die Rechtecke vor dem Vergleich vergrößert werden
+
+    Returns:
+        tuple: (zusammengefasste Rechtecke (K, 4), Gruppen-Index je Eingabe-Rechteck (N,))
+    """
+    rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+    count = len(rects)
+    if count == 0:
+        return np.zeros((0, 4), dtype=float), np.zeros(0, dtype=int)
+
+    grown = rects + np.array([-gap, -gap, gap, gap])
+    if min_iou > 0:
+        adjacent = iou(grown, grown) >= min_iou
+    else:
+        top_left = np.maximum(grown[:, None, :2], grown[None, :, :2])
+        bottom_right = np.minimum(grown[:, None, 2:], grown[None, :, 2:])
+        adjacent = np.all(bottom_right >= top_left, axis=2)
+
+    # Zusammenhangskomponenten: kleinste erreichbare Nummer propagieren
+    labels = np.arange(count)
+    while True:
+        candidates = np.where(adjacent, labels[None, :], count).min(axis=1)
+        updated = np.minimum(labels, candidates)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    groups, group_index = np.unique(labels, return_inverse=True)
+    merged = np.empty((len(groups), 4), dtype=float)
+    merged[:, :2] = np.inf
+    merged[:, 2:] = -np.inf
+    np.minimum.at(merged[:, 0], group_index, rects[:, 0])
+    np.minimum.at(merged[:, 1], group_index, rects[:, 1])
+    np.maximum.at(merged[:, 2], group_index, rects[:, 2])
+    np.maximum.at(merged[:, 3], group_index, rects[:, 3])
+    return merged, group_index
+
+
+def label_fields(labels):
+    """Felder einer Label-Datei (*.labels.json: fields, *.document.json: document.fields)"""
+    return labels.get("document", labels).get("fields", {})
+
+
+def load_regions(labels):
+    """
+    Liest alle boundingRegions einer Label-Datei seitenweise in Arrays
+
+    Args:
+        labels (dict): Geladene Label-JSON
+
+    Returns:
+        dict: Seitennummer (1-basiert) -> PageRegions
+    """
+    collected = {}
+    for field_name, field_data in label_fields(labels).items():
+        if not isinstance(field_data, dict):
+            continue
+        for region in field_data.get("boundingRegions", []):
+            points = region.get("polygon", [])
+            if len(points) < 4:
+                continue
+            fields, values, coordinates = collected.setdefault(region["pageNumber"], ([], [], []))
+            fields.append(field_name)
+            values.append(field_data.get("value", ""))
+            coordinates.append(points)
+
+    return {page_number: PageRegions(fields, values, polygons_from_points(coordinates))
+            for page_number, (fields, values, coordinates) in collected.items()}
+
+
+def to_bounding_regions(page_number, polygons):
+    """(N, 4, 2) normalisierte Polygone -> Liste von boundingRegions im Label-Format"""
+    rounded = np.round(polygons, COORDINATE_DECIMALS).tolist()
+    return [{"pageNumber": page_number, "polygon": [{"x": x, "y": y} for x, y in polygon]}
+            for polygon in rounded]
+
+
+def rect_to_bounding_region(page_number, rect):
+    """Rechteck (x0, y0, x1, y1) -> eine boundingRegion"""
+    return to_bounding_regions(page_number, rects_to_polygons(np.asarray([rect], dtype=float)))[0]
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Zuordnung extrahierter Werte zu ihrer Position im Layout (Document Intelligence)
+- layout_pages: Layout-Response als einfache, JSON-fähige Struktur (Seiten, Zeilen, Wörter)
+- LayoutIndex: einmal pro Response aufgebaut (Wort-Index, Zeilen-Intervallbaum je Seite,
+  Offset <-> Zeile, Wortfolge -> Bounding Box); Suchen sind Dictionary-Zugriffe
+  bzw. Binärsuchen statt Durchläufe über alle Seiten
+"""
+
+import re
+import bisect
+from collections import namedtuple
+
+import geometry
+
+# Abstand (normalisiert, etwa eine Zeilenhöhe), bis zu dem benachbarte Fundstellen
+# in bounding_regions_for_values zu einer Region zusammengefasst werden
+REGION_MERGE_GAP = 0.015
+
+# Längste indizierte Wortfolge innerhalb einer Zeile (auch gesperrt gesetzte Wörter wie "N I E D E R ...")
+MAX_NGRAM_WORDS = 16
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_words(text):
+    """Wörter in Kleinschreibung, nur Buchstaben und Ziffern ("Tag:" == "tag", "(SPD)" == "spd")"""
+    words = (_NON_WORD.sub('', word) for word in (text or '').casefold().split())
+    return [word for word in words if word]
+
+
+def normalize_text(text):
+    """
+    Schlüssel für den Index: normalisierte Wörter ohne Trennzeichen, damit
+    Sperrschrift und Bindestrich-Varianten ("Watzenborn -Steinberg") gleich sind
+    """
+    return ''.join(normalize_words(text))
+
+
+def _span_range(spans):
+    spans = list(spans or [])
+    if not spans:
+        return None, None
+    start = min(span.offset for span in spans)
+    return start, max(span.offset + span.length for span in spans) - start
+
+
+def layout_pages(response):
+    """
+    Wandelt pages[].lines[]/words[] einer Layout-Response in Dictionaries um
+
+    Returns:
+        list: Seiten mit page_number, width, height, unit, lines (content, polygon,
+              confidence, offset, length) und words (content, polygon, offset)
+    """
+    pages = []
+    for page in response.pages:
+        lines = []
+        for line in page.lines or []:
+            offset, length = _span_range(getattr(line, 'spans', None))
+            lines.append({'content': line.content, 'polygon': list(line.polygon or []),
+                          'confidence': getattr(line, 'confidence', None), 'offset': offset, 'length': length})
+
+        words = []
+        for word in getattr(page, 'words', None) or []:
+            span = getattr(word, 'span', None)
+            words.append({'content': word.content, 'polygon': list(word.polygon or []),
+                          'offset': span.offset if span else None})
+
+        pages.append({'page_number': page.page_number, 'width': page.width, 'height': page.height,
+                      'unit': getattr(page, 'unit', None), 'lines': lines, 'words': words})
+    return pages
+
+
+def _bbox(polygon, width, height):
+    """Flaches Polygon [x1, y1, x2, y2, ...] -> normalisierte Box (x0, y0, x1, y1)"""
+    xs = polygon[0::2]
+    ys = polygon[1::2]
+    return min(xs) / width, min(ys) / height, max(xs) / width, max(ys) / height
+
+
+def _union(box1, box2):
+    return min(box1[0], box2[0]), min(box1[1], box2[1]), max(box1[2], box2[2]), max(box1[3], box2[3])
+
+
+def _line_words(page):
+    """
+    Wörter je Zeile über die Zeichen-Offsets
+
+    Returns:
+        list: Pro Zeile eine Liste (Wort-Text, Polygon); ohne Offsets leer
+    """
+    words = sorted((w for w in page.get('words', []) if w.get('offset') is not None and w.get('polygon')),
+                   key=lambda w: w['offset'])
+    offsets = [w['offset'] for w in words]
+    result = []
+    for line in page.get('lines', []):
+        if line.get('offset') is None or not words:
+            result.append([])
+            continue
+        first = bisect.bisect_left(offsets, line['offset'])
+        last = bisect.bisect_left(offsets, line['offset'] + line['length'])
+        result.append([(w['content'], w['polygon']) for w in words[first:last]])
+    return result
+
+
+class _IntervalTree:
+    """Statischer, zentrierter Intervallbaum über (start, end, item)"""
+
+    def __init__(self, intervals):
+        points = sorted(point for start, end, _ in intervals for point in (start, end))
+        self.center = points[len(points) // 2]
+        left = [i for i in intervals if i[1] < self.center]
+        right = [i for i in intervals if i[0] > self.center]
+        overlapping = [i for i in intervals if i[0] <= self.center <= i[1]]
+        self.by_start = sorted(overlapping, key=lambda i: i[0])
+        self.by_end = sorted(overlapping, key=lambda i: i[1], reverse=True)
+        self.left = _IntervalTree(left) if left else None
+        self.right = _IntervalTree(right) if right else None
+
+    def query(self, low, high, result):
+        """Alle Intervalle, die [low, high] überlappen, an result anhängen"""
+        if high < self.center:
+            for interval in self.by_start:
+                if interval[0] > high:
+                    break
+                result.append(interval[2])
+            if self.left:
+                self.left.query(low, high, result)
+        elif low > self.center:
+            for interval in self.by_end:
+                if interval[1] < low:
+                    break
+                result.append(interval[2])
+            if self.right:
+                self.right.query(low, high, result)
+        else:
+            result.extend(interval[2] for interval in self.by_start)
+            if self.left:
+                self.left.query(low, high, result)
+            if self.right:
+                self.right.query(low, high, result)
+        return result
+
+
+LayoutLine = namedtuple('LayoutLine', ['page_number', 'index', 'content', 'box', 'polygon',
+                                       'confidence', 'text_offset', 'span_offset'])
+WordHit = namedtuple('WordHit', ['page_number', 'line_index', 'box'])
+
+
+class LayoutIndex:
+    """
+    Einmal pro Layout-Response aufgebauter Index für "Wo steht dieser Text?"
+
+    - Wort-Index: normalisiertes Wort -> Fundstellen (Seite, Zeile, Box)
+    - Zeilen-Index je Seite: Intervallbaum über die vertikale Ausdehnung der Zeilen
+    - Offsets: Zeichen-Offset im Gesamttext (Zeilen mit '\n' verbunden, wie full_text)
+      bzw. in den Azure-Spans <-> Zeile
+    - Wortfolgen: alle zusammenhängenden Wortfolgen einer Zeile (bis MAX_NGRAM_WORDS)
+      als Schlüssel -> Box; wird erst bei der ersten Textsuche aufgebaut
+
+    Ohne Wort-Offsets wird für Wörter die Box der ganzen Zeile verwendet.
+    """
+
+    def __init__(self, pages):
+        self.lines = {}
+        self.words = {}
+        self._tokens = []
+        self._text_offsets = []
+        self._span_offsets = []
+        self._trees = {}
+        self._ngrams = None
+
+        text_offset = 0
+        for page in pages or []:
+            page_number = page['page_number']
+            width, height = page.get('width') or 1, page.get('height') or 1
+            page_lines = self.lines.setdefault(page_number, [])
+
+            for line, words in zip(page.get('lines', []), _line_words(page)):
+                line_box = _bbox(line['polygon'], width, height) if line.get('polygon') else None
+                entry = LayoutLine(page_number, len(page_lines), line['content'], line_box, line.get('polygon'),
+                                   line.get('confidence'), text_offset, line.get('offset'))
+                page_lines.append(entry)
+                self._text_offsets.append((text_offset, entry))
+                if entry.span_offset is not None:
+                    self._span_offsets.append((entry.span_offset, entry))
+                text_offset += len(line['content']) + 1
+
+                if not words:
+                    words = [(word, None) for word in line['content'].split()]
+                tokens = []
+                for content, polygon in words:
+                    box = _bbox(polygon, width, height) if polygon else line_box
+                    for word in normalize_words(content):
+                        tokens.append((word, box))
+                        self.words.setdefault(word, []).append(WordHit(page_number, entry.index, box))
+                self._tokens.append((entry, tokens))
+
+            intervals = [(line.box[1], line.box[3], line) for line in page_lines if line.box]
+            if intervals:
+                self._trees[page_number] = _IntervalTree(intervals)
+
+        self._span_offsets.sort(key=lambda item: item[0])
+        self._text_starts = [offset for offset, _ in self._text_offsets]
+        self._span_starts = [offset for offset, _ in self._span_offsets]
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(layout_pages(response))
+
+    @property
+    def text(self):
+        """Gesamttext: alle Zeilen mit '\n' abgeschlossen (entspricht full_text)"""
+        return ''.join(line.content + '\n' for _, line in self._text_offsets)
+
+    def _build_ngrams(self):
+        ngrams = {}
+        for entry, tokens in self._tokens:
+            if entry.box is None:
+                continue
+            for start in range(len(tokens)):
+                key, box = '', tokens[start][1]
+                for word, word_box in tokens[start:start + MAX_NGRAM_WORDS]:
+                    key += word
+                    box = _union(box, word_box)
+                    ngrams.setdefault(key, []).append((entry.page_number, box))
+        return ngrams
+
+    def find(self, value):
+        """Alle Vorkommen eines Werts (innerhalb einer Zeile) als Liste (Seite, Box) in Lesereihenfolge"""
+        if self._ngrams is None:
+            self._ngrams = self._build_ngrams()
+        return self._ngrams.get(normalize_text(value), [])
+
+    def find_word(self, word):
+        """Alle Vorkommen eines einzelnen Worts als WordHit"""
+        return self.words.get(normalize_text(word), [])
+
+    def lines_starting_with(self, word):
+        """Zeilen, deren erstes Wort (normalisiert) word ist, in Lesereihenfolge"""
+        key = normalize_text(word)
+        lines = []
+        for hit in self.words.get(key, []):
+            line = self.lines[hit.page_number][hit.line_index]
+            first = next(iter(normalize_words(line.content)), None)
+            if first == key and (not lines or lines[-1] is not line):
+                lines.append(line)
+        return lines
+
+    def line_at(self, offset):
+        """Zeile zu einem Zeichen-Offset im Gesamttext (self.text)"""
+        position = bisect.bisect_right(self._text_starts, offset) - 1
+        return self._text_offsets[position][1] if position >= 0 else None
+
+    def line_at_span_offset(self, offset):
+        """Zeile zu einem Offset in den Azure-Spans (content der Response)"""
+        position = bisect.bisect_right(self._span_starts, offset) - 1
+        if position < 0:
+            return None
+        line = self._span_offsets[position][1]
+        return line if offset < line.span_offset + len(line.content) else None
+
+    def lines_between(self, page_number, top, bottom):
+        """Zeilen einer Seite, die den vertikalen Bereich [top, bottom] (normalisiert) schneiden"""
+        tree = self._trees.get(page_number)
+        if tree is None:
+            return []
+        return sorted(tree.query(top, bottom, []), key=lambda line: line.index)
+
+    def lines_in_region(self, page_number, box):
+        """Zeilen einer Seite, die die Box (x0, y0, x1, y1) schneiden"""
+        return [line for line in self.lines_between(page_number, box[1], box[3])
+                if line.box[0] <= box[2] and line.box[2] >= box[0]]
+
+    def bounding_regions(self, value):
+        """boundingRegions für das erste Vorkommen eines Werts (leer, wenn nicht gefunden)"""
+        if not isinstance(value, str):
+            return []
+        occurrences = self.find(value)
+        return [geometry.rect_to_bounding_region(*occurrences[0])] if occurrences else []
+
+    def bounding_regions_for_values(self, values):
+        """
+        Regionen um die ersten Vorkommen aller Werte (z.B. die Zeilen einer
+        Anwesenheitsliste über mehrere Seiten): pro Seite eine Region je Block
+        benachbarter Fundstellen, damit getrennte Listen (z.B. zwei Spalten oder
+        Text zwischen zwei Listenteilen) nicht in einer großen Region landen
+        """
+        boxes = {}
+        for value in values:
+            occurrences = self.find(value) if isinstance(value, str) else []
+            if occurrences:
+                page_number, box = occurrences[0]
+                boxes.setdefault(page_number, []).append(box)
+        regions = []
+        for page_number in sorted(boxes):
+            merged, _ = geometry.merge_overlapping(boxes[page_number], gap=REGION_MERGE_GAP)
+            # Blöcke in Lesereihenfolge (oben nach unten, dann links nach rechts)
+            for rect in sorted(merged.tolist(), key=lambda rect: (rect[1], rect[0])):
+                regions.append(geometry.rect_to_bounding_region(page_number, rect))
+        return regions
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Überwachung laufender Modell-Builds (Operation-Location)
+Mehrere Builds werden auf einer asyncio-Schleife gleichzeitig verfolgt.
+Das Abfrageintervall richtet sich nach Retry-After und dem Fortschritt
+(percentCompleted); jeder Build liefert ein Future und optional einen Callback.
+"""
+
+import sys
+import time
+import asyncio
+import logging
+
+import requests
+
+# Endzustände einer Document Intelligence Operation
+TERMINAL_STATES = ('succeeded', 'failed', 'canceled')
+
+
+class OperationWatcher:
+    """
+    Verfolgt Operationen über die gepoolte Session eines DocumentModelTrainer
+
+    Args:
+        trainer (DocumentModelTrainer): Liefert Session, API Key, Timeout und Logger
+        min_interval (float): Kürzestes Abfrageintervall in Sekunden
+        max_interval (float): Längstes Abfrageintervall in Sekunden
+        timeout (float): Maximale Gesamtdauer pro Operation in Sekunden
+    """
+
+    def __init__(self, trainer, min_interval=2.0, max_interval=60.0, timeout=4 * 3600):
+        self.trainer = trainer
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self._tasks = []
+
+    def watch(self, operation_location, on_complete=None, label=None):
+        """
+        Startet die Überwachung einer Operation (muss in einer laufenden Schleife aufgerufen werden)
+
+        Args:
+            operation_location (str): URL aus dem Operation-Location Header
+            on_complete (callable): Wird mit dem finalen Operations-JSON aufgerufen
+            label (str): Anzeigename (Standard: Operation-ID aus der URL)
+
+        Returns:
+            asyncio.Task: Liefert das finale Operations-JSON
+        """
+        label = label or operation_location.split('?')[0].rstrip('/').split('/')[-1]
+        task = asyncio.ensure_future(self._poll(operation_location, label))
+        if on_complete:
+            task.add_done_callback(lambda t: on_complete(t.result()) if not t.cancelled() and not t.exception() else None)
+        self._tasks.append(task)
+        return task
+
+    async def wait_all(self):
+        """Wartet auf alle überwachten Operationen und liefert ihre Ergebnisse (Ausnahmen als Werte)"""
+        return await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _poll(self, operation_location, label):
+        headers = {"Ocp-Apim-Subscription-Key": self.trainer.api_key}
+        start_time = time.monotonic()
+        interval = self.min_interval
+        history = []
+        last_status = None
+
+        while True:
+            try:
+                response = await asyncio.to_thread(
+                    self.trainer.session.get, operation_location, headers=headers, timeout=self.trainer.timeout
+                )
+                reason = f"HTTP {response.status_code}"
+            except requests.exceptions.RequestException as e:
+                # Verbindungsfehler/Timeout wie ein 5xx behandeln: später erneut abfragen
+                response, reason = None, f"Abfrage fehlgeschlagen ({e})"
+            retry_after = self.trainer.retry_after_seconds(response)
+
+            if response is None or response.status_code in (429, 500, 502, 503, 504):
+                interval = max(retry_after or 0, min(interval * 2, self.max_interval))
+                self.trainer._log_debug(f"[{label}] {reason} - nächste Abfrage in {interval:.1f}s", logging.WARNING)
+            elif response.status_code != 200:
+                raise RuntimeError(f"[{label}] Statusabfrage fehlgeschlagen: HTTP {response.status_code} {response.text[:500]}")
+            else:
+                operation = response.json()
+                status = operation.get('status', '').lower()
+                percent = operation.get('percentCompleted')
+
+                if status != last_status:
+                    self.trainer._log_debug(f"[{label}] Status: {status} ({percent if percent is not None else '?'}%)",
+                                            logging.INFO)
+                    last_status = status
+
+                if status in TERMINAL_STATES:
+                    operation['elapsedSeconds'] = round(time.monotonic() - start_time, 1)
+                    return operation
+
+                interval = self._next_interval(interval, retry_after, percent, history)
+
+            if time.monotonic() - start_time + interval > self.timeout:
+                raise TimeoutError(f"[{label}] Keine Fertigstellung nach {self.timeout:.0f}s")
+            await asyncio.sleep(interval)
+
+    def _next_interval(self, interval, retry_after, percent, history):
+        """
+        Nächstes Abfrageintervall:
+        - aus dem Fortschritt geschätzte Restzeit halbieren (nicht zu spät abfragen)
+        - ohne Fortschritt das Intervall um 50 % verlängern
+        - nie kürzer als Retry-After bzw. min_interval, nie länger als max_interval
+        """
+        now = time.monotonic()
+        if percent is not None:
+            history.append((now, float(percent)))
+
+        if len(history) >= 2 and history[-1][1] > history[0][1]:
+            (t0, p0), (t1, p1) = history[0], history[-1]
+            rate = (p1 - p0) / max(t1 - t0, 1e-6)
+            remaining = (100.0 - p1) / rate
+            interval = remaining / 2
+        else:
+            interval = interval * 1.5
+
+        lower = max(self.min_interval, retry_after or 0)
+        return min(max(interval, lower), max(self.max_interval, lower))
+
+
+def watch_operations(trainer, operation_locations, on_complete=None, **watcher_options):
+    """
+    Synchroner Einstieg: verfolgt mehrere Operationen bis zum Ende
+
+    Returns:
+        list: Finale Operations-JSONs bzw. Ausnahmen, in Reihenfolge der Eingabe
+    """
+    async def run():
+        watcher = OperationWatcher(trainer, **watcher_options)
+        for location in operation_locations:
+            watcher.watch(location, on_complete=on_complete)
+        return await watcher.wait_all()
+
+    return asyncio.run(run())
+
+
+def main():
+    """Verfolgt die als Argumente übergebenen Operation-Location URLs"""
+    from train_model import DocumentModelTrainer
+
+    if len(sys.argv) < 2:
+        print("Verwendung: python operation_watcher.py <Operation-Location> [<Operation-Location> ...]")
+        sys.exit(1)
+
+    def report(operation):
+        status = operation.get('status')
+        model_id = (operation.get('result') or {}).get('modelId', '?')
+        icon = "✅" if status == 'succeeded' else "❌"
+        print(f"{icon} {model_id}: {status} nach {operation.get('elapsedSeconds')}s")
+        if operation.get('error'):
+            print(f"   Fehler: {operation['error'].get('message')}")
+
+    with DocumentModelTrainer() as trainer:
+        results = watch_operations(trainer, sys.argv[1:], on_complete=report)
+
+    for location, result in zip(sys.argv[1:], results):
+        if isinstance(result, Exception):
+            print(f"❌ {location}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,19 +14,54 @@ container/
 """
 
 import os
-import requests
-from urllib.parse import urlparse, parse_qs
+import re
+import time
+import uuid
+from urllib.parse import urlparse, parse_qs, quote, unquote
+from xml.etree import ElementTree
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import formatdate
 from dotenv import load_dotenv
 import json
 from datetime import datetime
 
+from blob_access import resolve_sas_url, parse_sas_url, get_http_session
+
 # Lade Umgebungsvariablen
 load_dotenv('../config.env')
 
+# REST-Version für Copy Blob From URL und Blob Batch
+STORAGE_API_VERSION = '2021-08-06'
+
+# Maximale Anzahl Teil-Requests pro Blob Batch
+BATCH_DELETE_SIZE = 256
+
+# Größte Quelle für Copy Blob From URL (x-ms-requires-sync); größere Blobs werden asynchron kopiert
+SYNC_COPY_MAX_BYTES = 256 * 1024 * 1024
+
+# Abfrageintervall für asynchrone Kopien (Sekunden)
+COPY_POLL_INTERVAL = 1.0
+
+# Kompakter Listeneintrag eines Blobs
+BlobRecord = namedtuple('BlobRecord', ['name', 'size', 'etag', 'last_modified'])
+
 class BlobOrganizer:
-    def __init__(self, training_documents_path=None, training_labels_path=None):
-        self.blob_sas_url = os.getenv('BLOBSASURL')
-        self.container_name = "containersessionnet"
+    def __init__(self, training_documents_path=None, training_labels_path=None, max_workers=16,
+                 copy_mode="sync", timeout=(10, 60)):
+        """
+        Args:
+            training_documents_path (str): Zielordner für PDF-Dokumente
+            training_labels_path (str): Zielordner für Labels
+            max_workers (int): Anzahl gleichzeitiger Kopier-/Lösch-Requests
+            copy_mode (str): "sync" = Copy Blob From URL (Blobs über 256 MB asynchron),
+                             "async" = Copy Blob mit Statusabfrage (beliebige Größe)
+            timeout (tuple): (Connect-, Read-Timeout) in Sekunden
+        """
+        self.blob_sas_url = resolve_sas_url()
+        self.max_workers = max_workers
+        self.copy_mode = copy_mode
+        self.timeout = timeout
         
         # Konfigurierbare Pfade für Document Intelligence
         # Standard: Root-Verzeichnis (keine Ordner im Container)
@@ -42,29 +77,41 @@ class BlobOrganizer:
         if not self.blob_sas_url:
             raise ValueError("BLOBSASURL muss in config.env gesetzt werden")
         
-        # Parse SAS URL
-        parsed_url = urlparse(self.blob_sas_url)
-        self.account_name = parsed_url.netloc.split('.')[0]
-        self.sas_token = parsed_url.query
+        # Parse SAS URL (Container aus dem Pfad, sonst containersessionnet)
+        location = parse_sas_url(self.blob_sas_url, fallback_container="containersessionnet")
+        self.container_name = location.container_name
+        self.account_name = urlparse(location.account_url).netloc.split('.')[0]
+        self.sas_token = location.sas_token
         
         # Base URL für Blob Service
-        self.base_url = f"https://{self.account_name}.blob.core.windows.net"
+        self.base_url = location.account_url
         
-    def list_blobs(self, prefix=""):
+        # Gemeinsame, gepoolte Session aller Blob-Zugriffe
+        self.session = get_http_session()
+    
+    def _blob_url(self, blob_name):
+        return f"{self.base_url}/{self.container_name}/{quote(blob_name, safe='/')}?{self.sas_token}"
+    
+    def iter_blobs(self, prefix="", page_size=5000):
         """
-        Listet alle Blobs im Container auf
+        Listet Blobs lazy Seite für Seite und folgt dabei NextMarker
+        
+        Jede Seite wird inkrementell geparst (iterparse), sodass auch Container
+        mit sehr vielen Blobs nicht vollständig im Speicher landen.
         
         Args:
             prefix (str): Ordner-Präfix für Filterung
+            page_size (int): Blobs pro Seite (maximal 5000)
             
-        Returns:
-            list: Liste der Blob-Namen
+        Yields:
+            BlobRecord: name, size, etag, last_modified
         """
         url = f"{self.base_url}/{self.container_name}"
         params = {
             'restype': 'container',
             'comp': 'list',
-            'prefix': prefix
+            'prefix': prefix,
+            'maxresults': page_size
         }
         
         # Füge SAS Token zu den Parametern hinzu
@@ -72,60 +119,136 @@ class BlobOrganizer:
         for key, value in sas_params.items():
             params[key] = value[0]
         
-        try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML Response (vereinfacht)
-            blobs = []
-            content = response.text
+        marker = None
+        while True:
+            if marker:
+                params['marker'] = marker
             
-            # Einfache XML-Parsing für Blob-Namen
-            import re
-            blob_pattern = r'<Name>(.*?)</Name>'
-            matches = re.findall(blob_pattern, content)
+            with self.session.get(url, params=params, headers={'x-ms-version': STORAGE_API_VERSION},
+                                  timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                
+                marker = None
+                for _, elem in ElementTree.iterparse(response.raw, events=('end',)):
+                    if elem.tag == 'Blob':
+                        name_elem = elem.find('Name')
+                        name = name_elem.text or ''
+                        if name_elem.get('Encoded') == 'true':
+                            name = unquote(name)
+                        yield BlobRecord(
+                            name=name,
+                            size=int(elem.findtext('Properties/Content-Length') or 0),
+                            etag=elem.findtext('Properties/Etag'),
+                            last_modified=elem.findtext('Properties/Last-Modified')
+                        )
+                        elem.clear()
+                    elif elem.tag == 'NextMarker':
+                        marker = elem.text
             
-            for match in matches:
-                if match and not match.endswith('/'):  # Ignoriere Ordner
-                    blobs.append(match)
+            if not marker:
+                break
+    
+    def list_blobs(self, prefix=""):
+        """
+        Listet alle Blobs im Container auf (alle Seiten)
+        
+        Args:
+            prefix (str): Ordner-Präfix für Filterung
             
-            return blobs
+        Returns:
+            list: Liste der Blob-Namen
+        """
+        return [record.name for record in self.list_blob_records(prefix)]
+    
+    def list_blob_records(self, prefix=""):
+        """
+        Listet alle Blobs im Container mit Größe, ETag und Änderungszeit auf (alle Seiten)
+        
+        Returns:
+            list: Liste von BlobRecord
+        """
+        try:
+            return [record for record in self.iter_blobs(prefix) if not record.name.endswith('/')]
             
         except Exception as e:
             print(f"❌ Fehler beim Auflisten der Blobs: {e}")
             return []
     
-    def copy_blob(self, source_blob, dest_blob):
+    def list_prefixes(self, prefixes):
+        """
+        Listet mehrere Präfixe parallel auf
+        
+        Args:
+            prefixes (list): Ordner-Präfixe (z.B. Dokumente- und Labels-Pfad)
+            
+        Returns:
+            dict: Präfix -> Liste von BlobRecord
+        """
+        def collect(prefix):
+            return [record for record in self.iter_blobs(prefix) if not record.name.endswith('/')]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(len(prefixes), 1))) as executor:
+            return dict(zip(prefixes, executor.map(collect, prefixes)))
+    
+    def copy_blob(self, source_blob, dest_blob, size=None):
         """
-        Kopiert einen Blob innerhalb des Containers
+        Kopiert einen Blob serverseitig innerhalb des Containers
         
         Args:
             source_blob (str): Quell-Blob-Name
             dest_blob (str): Ziel-Blob-Name
+            size (int): Größe der Quelle in Bytes (aus dem Listing); im Modus "sync" ohne Angabe per HEAD ermittelt
             
         Returns:
             bool: True wenn erfolgreich
         """
-        source_url = f"{self.base_url}/{self.container_name}/{source_blob}?{self.sas_token}"
-        dest_url = f"{self.base_url}/{self.container_name}/{dest_blob}"
-        
         headers = {
-            'x-ms-copy-source': source_url,
-            'x-ms-requires-sync': 'true'
+            'x-ms-copy-source': self._blob_url(source_blob),
+            'x-ms-version': STORAGE_API_VERSION
         }
         
-        # Füge SAS Token zu dest_url hinzu
-        dest_url_with_sas = f"{dest_url}?{self.sas_token}"
-        
         try:
-            response = requests.put(dest_url_with_sas, headers=headers, timeout=30)
+            if self.copy_mode == "sync":
+                if size is None:
+                    size = self._blob_size(source_blob)
+                if size <= SYNC_COPY_MAX_BYTES:
+                    # Copy Blob From URL: Server kopiert vor der Antwort, kein Polling nötig
+                    headers['x-ms-requires-sync'] = 'true'
+            
+            response = self.session.put(self._blob_url(dest_blob), headers=headers, timeout=self.timeout)
             response.raise_for_status()
+            
+            if response.headers.get('x-ms-copy-status', 'success') == 'pending':
+                return self._wait_for_copy(dest_blob)
             return True
             
         except Exception as e:
             print(f"❌ Fehler beim Kopieren von {source_blob} zu {dest_blob}: {e}")
             return False
     
+    def _blob_size(self, blob_name):
+        """Größe eines Blobs in Bytes (HEAD)"""
+        response = self.session.head(self._blob_url(blob_name), headers={'x-ms-version': STORAGE_API_VERSION},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+        return int(response.headers.get('Content-Length', 0))
+    
+    def _wait_for_copy(self, dest_blob, max_wait=3600):
+        """Fragt den Status einer asynchronen Kopie ab, bis sie abgeschlossen ist"""
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline:
+            time.sleep(COPY_POLL_INTERVAL)
+            response = self.session.head(self._blob_url(dest_blob), headers={'x-ms-version': STORAGE_API_VERSION},
+                                         timeout=self.timeout)
+            response.raise_for_status()
+            status = response.headers.get('x-ms-copy-status', 'success')
+            if status == 'success':
+                return True
+            if status in ('failed', 'aborted'):
+                raise RuntimeError(f"Kopie {status}: {response.headers.get('x-ms-copy-status-description', '')}")
+        raise TimeoutError(f"Kopie von {dest_blob} nach {max_wait}s nicht abgeschlossen")
+    
     def delete_blob(self, blob_name):
         """
         Löscht einen Blob
@@ -136,10 +259,8 @@ class BlobOrganizer:
         Returns:
             bool: True wenn erfolgreich
         """
-        url = f"{self.base_url}/{self.container_name}/{blob_name}?{self.sas_token}"
-        
         try:
-            response = requests.delete(url, timeout=30)
+            response = self.session.delete(self._blob_url(blob_name), timeout=self.timeout)
             response.raise_for_status()
             return True
             
@@ -147,143 +268,221 @@ class BlobOrganizer:
             print(f"❌ Fehler beim Löschen von {blob_name}: {e}")
             return False
     
-    def organize_for_document_intelligence(self, move_files=True, use_root=True):
+    def delete_blobs(self, blob_names):
+        """
+        Löscht mehrere Blobs über die Blob Batch API (bis zu 256 pro Request)
+        Falls Batch nicht erlaubt ist (z.B. SAS ohne Berechtigung), wird parallel einzeln gelöscht.
+        
+        Args:
+            blob_names (list): Namen der zu löschenden Blobs
+            
+        Returns:
+            dict: Blob-Name -> True wenn gelöscht (oder bereits nicht mehr vorhanden)
+        """
+        results = {}
+        for start in range(0, len(blob_names), BATCH_DELETE_SIZE):
+            chunk = blob_names[start:start + BATCH_DELETE_SIZE]
+            try:
+                results.update(self._delete_batch(chunk))
+            except Exception as e:
+                print(f"⚠️  Batch-Löschen nicht möglich ({e}), lösche einzeln...")
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    results.update(zip(chunk, executor.map(self.delete_blob, chunk)))
+        return results
+    
+    def _delete_batch(self, blob_names):
+        """Sendet einen Blob Batch Request mit DELETE-Teil-Requests und wertet die Multipart-Antwort aus"""
+        boundary = f"batch_{uuid.uuid4()}"
+        date = formatdate(usegmt=True)
+        parts = []
+        for content_id, blob_name in enumerate(blob_names):
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                "Content-Transfer-Encoding: binary\r\n"
+                f"Content-ID: {content_id}\r\n"
+                "\r\n"
+                f"DELETE /{self.container_name}/{quote(blob_name, safe='/')}?{self.sas_token} HTTP/1.1\r\n"
+                f"x-ms-date: {date}\r\n"
+                "Content-Length: 0\r\n"
+                "\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+        
+        url = f"{self.base_url}/{self.container_name}?restype=container&comp=batch&{self.sas_token}"
+        headers = {
+            'x-ms-version': STORAGE_API_VERSION,
+            'Content-Type': f"multipart/mixed; boundary={boundary}"
+        }
+        response = self.session.post(url, data=body.encode('utf-8'), headers=headers, timeout=self.timeout)
+        if response.status_code != 202:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        
+        # Antwort: ein Teil pro Content-ID mit eigener Statuszeile; 404 = bereits gelöscht
+        results = {blob_name: False for blob_name in blob_names}
+        for part in re.split(r'--batchresponse_[\w-]+', response.text):
+            content_id = re.search(r'Content-ID:\s*(\d+)', part)
+            status = re.search(r'HTTP/1\.1 (\d{3})', part)
+            if content_id and status and int(content_id.group(1)) < len(blob_names):
+                results[blob_names[int(content_id.group(1))]] = status.group(1) in ('202', '404')
+        return results
+    
+    def plan_reorganization(self, all_blobs, use_root=True, sizes=None):
+        """
+        Erstellt den Plan (Quelle → Ziel) für PDF- und JSON-Dateien, ohne etwas zu ändern
+        
+        Args:
+            all_blobs (list): Aktuelle Blob-Namen
+            use_root (bool): True = Dokumente im Root lassen, False = in Ordnerstruktur
+            sizes (dict): Blob-Name -> Größe in Bytes (aus dem Listing, für die Wahl der Kopierart)
+            
+        Returns:
+            list: Einträge mit source, dest, kind ("pdf"/"json") und size; source == dest bedeutet keine Aktion
+        """
+        sizes = sizes or {}
+        plan = []
+        for blob in all_blobs:
+            lower = blob.lower()
+            if lower.endswith('.pdf'):
+                kind, target_path = "pdf", self.training_documents_path
+            elif lower.endswith('.json'):
+                kind, target_path = "json", self.training_labels_path
+            else:
+                continue
+            
+            if use_root or not target_path:
+                dest = blob
+            else:
+                dest = f"{target_path}/{blob}"
+            plan.append({"source": blob, "dest": dest, "kind": kind, "size": sizes.get(blob)})
+        return plan
+    
+    def execute_plan(self, plan, move_files=True):
+        """
+        Führt einen Plan aus: Kopien parallel, danach gebündeltes Löschen der Quellen
+        
+        Returns:
+            dict: success_count, error_count, copied, deleted, failed
+        """
+        actions = [step for step in plan if step["source"] != step["dest"]]
+        success_count = len(plan) - len(actions)
+        copied, failed = [], []
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.copy_blob, step["source"], step["dest"], step.get("size")): step for step in actions}
+            for future in as_completed(futures):
+                step = futures[future]
+                if future.result():
+                    copied.append(step)
+                    success_count += 1
+                    icon = "📄" if step["kind"] == "pdf" else "📋"
+                    print(f"   {icon} {step['source']} → {step['dest']}")
+                else:
+                    failed.append(step)
+                    print(f"   ❌ Fehler: {step['source']}")
+        
+        deleted = []
+        if move_files and copied:
+            print(f"\n🗑️  Lösche {len(copied)} Originale (Batch)...")
+            results = self.delete_blobs([step["source"] for step in copied])
+            deleted = [name for name, ok in results.items() if ok]
+            for name, ok in results.items():
+                if not ok:
+                    print(f"   ⚠️  Kopiert (Original nicht gelöscht): {name}")
+        
+        return {
+            "success_count": success_count,
+            "error_count": len(failed),
+            "copied": copied,
+            "deleted": deleted,
+            "failed": failed
+        }
+    
+    def organize_for_document_intelligence(self, move_files=True, use_root=True, dry_run=False):
         """
         Organisiert Dokumente für Document Intelligence Training
         
         Args:
             move_files (bool): True = Dateien verschieben, False = nur kopieren
             use_root (bool): True = Dokumente im Root lassen, False = in Ordnerstruktur
+            dry_run (bool): True = nur den Plan anzeigen, nichts ändern
             
         Returns:
             dict: Ergebnis der Organisation
         """
         print("🔍 Analysiere Blob Container Struktur...")
+        start_time = time.perf_counter()
         
-        # Liste alle Blobs auf
-        all_blobs = self.list_blobs()
+        # Liste alle Blobs auf (Größen bestimmen die Kopierart)
+        records = self.list_blob_records()
+        all_blobs = [record.name for record in records]
         
         if not all_blobs:
             print("❌ Keine Blobs im Container gefunden!")
             return {"success": False, "error": "Keine Blobs gefunden"}
         
-        print(f"📋 {len(all_blobs)} Blobs gefunden:")
-        for blob in all_blobs:
-            print(f"   📄 {blob}")
+        print(f"📋 {len(all_blobs)} Blobs gefunden")
         
-        # Filtere PDF-Dokumente
-        pdf_blobs = [blob for blob in all_blobs if blob.lower().endswith('.pdf')]
-        json_blobs = [blob for blob in all_blobs if blob.lower().endswith('.json')]
+        plan = self.plan_reorganization(all_blobs, use_root=use_root,
+                                        sizes={record.name: record.size for record in records})
+        pdf_count = sum(1 for step in plan if step["kind"] == "pdf")
+        json_count = len(plan) - pdf_count
+        actions = [step for step in plan if step["source"] != step["dest"]]
         
         print(f"\n📊 Dokumente gefunden:")
-        print(f"   📄 PDF-Dateien: {len(pdf_blobs)}")
-        print(f"   📋 JSON-Dateien: {len(json_blobs)}")
+        print(f"   📄 PDF-Dateien: {pdf_count}")
+        print(f"   📋 JSON-Dateien: {json_count}")
         
-        if not pdf_blobs:
+        if not pdf_count:
             print("❌ Keine PDF-Dokumente für Training gefunden!")
             return {"success": False, "error": "Keine PDF-Dokumente gefunden"}
         
-        # Organisiere PDF-Dokumente
         if use_root:
-            print(f"\n🔄 Organisiere {len(pdf_blobs)} PDF-Dokumente im Root...")
             print("ℹ️  Dokumente bleiben im Root-Verzeichnis (keine Ordner im Container)")
-        else:
-            print(f"\n🔄 Organisiere {len(pdf_blobs)} PDF-Dokumente in Ordnerstruktur...")
+        print(f"\n📝 Plan: {len(actions)} {'Verschiebungen' if move_files else 'Kopien'}, "
+              f"{len(plan) - len(actions)} bereits am Ziel")
+        
+        if dry_run:
+            for step in actions:
+                print(f"   {'📄' if step['kind'] == 'pdf' else '📋'} {step['source']} → {step['dest']}")
+            return {
+                "success": True,
+                "dry_run": True,
+                "pdf_count": pdf_count,
+                "json_count": json_count,
+                "success_count": 0,
+                "error_count": 0,
+                "use_root": use_root,
+                "plan": plan
+            }
+        
+        print(f"\n🔄 Führe Plan aus ({self.max_workers} parallel)...")
+        result = self.execute_plan(plan, move_files=move_files)
+        
+        # Finale Struktur aus dem Plan ableiten statt den Container erneut aufzulisten
+        final_blobs = set(all_blobs)
+        final_blobs.update(step["dest"] for step in result["copied"])
+        final_blobs.difference_update(result["deleted"])
+        final_blobs = sorted(final_blobs)
         
-        success_count = 0
-        error_count = 0
-        
-        for pdf_blob in pdf_blobs:
-            if use_root:
-                # Dokumente im Root lassen (nur kopieren wenn nötig)
-                dest_blob = pdf_blob
-                if pdf_blob == dest_blob:
-                    print(f"   ✅ Bereits im Root: {pdf_blob}")
-                    success_count += 1
-                    continue
-            else:
-                # Ziel-Pfad: konfigurierbarer Pfad/original_name.pdf
-                if self.training_documents_path:
-                    dest_blob = f"{self.training_documents_path}/{pdf_blob}"
-                else:
-                    dest_blob = pdf_blob
-            
-            print(f"   📄 {pdf_blob} → {dest_blob}")
-            
-            if self.copy_blob(pdf_blob, dest_blob):
-                success_count += 1
-                
-                # Lösche Original wenn move_files=True und nicht im Root
-                if move_files and pdf_blob != dest_blob:
-                    if self.delete_blob(pdf_blob):
-                        print(f"   ✅ Verschoben: {pdf_blob}")
-                    else:
-                        print(f"   ⚠️  Kopiert (Original nicht gelöscht): {pdf_blob}")
-                else:
-                    print(f"   ✅ Kopiert: {pdf_blob}")
-            else:
-                error_count += 1
-                print(f"   ❌ Fehler: {pdf_blob}")
-        
-        # Organisiere JSON-Dateien (Labels)
-        if json_blobs:
-            if use_root:
-                print(f"\n🔄 Organisiere {len(json_blobs)} JSON-Dateien im Root...")
-            else:
-                print(f"\n🔄 Organisiere {len(json_blobs)} JSON-Dateien in Ordnerstruktur...")
-            
-            for json_blob in json_blobs:
-                if use_root:
-                    # Labels im Root lassen
-                    dest_blob = json_blob
-                    if json_blob == dest_blob:
-                        print(f"   ✅ Bereits im Root: {json_blob}")
-                        success_count += 1
-                        continue
-                else:
-                    # Ziel-Pfad: konfigurierbarer Pfad/original_name.json
-                    if self.training_labels_path:
-                        dest_blob = f"{self.training_labels_path}/{json_blob}"
-                    else:
-                        dest_blob = json_blob
-                
-                print(f"   📋 {json_blob} → {dest_blob}")
-                
-                if self.copy_blob(json_blob, dest_blob):
-                    success_count += 1
-                    
-                    if move_files and json_blob != dest_blob:
-                        if self.delete_blob(json_blob):
-                            print(f"   ✅ Verschoben: {json_blob}")
-                        else:
-                            print(f"   ⚠️  Kopiert (Original nicht gelöscht): {json_blob}")
-                    else:
-                        print(f"   ✅ Kopiert: {json_blob}")
-                else:
-                    error_count += 1
-                    print(f"   ❌ Fehler: {json_blob}")
-        
-        # Zeige finale Struktur
         print(f"\n📁 Finale Container-Struktur:")
-        final_blobs = self.list_blobs()
-        
         if use_root:
-            # Zeige nur Root-Dateien
-            root_files = [b for b in final_blobs if '/' not in b]
-            for blob in sorted(root_files):
-                print(f"   📄 {blob}")
+            shown = [b for b in final_blobs if '/' not in b]
         else:
-            # Zeige Ordnerstruktur
-            training_blobs = [b for b in final_blobs if b.startswith('training/')]
-            for blob in sorted(training_blobs):
-                print(f"   📄 {blob}")
+            prefixes = tuple(f"{p}/" for p in (self.training_documents_path, self.training_labels_path) if p)
+            shown = [b for b in final_blobs if b.startswith(prefixes)] if prefixes else final_blobs
+        for blob in shown:
+            print(f"   📄 {blob}")
+        
+        print(f"\n⏱️  {len(actions)} Aktionen in {time.perf_counter() - start_time:.1f}s")
         
         return {
-            "success": error_count == 0,
-            "pdf_count": len(pdf_blobs),
-            "json_count": len(json_blobs),
-            "success_count": success_count,
-            "error_count": error_count,
+            "success": result["error_count"] == 0,
+            "dry_run": False,
+            "pdf_count": pdf_count,
+            "json_count": json_count,
+            "success_count": result["success_count"],
+            "error_count": result["error_count"],
             "use_root": use_root,
             "final_structure": final_blobs
         }
@@ -339,10 +538,11 @@ def main():
         print("4. Dokumente in Ordnerstruktur organisieren (kopieren)")
         print("5. Dokumente in Ordnerstruktur organisieren (verschieben)")
         print("6. Pfade konfigurieren")
-        print("7. Beenden")
+        print("7. Plan anzeigen (Dry-Run, Ordnerstruktur)")
+        print("8. Beenden")
         
         while True:
-            choice = input("\n🎯 Wählen Sie eine Aktion (1-7): ").strip()
+            choice = input("\n🎯 Wählen Sie eine Aktion (1-8): ").strip()
             
             if choice == "1":
                 print("\n📁 Aktuelle Container-Struktur:")
@@ -430,11 +630,15 @@ def main():
                     print("ℹ️  Keine Änderungen vorgenommen")
             
             elif choice == "7":
+                print("\n📝 Plan für Ordnerstruktur (keine Änderungen)...")
+                organizer.organize_for_document_intelligence(move_files=True, use_root=False, dry_run=True)
+            
+            elif choice == "8":
                 print("\n👋 Auf Wiedersehen!")
                 break
             
             else:
-                print("❌ Ungültige Auswahl! Bitte wählen Sie 1-7.")
+                print("❌ Ungültige Auswahl! Bitte wählen Sie 1-8.")
     
     except ValueError as e:
         print(f"❌ Konfigurationsfehler: {e}")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Zentrale, vorkompilierte Regex-Muster für die Protokoll-Auswertung
+- Alle Skripte (Extraktion, Backend-Vergleich, Anwesenheit, TOPs) nutzen dieselben Muster
+- Muster werden einmal beim Import kompiliert statt bei jedem Aufruf
+- Abschnitte ("Anwesend: ... bis Tagesordnung") werden linear gesucht:
+  erst der Anfang, dann ab dort der erste Treffer des Endes. Das ersetzt
+  .*? mit DOTALL und Lookahead, das bei fehlendem Ende für jeden Anfang
+  bis zum Textende läuft (quadratische Laufzeit).
+Die Ergebnisse entsprechen den bisherigen Mustern; benchmark_patterns.py prüft das.
+"""
+
+import re
+
+# --- Kopfdaten des Protokolls ---
+
+NIEDERSCHRIFT = re.compile(r'NIEDERSCHRIFT', re.IGNORECASE)
+SITZUNG = re.compile(r'über die Sitzung der ([^\n]+) der Stadt Pohlheim', re.IGNORECASE)
+TAG = re.compile(r'Tag:\s*([^\n]+)', re.IGNORECASE)
+DAUER = re.compile(r'Dauer:\s*([^\n]+)', re.IGNORECASE)
+ORT_FIELD = re.compile(r'Ort:\s*([^\n]+)', re.IGNORECASE)
+
+DATE = re.compile(r'\d{1,2}\.\d{1,2}\.\d{4}')
+TIME = re.compile(r'\d{1,2}:\d{2}')
+ORT = re.compile(r'(Pohlheim|Sitzungssaal)', re.IGNORECASE)
+
+# --- Tagesordnung / TOPs ---
+
+AGENDA_HEADING = re.compile(r'TAGESORDNUNG\s*:?', re.IGNORECASE)
+TOP_NUMBER = re.compile(r'TOP\s+(\d+(?:\.\d+)?)', re.IGNORECASE)
+TOP_LINE_NUMBER = re.compile(r'^TOP\s+(\d+(?:\.\d+)?)', re.IGNORECASE | re.MULTILINE)
+TOP_MENTION = re.compile(r'TOP\s\d+[^\n]*', re.IGNORECASE)
+TOP_HEADING = re.compile(r'TOP\s\d+:')
+
+# --- Personen / Funktionen ---
+
+STV_PERSON = re.compile(r'STV\s+\w+')
+# Funktion + Rest der Zeile (findall liefert die Funktion)
+PERSON_LINE = re.compile(r'(STV|Stadtrat|Bürgermeister|Erster Stadtrat)\s+[^\n]+', re.IGNORECASE)
+
+# --- Anwesenheitsliste (attendance.py) ---
+
+# Eine Zeile der Anwesenheitsliste wird mit einem Muster klassifiziert (gesetzte Gruppe):
+# Funktionsüberschrift, "Zu TOP n:"-Abschnitt, Seitenartefakt, Fortsetzung einer
+# TOP-Angabe, Person mit Funktionspräfix oder sonstige Zeile
+ATTENDANCE_LINE = re.compile(r'''
+    ^(?:
+        (?P<heading>(?:Von\s+der\b|Vom\b|Schriftführer).*)
+      | (?P<scope>Zu\s+TOP\s*(?P<scope_from>\d+)(?:\s*[-–]\s*(?P<scope_to>\d+))?\s*:?)
+      | (?P<noise>Seite\s+\d+(?:\s+von(?:\s+\d+)?)?|[A-ZÄÖÜ]+/\d+/\d+-\d+|_+)
+      | (?P<continuation>(?:ab\s+)?TOP\s*\d*(?:\s*bis\s*(?:TOP\s*)?\d*)?|bis\s+(?:TOP\s*)?\d+|\d+)
+      | (?P<role>Erster\s+Stadtrat|Stadträtin|Stadtrat|Bürgermeister(?:in)?|STV-Vorsteher(?:in)?
+                |STV/(?:\d\.\s*stellv\.\s*)?Vorsitzender?|STV)\s+(?P<person>.+)
+      | (?P<other>.+)
+    )$''', re.VERBOSE | re.IGNORECASE)
+# Kürzel vor Namen ohne Funktionspräfix ("VBW Bianca Krieb")
+ROLE_ABBREVIATION = re.compile(r'^([A-ZÄÖÜ]{2,4})\s+(.+)$')
+# Teilnahme nur an einzelnen TOPs am Zeilenende: "ab TOP 5", "TOP 7 bis 10", "bis TOP 3"
+PRESENCE_MARKER = re.compile(r'\s+((?:ab\s+)?TOP\b.*|bis\s+(?:TOP\s*)?\d+.*)$', re.IGNORECASE)
+TOP_RANGE = re.compile(r'^(?:ab\s+)?(?:TOP\s*(?P<start>\d+)?)?\s*(?P<bis>bis\s*(?:TOP\s*)?(?P<end>\d+)?)?$',
+                       re.IGNORECASE)
+SUBSTITUTE = re.compile(r'\s+für\s+(.+)$', re.IGNORECASE)
+PERSON_NOTE = re.compile(r'\s*\(([^)]*)\)\s*$')
+ACADEMIC_TITLE = re.compile(r'^((?:(?:Prof|Dr)\.\s*)+)')
+
+# --- Bereinigung (Seitenwechsel, Kopf-/Fußzeilen) ---
+
+PAGE_MARKER = re.compile(r'\n--- SEITE \d+ ---\n')
+PAGE_FOOTER = re.compile(r'Seite \d+ von \d+')
+DOCUMENT_ID = re.compile(r'STV/\d+/\d+-\d+')
+# Drei oder mehr Zeilenumbrüche, dazwischen nur Leerraum (wie \n\s*\n\s*\n, ohne Backtracking)
+BLANK_LINES = re.compile(r'\n(?:[^\S\n]*\n){2,}')
+TRAILING_PAGE_NUMBER = re.compile(r'\s+\d+\s*$', re.MULTILINE)
+
+
+def clean_page_artifacts(text):
+    """Entfernt Seitenmarkierungen, mehrfache Leerzeilen, Fußzeilen und Dokument-Kennungen"""
+    text = PAGE_MARKER.sub('\n', text)
+    text = BLANK_LINES.sub('\n\n', text)
+    text = PAGE_FOOTER.sub('', text)
+    return DOCUMENT_ID.sub('', text)
+
+
+class SectionMatch:
+    """Treffer eines SectionPattern mit der Schnittstelle von re.Match (start, end, span, group)"""
+
+    __slots__ = ('string', '_start', '_end', '_content_start', '_content_end')
+
+    def __init__(self, string, start, end, content_start, content_end):
+        self.string = string
+        self._start = start
+        self._end = end
+        self._content_start = content_start
+        self._content_end = content_end
+
+    def start(self):
+        return self._start
+
+    def end(self):
+        return self._end
+
+    def span(self):
+        return self._start, self._end
+
+    def group(self, index=0):
+        if index == 0:
+            return self.string[self._start:self._end]
+        if index == 1:
+            return self.string[self._content_start:self._content_end]
+        raise IndexError('no such group')
+
+
+class SectionPattern:
+    """
+    Abschnitt von einem Anfangs- bis zu einem End-Muster
+
+    Entspricht re.compile(start + '(.*?)' + '(?=' + end + ')', DOTALL | flags),
+    mit include_end=True dem Muster ohne Lookahead (Ende wird mitgenommen)
+    und mit until_text_end=True der Alternative '|$' im Lookahead.
+    Voraussetzung: das End-Muster kann nicht innerhalb des Anfangs-Treffers beginnen.
+    """
+
+    def __init__(self, start, end=None, flags=re.IGNORECASE, include_end=False, until_text_end=False):
+        self.start = re.compile(start, flags)
+        self.end = re.compile(end, flags) if end else None
+        self.include_end = include_end
+        self.until_text_end = until_text_end
+
+    def search(self, text, pos=0):
+        start_match = self.start.search(text, pos)
+        if not start_match:
+            return None
+        content_start = start_match.end()
+
+        content_end = match_end = None
+        if self.end:
+            end_match = self.end.search(text, content_start)
+            if end_match:
+                content_end = end_match.start()
+                match_end = end_match.end() if self.include_end else content_end
+
+        if self.until_text_end:
+            # '$' ohne MULTILINE: vor einem abschließenden Zeilenumbruch oder am Textende
+            text_end = len(text) - 1 if text.endswith('\n') and len(text) - 1 >= content_start else len(text)
+            if content_end is None or text_end < content_end:
+                content_end = match_end = text_end
+
+        # Ohne Ende gibt es auch für spätere Anfänge kein Ende mehr
+        if content_end is None:
+            return None
+        return SectionMatch(text, start_match.start(), match_end, content_start, content_end)
+
+    def finditer(self, text):
+        pos = 0
+        while pos <= len(text):
+            match = self.search(text, pos)
+            if not match:
+                return
+            yield match
+            pos = match.end() if match.end() > match.start() else match.end() + 1
+
+    def findall(self, text):
+        return [match.group(1) for match in self.finditer(text)]
+
+    def sub(self, replacement, text):
+        parts = []
+        pos = 0
+        for match in self.finditer(text):
+            parts.append(text[pos:match.start()])
+            parts.append(replacement)
+            pos = match.end()
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+
+# --- Abschnitte ---
+
+# Backend-Vergleich (pdf_extraction_comparison.py, compare_methods.py)
+ANWESENHEIT_SECTION = SectionPattern(r'Anwesend[:\s]*', r'Abwesend|TOP|Tagesordnung')
+ABWESEND_SECTION = SectionPattern(r'Abwesend[:\s]*', r'TOP|Tagesordnung')
+TAGESORDNUNG_SECTION = SectionPattern(r'Tagesordnung[:\s]*', r'TOP\s+1|Beschluss')
+
+# Anwesenheitsliste der Extraktions-Skripte
+ATTENDANCE_TO_AGENDA = SectionPattern(r'Anwesend:', r'Tagesordnung:', include_end=True)
+
+# Anwesenheitsliste, mehrseitig (training/extract2.py) - in dieser Reihenfolge probieren
+ATTENDANCE_SECTIONS = [
+    SectionPattern(r'Anwesend:', r'TAGESORDNUNG:|Tagesordnung:'),  # Bis Tagesordnung (nur Hauptüberschrift)
+    SectionPattern(r'Anwesend:', r'\n\s*TOP\s+1\s'),  # Bis TOP 1 (erste Tagesordnung)
+    SectionPattern(r'Anwesend:', r'\n\s*[A-ZÄÖÜ][a-zäöüß]+\s*:', until_text_end=True),  # Bis nächster Hauptabschnitt oder Ende
+    SectionPattern(r'Anwesend:', r'\n\s*\d+\.\s*[A-Z]', until_text_end=True)  # Bis nummerierte Liste oder Ende
+]
+
+ENTSCHULDIGT_TO_END = SectionPattern(r'Entschuldigt:', until_text_end=True)
+ENTSCHULDIGT_SECTIONS = [
+    SectionPattern(r'Entschuldigt:', r'Tagesordnung:|TOP\s*\d+|Beschluss|Protokoll', until_text_end=True),
+    ENTSCHULDIGT_TO_END
+]
+
+# Beginn der Unterschriften (Ende der Beschlussphase)
+SIGNATURE_SECTIONS = [
+    SectionPattern(r'Die Vorsitzende', r'Schriftführer', include_end=True),
+    SectionPattern(r'Vorsitzende', r'Schriftführer', include_end=True),
+    re.compile(r'Unterschriften', re.IGNORECASE),
+    SectionPattern(r'gez\.', r'gez\.', include_end=True)
+]
+
+# Abstimmung innerhalb eines TOPs
+_VOTE_END = r'\n\n|\nTOP|\nDie Vorsitzende'
+VOTE_SECTIONS = [
+    SectionPattern(r'Abstimmungsergebnis:', _VOTE_END, until_text_end=True),
+    SectionPattern(r'Abstimmung:', _VOTE_END, until_text_end=True),
+    SectionPattern(r'Einstimmig beschlossen', _VOTE_END, until_text_end=True),
+    SectionPattern(r'Mit Stimmenmehrheit beschlossen', _VOTE_END, until_text_end=True)
+]
+
+
+def first_match(patterns, text):
+    """Erster Treffer der Musterliste (in Reihenfolge der Liste)"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return pattern, match
+    return None, None
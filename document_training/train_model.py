@@ -1,126 +1,313 @@
 import requests
 import json
 import os
-from datetime import datetime
+import time
+import random
+import logging
+import tracemalloc
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 from dotenv import load_dotenv
 
+from blob_uploader import ParallelBlobUploader
+from blob_access import get_container_client
+from debug_logging import setup_queue_logger, stop_listener, summarize_payload, truncate_text, redact_url
+
 # Lade Umgebungsvariablen
 load_dotenv('../config.env')
 
+# Statuscodes, bei denen ein Request mit Backoff wiederholt wird
+RETRY_STATUS_CODES = (429, 503)
+
+def parse_datetime(value):
+    """
+    Zeitpunkt aus datetime oder ISO-String ("2025-01-01", "2024-03-01T10:20:30.1234567Z")
+    
+    Returns:
+        datetime: Zeitzonenbehaftet (ohne Angabe UTC) oder None
+    """
+    if not value:
+        return None
+    if not isinstance(value, datetime):
+        # Azure liefert bis zu 7 Nachkommastellen, fromisoformat verarbeitet höchstens 6
+        value = re.sub(r'(\.\d{6})\d+', r'\1', value.strip())
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 class DocumentModelTrainer:
-    def __init__(self):
+    def __init__(self, timeout=(10, 120), max_retries=4, backoff_factor=1.0, pool_maxsize=16,
+                 log_level=None, console_log_level=None, max_body_chars=4000, log_max_bytes=10 * 1024 * 1024,
+                 debug_log=True):
+        """
+        Args:
+            timeout (tuple): (Connect-, Read-Timeout) in Sekunden für jeden Request
+            max_retries (int): Maximale Wiederholungen bei 429/503 und Verbindungsfehlern
+                               (POST nur bei Verbindungsaufbau-Fehlern und 429 mit Retry-After)
+            backoff_factor (float): Basis-Wartezeit für exponentiellen Backoff in Sekunden
+            pool_maxsize (int): Maximale Anzahl offener Keep-Alive-Verbindungen pro Host
+            log_level (str): Level für die Debug-Datei (Standard: DI_LOG_LEVEL oder DEBUG)
+            console_log_level (str): Level für die Konsole (Standard: DI_CONSOLE_LOG_LEVEL oder INFO)
+            max_body_chars (int): Maximale Länge protokollierter Request-/Response-Bodies
+            log_max_bytes (int): Größe, ab der die Debug-Datei rotiert wird
+            debug_log (bool): Debug-Datei schreiben (False z.B. für reine Modell-Listings)
+        """
+        self.timeout = timeout
+        self.last_upload_report = None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        
+        # Gemeinsame Session: Keep-Alive statt neuer TCP+TLS-Verbindung pro Request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         self.endpoint = os.getenv('DOCUMENTINTELLIGENCE_ENDPOINT')
         self.api_key = os.getenv('DOCUMENTINTELLIGENCE_API_KEY')
-        self.blob_sas_url = os.getenv('BLOBSASURL')
+        self._blob_sas_url = os.getenv('BLOBSASURL')
         
-        # Debug-Logging aktivieren
-        self.debug_log_file = f"document_intelligence_debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        self._log_debug("=== DOCUMENT INTELLIGENCE DEBUG SESSION STARTED ===")
-        self._log_debug(f"Endpoint: {self.endpoint}")
-        self._log_debug(f"API Key: {self.api_key[:10]}..." if self.api_key else "API Key: NOT SET")
-        self._log_debug(f"Blob SAS URL: {self.blob_sas_url[:50]}..." if self.blob_sas_url else "Blob SAS URL: NOT SET")
+        # Debug-Logging aktivieren (Queue + Hintergrund-Thread, rotierende Datei)
+        self.max_body_chars = max_body_chars
+        self.debug_log_file = (f"document_intelligence_debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+                               if debug_log else None)
+        self.logger, self._log_listener = setup_queue_logger(
+            self.debug_log_file,
+            level=(log_level or os.getenv('DI_LOG_LEVEL', 'DEBUG')).upper(),
+            console_level=(console_log_level or os.getenv('DI_CONSOLE_LOG_LEVEL', 'INFO')).upper(),
+            max_bytes=log_max_bytes
+        )
+        self._log_debug("=== DOCUMENT INTELLIGENCE DEBUG SESSION STARTED ===", logging.INFO)
+        self._log_debug(f"Endpoint: {self.endpoint}", logging.INFO)
+        self._log_debug(f"API Key: {self.api_key[:10]}..." if self.api_key else "API Key: NOT SET", logging.INFO)
+        self._log_debug(f"Blob SAS URL: {redact_url(self._blob_sas_url)[:50]}..." if self._blob_sas_url else "Blob SAS URL: NOT SET", logging.INFO)
         
         if not self.endpoint or not self.api_key:
             raise ValueError("Document Intelligence Endpoint und API Key müssen in config.env gesetzt werden")
         
-        if not self.blob_sas_url:
+        # Entferne trailing slash falls vorhanden
+        self.endpoint = self.endpoint.rstrip('/')
+    
+    @property
+    def blob_sas_url(self):
+        """SAS-URL des Trainings-Containers; erst beim ersten Blob-Zugriff geprüft (Modell-Listing braucht sie nicht)"""
+        if not self._blob_sas_url:
             # Fallback: Kombiniere Container URL und SAS Token
             blob_container_url = os.getenv('BLOBCONTAINERURL')
             blob_sas_token = os.getenv('BLOBSASTOKEN')
             
             if blob_container_url and blob_sas_token:
-                self.blob_sas_url = f"{blob_container_url}?{blob_sas_token}"
+                self._blob_sas_url = f"{blob_container_url}?{blob_sas_token}"
             else:
                 # Verwende feste Werte als Fallback
                 blob_container_url = "https://sessionnetblob.blob.core.windows.net/containersessionnet"
-                blob_sas_token = os.getenv('BLOBSASTOKEN')
                 
                 if blob_sas_token:
-                    self.blob_sas_url = f"{blob_container_url}?{blob_sas_token}"
+                    self._blob_sas_url = f"{blob_container_url}?{blob_sas_token}"
                 else:
                     raise ValueError("BLOBSASURL oder BLOBSASTOKEN muss in config.env gesetzt werden")
-        
-        # Entferne trailing slash falls vorhanden
-        self.endpoint = self.endpoint.rstrip('/')
-        self.blob_url = self.blob_sas_url
-        
-    def _log_debug(self, message):
-        """Schreibt Debug-Nachrichten in die Log-Datei"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        try:
-            with open(self.debug_log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"⚠️ Fehler beim Schreiben der Debug-Datei: {e}")
-        
-        # Auch in der Konsole ausgeben
-        print(f"🔍 DEBUG: {message}")
+        return self._blob_sas_url
+    
+    @property
+    def blob_url(self):
+        return self.blob_sas_url
+    
+    def _log_debug(self, message, level=logging.DEBUG):
+        """Übergibt eine Nachricht an die Log-Queue (Schreiben erfolgt im Hintergrund-Thread)"""
+        self.logger.log(level, message)
     
     def _log_request(self, method, url, headers=None, data=None, json_data=None):
-        """Protokolliert einen ausgehenden Request"""
-        self._log_debug(f"=== OUTGOING REQUEST ===")
-        self._log_debug(f"Method: {method}")
-        self._log_debug(f"URL: {url}")
+        """Protokolliert einen ausgehenden Request (gekürzt und geschwärzt)"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        lines = ["=== OUTGOING REQUEST ===", f"Method: {method}", f"URL: {redact_url(url)}"]
         
         if headers:
             # Verstecke API Key in Headers für Debugging
-            debug_headers = headers.copy()
-            if 'Ocp-Apim-Subscription-Key' in debug_headers:
-                debug_headers['Ocp-Apim-Subscription-Key'] = f"{debug_headers['Ocp-Apim-Subscription-Key'][:10]}..."
-            self._log_debug(f"Headers: {json.dumps(debug_headers, indent=2)}")
+            lines.append(f"Headers: {json.dumps(summarize_payload(headers))}")
         
         if data:
-            self._log_debug(f"Data: {data}")
+            if isinstance(data, str):
+                body = data
+            elif isinstance(data, (bytes, bytearray)):
+                body = repr(data[:self.max_body_chars + 1])
+            else:
+                body = f"<{type(data).__name__}>"
+            lines.append(f"Data: {truncate_text(body, self.max_body_chars)}")
         
         if json_data:
-            self._log_debug(f"JSON Data: {json.dumps(json_data, indent=2, ensure_ascii=False)}")
+            # Lange Werte (z.B. base64-PDFs in trainingData) werden vor dem Serialisieren gekürzt
+            summary = json.dumps(summarize_payload(json_data), ensure_ascii=False)
+            lines.append(f"JSON Data: {truncate_text(summary, self.max_body_chars)}")
+        
+        self._log_debug("\n".join(lines))
     
     def _log_response(self, response):
-        """Protokolliert eine eingehende Response"""
-        self._log_debug(f"=== INCOMING RESPONSE ===")
-        self._log_debug(f"Status Code: {response.status_code}")
-        self._log_debug(f"Headers: {dict(response.headers)}")
+        """Protokolliert eine eingehende Response (Body einmal, gekürzt)"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        lines = ["=== INCOMING RESPONSE ===", f"Status Code: {response.status_code}",
+                 f"Headers: {json.dumps(summarize_payload(dict(response.headers)))}"]
         
         try:
-            response_text = response.text
-            self._log_debug(f"Response Body: {response_text}")
-            
-            # Versuche JSON zu parsen für bessere Lesbarkeit
-            try:
-                response_json = response.json()
-                self._log_debug(f"Response JSON (formatted): {json.dumps(response_json, indent=2, ensure_ascii=False)}")
-            except:
-                pass
-                
+            content = response.content or b""
+            body = content[:self.max_body_chars].decode(response.encoding or 'utf-8', errors='replace')
+            if len(content) > self.max_body_chars:
+                body += f"... [{len(content) - self.max_body_chars} Bytes gekürzt]"
+            lines.append(f"Response Body: {redact_url(body)}")
         except Exception as e:
-            self._log_debug(f"Error reading response: {e}")
+            lines.append(f"Error reading response: {e}")
+        
+        self._log_debug("\n".join(lines))
     
     def _make_request(self, method, url, headers=None, data=None, json_data=None, params=None):
-        """Macht einen Request und protokolliert alles"""
+        """Macht einen Request über die gepoolte Session (mit Timeout und Retry) und protokolliert alles"""
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
         self._log_request(method, url, headers, data, json_data)
         if params:
-            self._log_debug(f"Query Parameters: {params}")
+            self._log_debug(f"Query Parameters: {summarize_payload(params)}")
         
-        try:
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method.upper() == 'POST':
-                response = requests.post(url, headers=headers, data=data, json=json_data)
-            elif method.upper() == 'PUT':
-                response = requests.put(url, headers=headers, data=data, json=json_data)
-            elif method.upper() == 'DELETE':
-                response = requests.delete(url, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+        # POST (Modell-Build) ist nicht idempotent: nur wiederholen, wenn er den Dienst sicher nicht erreicht hat
+        idempotent = method != 'POST'
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(
+                    method, url,
+                    headers=headers,
+                    params=params,
+                    data=data if method in ('POST', 'PUT') else None,
+                    json=json_data if method in ('POST', 'PUT') else None,
+                    timeout=self.timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries or not (idempotent or self._is_connect_error(e)):
+                    self._log_debug(f"Request failed with exception: {e}", logging.ERROR)
+                    raise
+                delay = self._retry_delay(None, attempt)
+                self._log_debug(f"Request failed ({e}) - retry {attempt + 1}/{self.max_retries} in {delay:.1f}s", logging.WARNING)
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                self._log_debug(f"Request failed with exception: {e}", logging.ERROR)
+                raise
+            
+            retry = idempotent or (response.status_code == 429 and 'Retry-After' in response.headers)
+            if response.status_code in RETRY_STATUS_CODES and retry and attempt < self.max_retries:
+                delay = self._retry_delay(response, attempt)
+                self._log_debug(f"HTTP {response.status_code} - retry {attempt + 1}/{self.max_retries} in {delay:.1f}s", logging.WARNING)
+                time.sleep(delay)
+                continue
             
             self._log_response(response)
             return response
-            
-        except Exception as e:
-            self._log_debug(f"Request failed with exception: {e}")
-            raise
+    
+    @staticmethod
+    def _is_connect_error(error):
+        """True, wenn keine Verbindung zustande kam (der Request also nicht gesendet wurde)"""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(error, requests.exceptions.ConnectionError) and isinstance(reason, NewConnectionError)
+    
+    def _start_build(self, api_url, headers, request_body, model_id):
+        """
+        Startet einen Modell-Build (POST documentModels:build), ohne ihn doppelt zu starten
+        
+        Ist unklar, ob der Dienst den Build angenommen hat (Read-Timeout, abgebrochene Verbindung, 5xx),
+        wird der Build über die Modell-ID in der Operationsliste gesucht statt den POST zu wiederholen.
+        
+        Returns:
+            requests.Response: Antwort des POST oder, falls der Build gefunden wurde,
+                               eine 202-Antwort mit dessen Operation-Location
+        """
+        error = None
+        try:
+            response = self._make_request('POST', api_url, headers=headers, json_data=request_body)
+            if response.status_code < 500:
+                return response
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if self._is_connect_error(e):
+                raise
+            error, response = e, None
+        
+        self._log_debug(f"Build start for {model_id} uncertain ({error or response.status_code}) - "
+                        f"checking operations", logging.WARNING)
+        try:
+            operation_location = self._find_build_operation(model_id)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self._log_debug(f"Operation lookup failed: {e}", logging.ERROR)
+            operation_location = None
+        
+        if operation_location:
+            print(f"ℹ️  Build für {model_id} wurde trotz Fehler angenommen - verwende laufende Operation")
+            recovered = requests.Response()
+            recovered.status_code = 202
+            recovered.headers['Operation-Location'] = operation_location
+            recovered._content = b''
+            recovered.url = api_url
+            return recovered
+        if error is not None:
+            raise error
+        return response
+    
+    def _find_build_operation(self, model_id):
+        """Operation-Location des Builds für model_id aus der Operationsliste oder None"""
+        base_url = f"{self.endpoint}/documentIntelligence"
+        headers = {"Ocp-Apim-Subscription-Key": self.api_key}
+        suffix = f"/documentModels/{model_id}"
+        url = f"{base_url}/operations?api-version=2024-02-29-preview"
+        while url:
+            response = self._make_request('GET', url, headers=headers)
+            if response.status_code != 200:
+                return None
+            data = response.json()
+            for operation in data.get('value', []):
+                if urlparse(operation.get('resourceLocation') or '').path.endswith(suffix):
+                    return f"{base_url}/operations/{operation['operationId']}?api-version=2024-02-29-preview"
+            url = data.get('nextLink')
+        return None
+    
+    def _retry_delay(self, response, attempt):
+        """Wartezeit vor dem nächsten Versuch: Retry-After falls vorhanden, sonst exponentiell mit Jitter"""
+        retry_after = self.retry_after_seconds(response)
+        if retry_after is not None:
+            return retry_after
+        return self.backoff_factor * (2 ** attempt) * (0.5 + random.random() / 2)
+    
+    @staticmethod
+    def retry_after_seconds(response):
+        """Retry-After einer Response in Sekunden (Sekundenangabe oder HTTP-Datum) oder None"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        return None
+    
+    def close(self):
+        """Schließt die Session und schreibt ausstehende Log-Einträge"""
+        self.session.close()
+        stop_listener(self._log_listener)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
         
     def _get_container_url_without_sas(self):
         """Erstellt Container-URL ohne SAS Token für Document Intelligence"""
@@ -162,43 +349,25 @@ class DocumentModelTrainer:
             print(f"⚠️  Unbekannter Container-Pfad: '{parsed_url.path}' - verwende direkt")
             return self.blob_sas_url
         
-    def upload_training_data_to_blob(self, local_folder_path, blob_folder_name="training_data"):
+    def upload_training_data_to_blob(self, local_folder_path, blob_folder_name="training_data", max_workers=8,
+                                     suffixes=('.pdf', '.labels.json'), names=()):
         """
-        Lädt Trainingsdaten in Azure Blob Storage hoch
+        Lädt Trainingsdaten parallel in Azure Blob Storage hoch
         
         Args:
             local_folder_path (str): Lokaler Pfad zu den Trainingsdaten
             blob_folder_name (str): Name des Ordners im Blob Storage
+            max_workers (int): Anzahl gleichzeitig hochgeladener Dateien
+            suffixes (tuple): Hochzuladende Dateiendungen
+            names (tuple): Zusätzlich hochzuladende Dateien mit genau diesem Namen
         
         Returns:
             bool: True wenn erfolgreich
         """
         try:
-            from azure.storage.blob import BlobServiceClient, BlobClient
-            import os
-            
-            # Parse SAS URL für BlobServiceClient
-            from urllib.parse import urlparse, parse_qs
-            parsed_url = urlparse(self.blob_sas_url)
-            
-            # Erstelle BlobServiceClient mit SAS URL
-            # Verwende die vollständige SAS URL als credential
-            from azure.core.credentials import AzureSasCredential
-            
-            # Extrahiere SAS Token aus URL
-            sas_token = parsed_url.query
-            
-            # Erstelle BlobServiceClient mit SAS Token
-            blob_service_client = BlobServiceClient(
-                account_url=f"https://{parsed_url.netloc}", 
-                credential=AzureSasCredential(sas_token)
-            )
-            
-            # Container-Name aus URL extrahieren
-            # Verwende container2 da SAS Token dafür generiert wurde
-            container_name = parsed_url.path.lstrip('/')
-            if not container_name or container_name == '':
-                container_name = 'container2'
+            # Gemeinsamer, gepoolter Container Client (Container aus der SAS URL, Fallback: container2)
+            container_client = get_container_client(sas_url=self.blob_sas_url)
+            container_name = container_client.container_name
             print(f"🔧 Verwende Container: {container_name}")
             
             print(f"📤 Lade Trainingsdaten hoch...")
@@ -206,47 +375,32 @@ class DocumentModelTrainer:
             print(f"   📦 Blob Container: {container_name}")
             print(f"   📂 Blob Ordner: {blob_folder_name}")
             
-            # Finde alle PDF und JSON Dateien
-            pdf_files = [f for f in os.listdir(local_folder_path) if f.lower().endswith('.pdf')]
-            json_files = [f for f in os.listdir(local_folder_path) if f.lower().endswith('.labels.json')]
+            # Paralleler Upload; unveränderte Dateien (gleicher MD5) werden übersprungen
+            uploader = ParallelBlobUploader(container_client, max_workers=max_workers)
+            report = uploader.sync_folder(local_folder_path, blob_folder_name, suffixes=suffixes, names=names)
+            self.last_upload_report = report
             
-            print(f"   📄 Gefunden: {len(pdf_files)} PDF-Dateien")
-            print(f"   📋 Gefunden: {len(json_files)} JSON-Dateien")
+            print(f"   📊 {report['uploaded']} hochgeladen, {report['skipped']} übersprungen, "
+                  f"{report['failed']} fehlgeschlagen")
+            print(f"   ⏱️  {report['seconds']:.2f}s, {report['bytes_uploaded'] / 1024 / 1024:.1f} MB "
+                  f"({report['throughput_mb_s']:.1f} MB/s)")
+            self._log_debug(f"Upload report: {json.dumps(report, ensure_ascii=False)}", logging.INFO)
             
-            # Lade PDF-Dateien hoch
-            for pdf_file in pdf_files:
-                local_path = os.path.join(local_folder_path, pdf_file)
-                blob_path = f"{blob_folder_name}/{pdf_file}" if blob_folder_name else pdf_file
-                
-                blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_path)
-                
-                with open(local_path, "rb") as data:
-                    blob_client.upload_blob(data, overwrite=True)
-                
-                print(f"   ✅ PDF hochgeladen: {pdf_file}")
-            
-            # Lade JSON-Dateien hoch
-            for json_file in json_files:
-                local_path = os.path.join(local_folder_path, json_file)
-                blob_path = f"{blob_folder_name}/{json_file}" if blob_folder_name else json_file
-                
-                blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_path)
-                
-                with open(local_path, "rb") as data:
-                    blob_client.upload_blob(data, overwrite=True)
-                
-                print(f"   ✅ JSON hochgeladen: {json_file}")
+            if report['failed']:
+                print(f"❌ {report['failed']} Dateien konnten nicht hochgeladen werden")
+                return False
             
             print(f"🎉 Alle Trainingsdaten erfolgreich hochgeladen!")
-            self._log_debug("Upload completed successfully")
+            self._log_debug("Upload completed successfully", logging.INFO)
             return True
             
         except Exception as e:
             print(f"❌ Fehler beim Hochladen: {e}")
-            self._log_debug(f"Upload failed with error: {e}")
+            self._log_debug(f"Upload failed with error: {e}", logging.ERROR)
             return False
 
-    def train_with_local_data(self, model_id, local_folder, description=None, build_mode="template"):
+    def train_with_local_data(self, model_id, local_folder, description=None, build_mode="template",
+                              staging="blob", blob_folder_name=None, measure_memory=None):
         """
         Trainiert ein Modell mit lokalen Trainingsdaten
         
@@ -255,10 +409,75 @@ class DocumentModelTrainer:
             local_folder (str): Lokaler Pfad zu den Trainingsdaten
             description (str): Beschreibung des Modells
             build_mode (str): "template" oder "neural"
+            staging (str): "blob" - Ordner inkrementell in den Container laden und von dort trainieren
+                           "inline" - alle PDFs base64-kodiert im Request mitschicken (speicherintensiv)
+            blob_folder_name (str): Präfix im Container für staging="blob" (Standard: Name des lokalen Ordners)
+            measure_memory (bool): Spitzen-Speicher mit tracemalloc messen (verlangsamt jede Allokation;
+                                   Standard: Umgebungsvariable DI_MEASURE_MEMORY, sonst aus)
         
         Returns:
-            dict: Antwort vom Azure Service
+            dict: Antwort vom Azure Service inkl. "staging_report" (Laufzeit, optional Spitzen-Speicher)
         """
+        if measure_memory is None:
+            measure_memory = os.getenv('DI_MEASURE_MEMORY', '').lower() in ('1', 'true', 'yes')
+        
+        if staging == "inline":
+            result, report = self._measure(measure_memory, self._train_with_inline_data, model_id, local_folder,
+                                           description, build_mode)
+        elif staging == "blob":
+            result, report = self._measure(measure_memory, self._train_with_staged_data, model_id, local_folder,
+                                           description, build_mode, blob_folder_name)
+        else:
+            raise ValueError(f"Unbekannter Staging-Modus: {staging}")
+        
+        report["staging"] = staging
+        memory = f", Spitzen-Speicher {report['peak_memory_mb']:.1f} MB" if report["peak_memory_mb"] is not None else ""
+        print(f"📊 Staging '{staging}': {report['seconds']:.2f}s{memory}")
+        result["staging_report"] = report
+        return result
+    
+    def _measure(self, measure_memory, func, *args):
+        """Führt func aus und misst die Laufzeit, mit measure_memory auch den Spitzen-Speicher (tracemalloc)"""
+        started_tracing = measure_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if measure_memory:
+            tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        try:
+            result = func(*args)
+        finally:
+            seconds = time.perf_counter() - start_time
+            peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+            if started_tracing:
+                tracemalloc.stop()
+        return result, {"seconds": round(seconds, 3),
+                        "peak_memory_mb": round(peak / 1024 / 1024, 2) if peak is not None else None}
+    
+    def _train_with_staged_data(self, model_id, local_folder, description, build_mode, blob_folder_name):
+        """Lädt geänderte Trainingsdaten in den Container und trainiert von dort (azureBlobSource + prefix)"""
+        if blob_folder_name is None:
+            blob_folder_name = os.path.basename(os.path.normpath(local_folder))
+        
+        # Für das Training aus dem Container werden auch OCR-Ergebnisse und fields.json benötigt
+        suffixes = ('.pdf', '.labels.json', '.ocr.json')
+        if not self.upload_training_data_to_blob(local_folder, blob_folder_name, suffixes=suffixes,
+                                                 names=('fields.json',)):
+            return {"success": False, "error": "Fehler beim Hochladen der Trainingsdaten"}
+        
+        result = self.train_custom_model(
+            model_id=model_id,
+            container_url=self._fix_container_url_for_sas_token(),
+            description=description,
+            build_mode=build_mode,
+            prefix=f"{blob_folder_name}/" if blob_folder_name else None
+        )
+        result.setdefault("model_id", model_id)
+        result["upload_report"] = self.last_upload_report
+        return result
+    
+    def _train_with_inline_data(self, model_id, local_folder, description, build_mode):
+        """Trainiert mit allen PDFs base64-kodiert im Request (gesamter Korpus im Speicher)"""
         try:
             import os
             import base64
@@ -329,11 +548,11 @@ class DocumentModelTrainer:
             print(f"📊 Trainingsdaten: {len(training_data)} Dokumente")
             
             # Sende Training-Request
-            response = self._make_request('POST', api_url, headers=headers, json_data=request_body)
+            response = self._start_build(api_url, headers, request_body, model_id)
             
             if response.status_code == 202:
                 # Training erfolgreich gestartet
-                result = response.json()
+                result = response.json() if response.content else {}
                 return {
                     "success": True,
                     "model_id": model_id,
@@ -354,7 +573,7 @@ class DocumentModelTrainer:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def train_custom_model(self, model_id, container_url=None, description=None, build_mode="template"):
+    def train_custom_model(self, model_id, container_url=None, description=None, build_mode="template", prefix=None):
         """
         Trainiert ein benutzerdefiniertes Document Intelligence Modell
         
@@ -363,6 +582,7 @@ class DocumentModelTrainer:
             container_url (str): Azure Blob Storage Container URL mit SAS Token (optional, verwendet config.env wenn nicht angegeben)
             description (str): Beschreibung des Modells
             build_mode (str): "template" oder "neural" (Standard: template)
+            prefix (str): Nur Blobs mit diesem Präfix verwenden (z.B. "Stavo/")
         
         Returns:
             dict: Antwort vom Azure Service
@@ -386,6 +606,9 @@ class DocumentModelTrainer:
             }
         }
         
+        if prefix:
+            request_body["azureBlobSource"]["prefix"] = prefix
+        
         # Füge Beschreibung hinzu falls vorhanden
         if description:
             request_body["description"] = description
@@ -463,7 +686,7 @@ class DocumentModelTrainer:
         
         try:
             # Sende POST Request
-            response = self._make_request('POST', api_url, headers=headers, json_data=request_body)
+            response = self._start_build(api_url, headers, request_body, model_id)
             
             print(f"\n📊 Response Status: {response.status_code}")
             
@@ -488,6 +711,7 @@ class DocumentModelTrainer:
                     "success": True,
                     "status_code": response.status_code,
                     "message": "Training erfolgreich gestartet",
+                    "operation_location": response.headers.get("Operation-Location"),
                     "response": response_data
                 }
                 
@@ -629,52 +853,115 @@ class DocumentModelTrainer:
                 "error": str(e)
             }
     
-    def list_models(self):
+    def wait_for_operations(self, operation_locations, on_complete=None, **watcher_options):
         """
-        Listet alle verfügbaren Modelle auf
+        Wartet ohne Busy-Polling auf mehrere Modell-Builds (z.B. template und neural parallel)
+        
+        Args:
+            operation_locations (list): URLs aus dem Operation-Location Header
+            on_complete (callable): Wird pro Build mit dem finalen Operations-JSON aufgerufen
         
         Returns:
-            dict: Liste aller Modelle
+            list: Finale Operations-JSONs bzw. Ausnahmen, in Reihenfolge der Eingabe
         """
+        from operation_watcher import watch_operations
+        return watch_operations(self, operation_locations, on_complete=on_complete, **watcher_options)
+    
+    def iter_models(self, prefix=None, created_after=None, use_cache=True):
+        """
+        Iteriert lazy über alle Modelle und folgt dabei nextLink (Seite für Seite)
         
-        api_url = f"{self.endpoint}/documentIntelligence/documentModels?api-version=2024-02-29-preview"
+        Die API bietet keinen serverseitigen Filter für die Modell-Liste; Präfix und
+        Erstellungsdatum werden daher beim Durchlaufen gefiltert, ohne die Liste
+        vollständig im Speicher zu halten. Vollständige Durchläufe werden für
+        MODEL_LIST_CACHE_TTL Sekunden (Standard: 60) lokal zwischengespeichert.
         
-        headers = {
-            "Ocp-Apim-Subscription-Key": self.api_key
-        }
+        Args:
+            prefix (str): Nur Modelle, deren modelId damit beginnt
+            created_after (datetime|str): Nur Modelle, die nach diesem Zeitpunkt erstellt wurden
+                                          (ISO-Datum/-Zeitpunkt, ohne Zeitzone UTC)
+            use_cache (bool): Lokalen Cache lesen und schreiben
+        
+        Yields:
+            dict: Modell-Zusammenfassung (modelId, createdDateTime, description, ...)
+        """
+        created_after = parse_datetime(created_after)
         
+        def matches(model):
+            if prefix and not model.get('modelId', '').startswith(prefix):
+                return False
+            if created_after:
+                created = parse_datetime(model.get('createdDateTime'))
+                if created is None or created <= created_after:
+                    return False
+            return True
+        
+        cached = self._read_model_cache() if use_cache else None
+        if cached is not None:
+            self._log_debug(f"Modell-Liste aus Cache ({len(cached)} Modelle)")
+            yield from (model for model in cached if matches(model))
+            return
+        
+        headers = {"Ocp-Apim-Subscription-Key": self.api_key}
+        url = f"{self.endpoint}/documentIntelligence/documentModels?api-version=2024-02-29-preview"
+        all_models = []
+        
+        while url:
+            response = self._make_request('GET', url, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+            page = response.json()
+            for model in page.get('value', []):
+                all_models.append(model)
+                if matches(model):
+                    yield model
+            url = page.get('nextLink')
+        
+        # Nur vollständige Durchläufe cachen
+        if use_cache:
+            self._write_model_cache(all_models)
+    
+    def _model_cache_path(self):
+        return os.getenv('MODEL_LIST_CACHE_FILE', '.model_list_cache.json')
+    
+    def _read_model_cache(self):
+        """Liefert die gecachte Modell-Liste oder None, wenn abgelaufen bzw. für einen anderen Endpoint"""
+        ttl = float(os.getenv('MODEL_LIST_CACHE_TTL', '60'))
         try:
-            response = self._make_request('GET', api_url, headers=headers)
-            
-            if response.status_code == 200:
-                if response.content:
-                    try:
-                        models = response.json()
-                    except json.JSONDecodeError:
-                        print(f"❌ Fehler: Response ist nicht im JSON-Format")
-                        return {
-                            "success": False,
-                            "error": "Response ist nicht im JSON-Format"
-                        }
-                else:
-                    print(f"❌ Fehler: Leere Response erhalten")
-                    return {
-                        "success": False,
-                        "error": "Leere Response erhalten"
-                    }
-                print(f"✅ {len(models.get('value', []))} Modelle gefunden")
-                return {
-                    "success": True,
-                    "models": models
-                }
-            else:
-                print(f"❌ Fehler beim Auflisten der Modelle: {response.status_code}")
-                return {
-                    "success": False,
-                    "status_code": response.status_code,
-                    "error": response.text
-                }
-                
+            with open(self._model_cache_path(), 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cache.get('endpoint') != self.endpoint or time.time() - cache.get('timestamp', 0) > ttl:
+            return None
+        return cache.get('models')
+    
+    def _write_model_cache(self, models):
+        try:
+            with open(self._model_cache_path(), 'w', encoding='utf-8') as f:
+                json.dump({"endpoint": self.endpoint, "timestamp": time.time(), "models": models}, f, ensure_ascii=False)
+        except OSError as e:
+            self._log_debug(f"Modell-Cache konnte nicht geschrieben werden: {e}", logging.WARNING)
+    
+    def list_models(self, prefix=None, created_after=None, use_cache=True):
+        """
+        Listet alle verfügbaren Modelle auf (alle Seiten)
+        
+        Args:
+            prefix (str): Nur Modelle, deren modelId damit beginnt
+            created_after (datetime|str): Nur Modelle, die nach diesem Zeitpunkt erstellt wurden
+            use_cache (bool): Lokalen Cache mit kurzer Lebensdauer verwenden
+        
+        Returns:
+            dict: Liste aller Modelle
+        """
+        try:
+            models = list(self.iter_models(prefix=prefix, created_after=created_after, use_cache=use_cache))
+            print(f"✅ {len(models)} Modelle gefunden")
+            return {
+                "success": True,
+                "models": {"value": models}
+            }
         except Exception as e:
             print(f"❌ Fehler beim Auflisten der Modelle: {e}")
             return {
@@ -749,7 +1036,7 @@ class DocumentModelTrainer:
                 params[key] = value[0]
             
             # Request an Blob Service
-            response = self._make_request('GET', list_url, headers=headers, params=params)
+            response = self._make_request('GET', list_url, params=params)
             
             if response.status_code == 200:
                 # Parse XML Response (vereinfacht)
@@ -924,6 +1211,7 @@ def main():
     finally:
         # Zeige Debug-Datei-Info am Ende
         if 'trainer' in locals():
+            trainer.close()
             print(f"\n🔍 DEBUG-INFORMATION:")
             print(f"   📄 Debug-Log gespeichert in: {trainer.debug_log_file}")
             print(f"   📊 Alle Requests/Responses wurden protokolliert")
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Validierung von Trainings- und Index-Daten vor dem Training
+- fields.json und Index-Schemas (azure_search_*.json, struktur.json) werden einmal
+  in Prüf-Funktionen übersetzt (Feldname -> erwarteter Typ/Wertprüfung)
+- *.labels.json (Document Intelligence) und Ausgabe-Dokumente (training/output/*.json)
+  werden parallel geprüft; mit installiertem ijson werden die Dateien gestreamt
+  (immer nur ein Top-Level-Wert im Speicher), sonst mit json.load gelesen
+- Ergebnis ist ein kompakter JSON-Bericht (Zusammenfassung + eine Zeile je Problem)
+
+Verwendung:
+    python validator.py --fields fields.json --labels ../pohlheim_protokolle/Stavo
+    python validator.py --index ../training/struktur.json --outputs ../training/output --report bericht.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Feldtypen in fields.json (Document Intelligence)
+FIELD_TYPES = ['string', 'number', 'date', 'array', 'object']
+
+# Gehören nicht in fields.json: ungelabelte Metadaten bzw. Einzelwerte aus attendance_summary
+METADATA_FIELDS = ['id', 'analysis_method', 'document_path', 'extraction_timestamp', 'full_text']
+NESTED_VALUE_FIELDS = ['total_present', 'total_excused', 'total_participants']
+
+# Index-Schema (Azure Cognitive Search)
+EDM_TYPES = ['Edm.String', 'Edm.Int32', 'Edm.Int64', 'Edm.Double', 'Edm.Single', 'Edm.Boolean',
+             'Edm.DateTimeOffset', 'Edm.GeographyPoint', 'Edm.ComplexType']
+COMPLEX_FORBIDDEN_PROPERTIES = ['searchable', 'filterable', 'sortable', 'facetable', 'retrievable']
+# Erlaubte Zeichen im Dokument-Schlüssel
+KEY_VALUE = re.compile(r'^[A-Za-z0-9_\-=]+$')
+
+_GERMAN_DATE = re.compile(r'\d{1,2}\.\s*\d{1,2}\.\s*\d{4}')
+_INT32_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+_PARSE_ERRORS = (ValueError, ijson.JSONError) if ijson else (ValueError,)
+
+
+def _issue(issues, severity, path, code, message):
+    issues.append({'severity': severity, 'path': path, 'code': code, 'message': message})
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_top_level(path):
+    """(Schlüssel, Wert) des Top-Level-Objekts; gestreamt, wenn ijson installiert ist"""
+    with open(path, 'rb') as f:
+        if ijson:
+            yield from ijson.kvitems(f, '', use_float=True)
+            return
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError('Top-Level ist kein JSON-Objekt')
+    yield from data.items()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_iso_datetime(value):
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    return True
+
+
+# --- fields.json ---
+
+# Wertprüfung je Feldtyp; leere Werte (None, "") sind erlaubt (Feld nicht gefunden)
+VALUE_CHECKS = {
+    'string': lambda value: isinstance(value, str),
+    'number': _is_number,
+    'date': lambda value: isinstance(value, str) and (_GERMAN_DATE.search(value) is not None
+                                                      or _is_iso_datetime(value)),
+    'array': lambda value: isinstance(value, list),
+    'object': lambda value: isinstance(value, dict)
+}
+
+
+def check_fields_schema(data):
+    """
+    Prüft fields.json selbst (Struktur, Typen, doppelte und unerwünschte Felder)
+
+    Returns:
+        list: Probleme als Dictionaries (severity, path, code, message)
+    """
+    issues = []
+    fields = data.get('fields') if isinstance(data, dict) else None
+    if not isinstance(fields, list) or not fields:
+        _issue(issues, 'error', 'fields', 'missing_fields', '"fields" fehlt, ist keine Liste oder leer')
+        return issues
+
+    seen = set()
+    for position, field in enumerate(fields):
+        path = f'fields[{position}]'
+        if not isinstance(field, dict):
+            _issue(issues, 'error', path, 'invalid_field', 'Feld ist kein Objekt')
+            continue
+        name = field.get('name')
+        if not isinstance(name, str) or not name.strip():
+            _issue(issues, 'error', path, 'missing_name', 'name fehlt oder ist leer')
+            continue
+        path = f'fields.{name}'
+        if field.get('type') not in FIELD_TYPES:
+            _issue(issues, 'error', path, 'invalid_type',
+                   f'type {field.get("type")!r} ungültig (erlaubt: {", ".join(FIELD_TYPES)})')
+        if name in seen:
+            _issue(issues, 'error', path, 'duplicate_field', 'Feld ist mehrfach definiert')
+        seen.add(name)
+        if name in METADATA_FIELDS:
+            _issue(issues, 'error', path, 'metadata_field', 'Ungelabeltes Metadaten-Feld')
+        if name in NESTED_VALUE_FIELDS:
+            _issue(issues, 'error', path, 'nested_value_field', 'Einzelwert aus verschachteltem Objekt')
+
+    date_field = next((f for f in fields if isinstance(f, dict) and f.get('name') == 'date'), None)
+    if date_field and date_field.get('type') != 'date':
+        _issue(issues, 'error', 'fields.date', 'date_type', f'date ist als {date_field.get("type")!r} typisiert')
+    return issues
+
+
+def _check_bounding_regions(regions, path, issues):
+    if not isinstance(regions, list):
+        _issue(issues, 'error', path, 'invalid_regions', 'boundingRegions ist keine Liste')
+        return
+    for position, region in enumerate(regions):
+        region_path = f'{path}[{position}]'
+        if not isinstance(region, dict):
+            _issue(issues, 'error', region_path, 'invalid_region', 'Region ist kein Objekt')
+            continue
+        page_number = region.get('pageNumber')
+        if not isinstance(page_number, int) or isinstance(page_number, bool) or page_number < 1:
+            _issue(issues, 'error', region_path, 'invalid_page', f'pageNumber {page_number!r} ungültig')
+        polygon = region.get('polygon')
+        if not isinstance(polygon, list) or len(polygon) < 4:
+            _issue(issues, 'error', region_path, 'invalid_polygon', 'polygon braucht mindestens 4 Punkte')
+            continue
+        for point in polygon:
+            if not (isinstance(point, dict) and _is_number(point.get('x')) and _is_number(point.get('y'))
+                    and 0 <= point['x'] <= 1 and 0 <= point['y'] <= 1):
+                _issue(issues, 'error', region_path, 'invalid_point',
+                       f'Punkt {point!r} ist nicht normalisiert (x, y zwischen 0 und 1)')
+                break
+
+
+class LabelValidator:
+    """Aus fields.json kompilierte Prüfung für *.labels.json / *.document.json"""
+
+    def __init__(self, fields_data):
+        self.schema_issues = check_fields_schema(fields_data)
+        self.field_types = {}
+        for field in (fields_data or {}).get('fields') or []:
+            if isinstance(field, dict) and field.get('type') in FIELD_TYPES and isinstance(field.get('name'), str):
+                self.field_types[field['name']] = field['type']
+
+    def validate(self, items):
+        """
+        Args:
+            items: (Schlüssel, Wert) des Top-Level-Objekts einer Label-Datei
+
+        Returns:
+            list: Probleme der Datei
+        """
+        issues = []
+        seen = set()
+        has_fields = False
+        for key, value in items:
+            if key == 'document' and isinstance(value, dict):
+                key, value = 'fields', value.get('fields')
+            if key != 'fields':
+                continue
+            has_fields = True
+            if not isinstance(value, dict):
+                _issue(issues, 'error', 'fields', 'invalid_fields', '"fields" ist kein Objekt')
+                continue
+            for name, field in value.items():
+                seen.add(name)
+                self._check_field(name, field, issues)
+
+        if not has_fields:
+            _issue(issues, 'error', 'fields', 'missing_fields', 'Keine "fields" in der Label-Datei')
+        for name in self.field_types:
+            if name not in seen:
+                _issue(issues, 'warning', f'fields.{name}', 'missing_field', 'Feld aus fields.json fehlt')
+        return issues
+
+    def _check_field(self, name, field, issues):
+        path = f'fields.{name}'
+        expected = self.field_types.get(name)
+        if expected is None:
+            _issue(issues, 'error', path, 'unknown_field', 'Feld ist nicht in fields.json definiert')
+        if not isinstance(field, dict):
+            _issue(issues, 'error', path, 'invalid_field', 'Feld ist kein Objekt')
+            return
+
+        field_type = field.get('type')
+        if expected and field_type != expected:
+            _issue(issues, 'error', path, 'type_mismatch', f'type {field_type!r}, erwartet {expected!r}')
+        value_type = expected or field_type
+        value = field.get('value')
+        if value not in (None, '') and value_type in VALUE_CHECKS and not VALUE_CHECKS[value_type](value):
+            _issue(issues, 'error', f'{path}.value', 'invalid_value',
+                   f'Wert passt nicht zu Typ {value_type!r}: {str(value)[:60]!r}')
+
+        if 'boundingRegions' in field:
+            _check_bounding_regions(field['boundingRegions'], f'{path}.boundingRegions', issues)
+        elif value not in (None, '', [], {}) and value_type != 'object':
+            _issue(issues, 'warning', path, 'unlabeled_value', 'Wert ohne boundingRegions')
+
+
+# --- Index-Schema ---
+
+def _collection_item_type(edm_type):
+    """'Collection(Edm.String)' -> 'Edm.String', sonst None"""
+    if edm_type.startswith('Collection(') and edm_type.endswith(')'):
+        return edm_type[len('Collection('):-1]
+    return None
+
+
+def check_index_schema(schema):
+    """
+    Prüft ein Index-Schema (Name, genau ein Key-Feld, Typen, komplexe Felder)
+
+    Returns:
+        list: Probleme als Dictionaries (severity, path, code, message)
+    """
+    issues = []
+    if not isinstance(schema, dict) or not schema.get('name'):
+        _issue(issues, 'error', 'name', 'missing_name', 'Index-Name fehlt')
+    fields = schema.get('fields') if isinstance(schema, dict) else None
+    if not isinstance(fields, list) or not fields:
+        _issue(issues, 'error', 'fields', 'missing_fields', '"fields" fehlt, ist keine Liste oder leer')
+        return issues
+
+    key_fields = [f.get('name') for f in fields if isinstance(f, dict) and f.get('key') is True]
+    if len(key_fields) != 1:
+        _issue(issues, 'error', 'fields', 'key_field',
+               f'Genau ein Key-Feld erwartet, gefunden: {key_fields}')
+    _check_index_fields(fields, 'fields', issues)
+
+    for section in ('suggesters', 'scoringProfiles', 'corsOptions'):
+        if section not in schema:
+            _issue(issues, 'warning', section, 'missing_section', f'{section} nicht definiert')
+    return issues
+
+
+def _check_index_fields(fields, path, issues):
+    seen = set()
+    for position, field in enumerate(fields):
+        if not isinstance(field, dict) or not field.get('name'):
+            _issue(issues, 'error', f'{path}[{position}]', 'missing_name', 'Feld ohne name')
+            continue
+        field_path = f'{path}.{field["name"]}'
+        if field['name'] in seen:
+            _issue(issues, 'error', field_path, 'duplicate_field', 'Feld ist mehrfach definiert')
+        seen.add(field['name'])
+
+        edm_type = field.get('type', '')
+        base_type = _collection_item_type(edm_type) or edm_type
+        if base_type not in EDM_TYPES:
+            _issue(issues, 'error', field_path, 'invalid_type', f'Unbekannter Typ {edm_type!r}')
+        if base_type != 'Edm.ComplexType':
+            continue
+
+        forbidden = [prop for prop in COMPLEX_FORBIDDEN_PROPERTIES if prop in field]
+        if forbidden:
+            _issue(issues, 'error', field_path, 'complex_property',
+                   f'Komplexes Feld mit nicht erlaubten Eigenschaften: {forbidden}')
+        if not field.get('fields'):
+            _issue(issues, 'error', field_path, 'missing_subfields', 'Komplexes Feld ohne Unterfelder')
+        else:
+            _check_index_fields(field['fields'], field_path, issues)
+
+
+def _compile_index_field(field):
+    """Feld-Definition -> Prüf-Funktion (value, path, issues); None ist immer erlaubt"""
+    edm_type = field.get('type', '')
+    item_type = _collection_item_type(edm_type)
+    if item_type:
+        check_item = _compile_index_field(dict(field, type=item_type))
+
+        def check_collection(value, path, issues):
+            if value is None:
+                return
+            if not isinstance(value, list):
+                _issue(issues, 'error', path, 'invalid_value', f'Liste erwartet ({edm_type})')
+                return
+            for position, item in enumerate(value):
+                check_item(item, f'{path}[{position}]', issues)
+        return check_collection
+
+    if edm_type == 'Edm.ComplexType':
+        subfields = {sub['name']: _compile_index_field(sub) for sub in field.get('fields') or [] if sub.get('name')}
+
+        def check_complex(value, path, issues):
+            if value is None:
+                return
+            if not isinstance(value, dict):
+                _issue(issues, 'error', path, 'invalid_value', 'Objekt erwartet (Edm.ComplexType)')
+                return
+            for name, item in value.items():
+                if name not in subfields:
+                    _issue(issues, 'error', f'{path}.{name}', 'unknown_field', 'Unterfeld nicht im Schema')
+                else:
+                    subfields[name](item, f'{path}.{name}', issues)
+        return check_complex
+
+    accepts = {
+        'Edm.String': lambda value: isinstance(value, str),
+        'Edm.Int32': lambda value: isinstance(value, int) and not isinstance(value, bool)
+                                   and _INT32_RANGE[0] <= value <= _INT32_RANGE[1],
+        'Edm.Int64': lambda value: isinstance(value, int) and not isinstance(value, bool),
+        'Edm.Double': _is_number,
+        'Edm.Single': _is_number,
+        'Edm.Boolean': lambda value: isinstance(value, bool),
+        'Edm.DateTimeOffset': _is_iso_datetime,
+        'Edm.GeographyPoint': lambda value: isinstance(value, dict)
+    }.get(edm_type, lambda value: True)
+
+    def check_value(value, path, issues):
+        if value is not None and not accepts(value):
+            _issue(issues, 'error', path, 'invalid_value', f'Wert passt nicht zu {edm_type}: {str(value)[:60]!r}')
+    return check_value
+
+
+class IndexValidator:
+    """Aus einem Index-Schema kompilierte Prüfung für Ausgabe-Dokumente (ein Dokument je Datei)"""
+
+    def __init__(self, schema):
+        self.schema_issues = check_index_schema(schema)
+        fields = [f for f in (schema or {}).get('fields') or [] if isinstance(f, dict) and f.get('name')]
+        self.key_field = next((f['name'] for f in fields if f.get('key') is True), None)
+        self._checks = {f['name']: _compile_index_field(f) for f in fields}
+
+    def validate(self, items):
+        issues = []
+        key_value = None
+        for name, value in items:
+            if name.startswith('@'):  # z.B. @search.action
+                continue
+            if name == self.key_field:
+                key_value = value
+            check = self._checks.get(name)
+            if check is None:
+                _issue(issues, 'error', name, 'unknown_field', 'Feld ist nicht im Index-Schema')
+            else:
+                check(value, name, issues)
+
+        if self.key_field:
+            if not key_value:
+                _issue(issues, 'error', self.key_field, 'missing_key', 'Dokument-Schlüssel fehlt')
+            elif not isinstance(key_value, str) or not KEY_VALUE.match(key_value):
+                _issue(issues, 'error', self.key_field, 'invalid_key',
+                       f'Schlüssel {key_value!r} enthält nicht erlaubte Zeichen (erlaubt: A-Z a-z 0-9 _ - =)')
+        return issues
+
+
+# --- Dateien prüfen (auch in Worker-Prozessen) ---
+
+_validators = {}
+
+
+def _init_validators(fields_data, index_schema):
+    """Kompiliert die Prüfungen einmal pro Prozess"""
+    _validators.clear()
+    if fields_data is not None:
+        _validators['labels'] = LabelValidator(fields_data)
+    if index_schema is not None:
+        _validators['outputs'] = IndexValidator(index_schema)
+
+
+def validate_file(task):
+    """
+    Args:
+        task (tuple): (Art 'labels' | 'outputs', Pfad)
+
+    Returns:
+        tuple: (Art, Pfad, Probleme)
+    """
+    kind, path = task
+    try:
+        issues = _validators[kind].validate(iter_top_level(path))
+    except _PARSE_ERRORS + (OSError,) as e:
+        issues = []
+        _issue(issues, 'error', '', 'parse_error', str(e)[:200])
+    return kind, path, issues
+
+
+def collect_files(paths, kind):
+    """Dateien aus Dateien/Ordnern (rekursiv): Labels = *.labels.json / *.document.json, Ausgaben = *.json"""
+    suffixes = ('.labels.json', '.document.json') if kind == 'labels' else ('.json',)
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, _, names in os.walk(path):
+            files.extend(os.path.join(root, name) for name in names if name.lower().endswith(suffixes))
+    return sorted(files)
+
+
+def validate(fields_path=None, index_path=None, label_paths=(), output_paths=(), workers=None):
+    """
+    Prüft Schemas und alle Dateien
+
+    Returns:
+        dict: Bericht (summary, schema_issues, issues)
+    """
+    start_time = time.perf_counter()
+    fields_data = load_json(fields_path) if fields_path else None
+    index_schema = load_json(index_path) if index_path else None
+    _init_validators(fields_data, index_schema)
+
+    schema_issues = []
+    for kind, schema_path in (('labels', fields_path), ('outputs', index_path)):
+        if kind in _validators:
+            schema_issues += [dict(issue, file=schema_path) for issue in _validators[kind].schema_issues]
+
+    tasks = []
+    if label_paths and 'labels' in _validators:
+        tasks += [('labels', path) for path in collect_files(label_paths, 'labels')]
+    if output_paths and 'outputs' in _validators:
+        tasks += [('outputs', path) for path in collect_files(output_paths, 'outputs')]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_validators,
+                                 initargs=(fields_data, index_schema)) as executor:
+            results = list(executor.map(validate_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [validate_file(task) for task in tasks]
+
+    issues = []
+    invalid_files = 0
+    for kind, path, file_issues in results:
+        if any(issue['severity'] == 'error' for issue in file_issues):
+            invalid_files += 1
+        issues += [dict(issue, file=path, kind=kind) for issue in file_issues]
+
+    all_issues = schema_issues + issues
+    return {
+        'summary': {
+            'files': len(results),
+            'valid_files': len(results) - invalid_files,
+            'invalid_files': invalid_files,
+            'errors': sum(issue['severity'] == 'error' for issue in all_issues),
+            'warnings': sum(issue['severity'] == 'warning' for issue in all_issues),
+            'seconds': round(time.perf_counter() - start_time, 3),
+            'streaming': ijson is not None
+        },
+        'schema_issues': schema_issues,
+        'issues': issues
+    }
+
+
+def print_report(report, max_issues=20):
+    """Kurze Ausgabe für die Konsole; der vollständige Bericht steht im JSON"""
+    summary = report['summary']
+    if summary['files']:
+        print(f"📊 {summary['files']} Dateien geprüft in {summary['seconds']}s: "
+              f"{summary['valid_files']} gültig, {summary['invalid_files']} fehlerhaft")
+    for issue in report['schema_issues']:
+        icon = '❌' if issue['severity'] == 'error' else '⚠️'
+        print(f"   {icon} Schema {issue['file']}: {issue['path']} - {issue['message']}")
+
+    errors = [issue for issue in report['issues'] if issue['severity'] == 'error']
+    for issue in errors[:max_issues]:
+        print(f"   ❌ {os.path.basename(issue['file'])}: {issue['path']} [{issue['code']}] {issue['message']}")
+    if len(errors) > max_issues:
+        print(f"   ... {len(errors) - max_issues} weitere Fehler im Bericht")
+
+    if summary['errors']:
+        print(f"❌ {summary['errors']} Fehler, {summary['warnings']} Warnungen")
+    else:
+        print(f"✅ Keine Fehler ({summary['warnings']} Warnungen)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prüft fields.json, Index-Schema, Label- und Ausgabe-Dateien')
+    parser.add_argument('--fields', help='fields.json (Feld-Schema für Label-Dateien)')
+    parser.add_argument('--index', help='Index-Schema (z.B. azure_search_ultimate.json)')
+    parser.add_argument('--labels', nargs='*', default=[], help='Label-Dateien oder Ordner (*.labels.json)')
+    parser.add_argument('--outputs', nargs='*', default=[], help='Ausgabe-Dokumente oder Ordner (*.json)')
+    parser.add_argument('--workers', type=int, default=None, help='Anzahl Prozesse (Standard: CPU-Kerne)')
+    parser.add_argument('--report', help='Bericht als JSON schreiben ("-" = stdout)')
+    args = parser.parse_args(argv)
+
+    if not args.fields and not args.index:
+        parser.error('--fields und/oder --index angeben')
+    if args.labels and not args.fields:
+        parser.error('--labels benötigt --fields')
+    if args.outputs and not args.index:
+        parser.error('--outputs benötigt --index')
+
+    report = validate(args.fields, args.index, args.labels, args.outputs, args.workers)
+
+    if args.report == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, separators=(',', ':'))
+        print()
+    else:
+        print_report(report)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, separators=(',', ':'))
+            print(f"💾 Bericht: {args.report}")
+
+    return 1 if report['summary']['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
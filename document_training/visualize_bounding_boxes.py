@@ -2,13 +2,46 @@
 """
 Script zur Visualisierung der Bounding Boxes auf PDF-Dokumenten
 Zeigt die extrahierten Felder mit ihren Positionen an
+
+Verwendung:
+    python visualize_bounding_boxes.py [datei.pdf]
+    python visualize_bounding_boxes.py <ordner> [--workers N] [--output-dir DIR] [--thumbnails DIR]
 """
 
 import fitz  # PyMuPDF
 import json
 import os
-import sys
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import geometry
+
+# Auflösung der PNG-Vorschauen
+THUMBNAIL_DPI = 72
+
+
+def find_labels_file(pdf_path):
+    """Sucht die Label-Datei zu einer PDF (neben der PDF, im aktuellen bzw. document_training Verzeichnis)"""
+    pdf_name = Path(pdf_path).stem
+    candidates = [
+        os.path.join(os.path.dirname(pdf_path), f"{pdf_name}.labels.json"),
+        os.path.join(os.path.dirname(pdf_path), f"{pdf_name}.document.json"),
+        f"{pdf_name}.document.json",
+        f"document_training/{pdf_name}.document.json"
+    ]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _annotate_task(colors, pdf_path, json_path, output_path, thumbnail_dir, dpi):
+    """Worker für visualize_folder"""
+    visualizer = BoundingBoxVisualizer()
+    visualizer.colors = colors
+    return visualizer.annotate_pdf(pdf_path, json_path, output_path, thumbnail_dir, dpi)
+
 
 class BoundingBoxVisualizer:
     def __init__(self):
@@ -22,7 +55,7 @@ class BoundingBoxVisualizer:
             'attendance_excused': (1, 0.5, 0) # Orange
         }
     
-    def visualize_pdf(self, pdf_path, json_path=None, output_path=None):
+    def visualize_pdf(self, pdf_path, json_path=None, output_path=None, thumbnail_dir=None, dpi=THUMBNAIL_DPI):
         """
         Visualisiert Bounding Boxes auf einem PDF
         
@@ -30,94 +63,169 @@ class BoundingBoxVisualizer:
             pdf_path (str): Pfad zur PDF-Datei
             json_path (str): Pfad zur JSON-Datei (optional, wird automatisch erkannt)
             output_path (str): Ausgabepfad für annotiertes PDF (optional)
+            thumbnail_dir (str): Ordner für PNG-Vorschauen der annotierten Seiten (optional)
+            dpi (int): Auflösung der PNG-Vorschauen
         """
         try:
-            # PDF laden
             print(f"📄 Lade PDF: {pdf_path}")
-            doc = fitz.open(pdf_path)
             
             # JSON-Pfad bestimmen
             if json_path is None:
-                pdf_name = Path(pdf_path).stem
-                # Suche JSON-Datei im aktuellen Verzeichnis
-                json_path = f"{pdf_name}.document.json"
-                if not os.path.exists(json_path):
-                    # Fallback: Suche im document_training Verzeichnis
-                    json_path = f"document_training/{pdf_name}.document.json"
+                json_path = find_labels_file(pdf_path)
             
-            if not os.path.exists(json_path):
-                print(f"❌ JSON-Datei nicht gefunden: {json_path}")
+            if json_path is None or not os.path.exists(json_path):
+                print(f"❌ JSON-Datei nicht gefunden: {json_path or Path(pdf_path).stem + '.document.json'}")
                 return False
             
-            # JSON laden
-            print(f"📋 Lade Labels: {json_path}")
-            with open(json_path, 'r', encoding='utf-8') as f:
-                labels = json.load(f)
-            
             # Ausgabepfad bestimmen
             if output_path is None:
                 pdf_name = Path(pdf_path).stem
                 output_path = f"{pdf_name}_annotated.pdf"
             
+            print(f"📋 Lade Labels: {json_path}")
             print(f"🎨 Zeichne Bounding Boxes...")
+            result = self.annotate_pdf(pdf_path, json_path, output_path, thumbnail_dir, dpi)
+            
+            for warning in result['warnings']:
+                print(f"⚠️  {warning}")
             
-            # Bounding Boxes zeichnen
-            fields_drawn = 0
-            for field_name, field_data in labels.get("document", {}).get("fields", {}).items():
-                if "boundingRegions" not in field_data:
+            print(f"✅ Erfolgreich! {result['fields_drawn']} Felder auf {len(result['pages'])} Seiten visualisiert")
+            print(f"📁 Ausgabedatei: {output_path}")
+            for thumbnail in result['thumbnails']:
+                print(f"🖼️  Vorschau: {thumbnail}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Fehler bei der Visualisierung: {e}")
+            return False
+    
+    def annotate_pdf(self, pdf_path, json_path, output_path=None, thumbnail_dir=None, dpi=THUMBNAIL_DPI,
+                     in_place=False):
+        """
+        Zeichnet die Bounding Boxes eines Label-JSON in ein PDF
+        
+        Nur Seiten mit Boxen werden geladen; pro Seite wird einmal gezeichnet.
+        Ohne output_path wird <name>_annotated.pdf neben dem Original geschrieben.
+        Das Original wird nur mit in_place=True verändert (inkrementell gespeichert).
+        
+        Returns:
+            dict: output_path, fields_drawn, pages (1-basiert), thumbnails, warnings
+        """
+        if in_place:
+            output_path = pdf_path
+        elif output_path is None:
+            output_path = os.path.join(os.path.dirname(pdf_path), f"{Path(pdf_path).stem}_annotated.pdf")
+        elif os.path.abspath(output_path) == os.path.abspath(pdf_path):
+            raise ValueError(f"output_path ist das Original {pdf_path} - in_place=True zum Überschreiben angeben")
+        
+        with open(json_path, 'r', encoding='utf-8') as f:
+            labels = json.load(f)
+        
+        # Polygone seitenweise als Arrays (N, 4, 2), normalisiert
+        regions = geometry.load_regions(labels)
+        
+        result = {'output_path': output_path, 'fields_drawn': 0, 'pages': [],
+                  'thumbnails': [], 'warnings': []}
+        
+        doc = fitz.open(pdf_path)
+        try:
+            for page_number in sorted(regions):
+                page_regions = regions[page_number]
+                if not 1 <= page_number <= len(doc):
+                    result['warnings'].extend(f"Seite {page_number} existiert nicht im PDF"
+                                              for _ in page_regions.fields)
                     continue
                 
-                # Farbe für dieses Feld bestimmen
-                color = self.colors.get(field_name, (0.5, 0.5, 0.5))  # Grau als Standard
+                page = doc[page_number - 1]
+                rects = geometry.to_rects(
+                    geometry.denormalize(page_regions.polygons, page.rect.width, page.rect.height)
+                ).tolist()
+                shape = page.new_shape()
                 
-                for region in field_data["boundingRegions"]:
-                    page_num = region["pageNumber"] - 1  # 0-basiert
-                    
-                    if page_num >= len(doc):
-                        print(f"⚠️  Seite {region['pageNumber']} existiert nicht im PDF")
-                        continue
+                for field_name, value, (x0, y0, x1, y1) in zip(page_regions.fields, page_regions.values, rects):
+                    # Farbe für dieses Feld bestimmen
+                    color = self.colors.get(field_name, (0.5, 0.5, 0.5))  # Grau als Standard
                     
-                    page = doc[page_num]
+                    shape.draw_rect(fitz.Rect(x0, y0, x1, y1))
+                    shape.finish(color=color, width=2)
                     
-                    # Polygon zu Rechteck konvertieren
-                    polygon_points = region["polygon"]
-                    if len(polygon_points) >= 4:
-                        # Erste 4 Punkte verwenden (normalerweise ein Rechteck)
-                        x_coords = [p["x"] * page.rect.width for p in polygon_points[:4]]
-                        y_coords = [p["y"] * page.rect.height for p in polygon_points[:4]]
-                        
-                        # Rechteck erstellen
-                        rect = fitz.Rect(
-                            min(x_coords), min(y_coords),
-                            max(x_coords), max(y_coords)
-                        )
-                        
-                        # Rechteck zeichnen
-                        page.draw_rect(rect, color=color, width=2)
-                        
-                        # Feldname als Text hinzufügen
-                        text_point = fitz.Point(rect.x0, rect.y0 - 5)
-                        page.insert_text(
-                            text_point, 
-                            f"{field_name}: {field_data.get('value', '')}", 
-                            fontsize=8, 
-                            color=color
-                        )
-                        
-                        fields_drawn += 1
+                    # Feldname als Text hinzufügen
+                    shape.insert_text(fitz.Point(x0, y0 - 5), f"{field_name}: {value}", fontsize=8, color=color)
+                    result['fields_drawn'] += 1
+                
+                shape.commit()
+                result['pages'].append(page_number)
+                
+                if thumbnail_dir:
+                    os.makedirs(thumbnail_dir, exist_ok=True)
+                    thumbnail_path = os.path.join(thumbnail_dir, f"{Path(pdf_path).stem}_seite{page_number}.png")
+                    page.get_pixmap(dpi=dpi).save(thumbnail_path)
+                    result['thumbnails'].append(thumbnail_path)
             
-            # PDF speichern
-            print(f"💾 Speichere annotiertes PDF: {output_path}")
-            doc.save(output_path)
+            if not in_place:
+                # Unbenutzte Objekte entfernen und Streams komprimieren
+                doc.save(output_path, garbage=3, deflate=True)
+            elif doc.can_save_incrementally():
+                # Nur die geänderten Objekte anhängen
+                doc.saveIncr()
+            else:
+                raise ValueError(f"{pdf_path} kann nicht inkrementell gespeichert werden - output_path angeben")
+        finally:
             doc.close()
+        
+        return result
+    
+    def visualize_folder(self, folder, output_dir=None, workers=None, thumbnail_dir=None, dpi=THUMBNAIL_DPI):
+        """
+        Annotiert alle gelabelten PDFs eines Ordners parallel (Prozess-Pool)
+        
+        Args:
+            folder (str): Ordner mit PDFs und *.labels.json bzw. *.document.json
+            output_dir (str): Zielordner für *_annotated.pdf (Standard: <folder>/annotated)
+            workers (int): Anzahl Prozesse (Standard: CPU-Kerne)
+            thumbnail_dir (str): Ordner für PNG-Vorschauen (optional)
             
-            print(f"✅ Erfolgreich! {fields_drawn} Felder visualisiert")
-            print(f"📁 Ausgabedatei: {output_path}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Fehler bei der Visualisierung: {e}")
-            return False
+        Returns:
+            dict: PDF-Name -> Ergebnis von annotate_pdf bzw. {'error': ...}
+        """
+        output_dir = output_dir or os.path.join(folder, "annotated")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        jobs = []
+        for pdf_path in sorted(Path(folder).glob("*.pdf")):
+            json_path = find_labels_file(str(pdf_path))
+            if json_path is None:
+                print(f"⚠️  Keine Labels für {pdf_path.name}")
+                continue
+            output_path = os.path.join(output_dir, f"{pdf_path.stem}_annotated.pdf")
+            jobs.append((str(pdf_path), json_path, output_path))
+        
+        if not jobs:
+            print(f"❌ Keine gelabelten PDFs in {folder} gefunden")
+            return {}
+        
+        print(f"🎨 Annotiere {len(jobs)} PDFs...")
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_annotate_task, self.colors, pdf_path, json_path, output_path, thumbnail_dir, dpi):
+                    os.path.basename(pdf_path)
+                for pdf_path, json_path, output_path in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                pdf_name = futures[future]
+                try:
+                    result = future.result()
+                    print(f"  ✅ [{done}/{len(jobs)}] {pdf_name}: {result['fields_drawn']} Felder, "
+                          f"Seiten {result['pages']}")
+                    for warning in result['warnings']:
+                        print(f"     ⚠️  {warning}")
+                except Exception as e:
+                    result = {'error': str(e)}
+                    print(f"  ❌ [{done}/{len(jobs)}] {pdf_name}: {e}")
+                results[pdf_name] = result
+        
+        return results
     
     def list_available_files(self, directory="."):
         """Listet verfügbare PDF und JSON Dateien auf"""
@@ -138,14 +246,29 @@ class BoundingBoxVisualizer:
 
 def main():
     """Hauptfunktion"""
+    parser = argparse.ArgumentParser(description='Bounding Boxes auf PDF-Dokumenten visualisieren')
+    parser.add_argument('path', nargs='?', help='PDF-Datei oder Ordner mit gelabelten PDFs (Batch)')
+    parser.add_argument('--output-dir', help='Batch: Zielordner für *_annotated.pdf (Standard: <ordner>/annotated)')
+    parser.add_argument('--workers', type=int, default=None, help='Batch: Anzahl Prozesse (Standard: CPU-Kerne)')
+    parser.add_argument('--thumbnails', metavar='DIR', help='Annotierte Seiten zusätzlich als PNG in DIR ablegen')
+    parser.add_argument('--dpi', type=int, default=THUMBNAIL_DPI, help='Auflösung der PNG-Vorschauen')
+    args = parser.parse_args()
+    
     print("🎨 Bounding Box Visualizer")
     print("=" * 50)
     
     visualizer = BoundingBoxVisualizer()
     
+    # Batch-Modus für ganze Ordner
+    if args.path and os.path.isdir(args.path):
+        results = visualizer.visualize_folder(args.path, args.output_dir, args.workers, args.thumbnails, args.dpi)
+        errors = sum(1 for result in results.values() if 'error' in result)
+        print(f"\n✅ {len(results) - errors} PDFs annotiert, {errors} Fehler")
+        return
+    
     # PDF-Datei auswählen
-    if len(sys.argv) > 1:
-        pdf_path = sys.argv[1]
+    if args.path:
+        pdf_path = args.path
         print(f"📄 Verwende PDF: {pdf_path}")
     else:
         # Verfügbare Dateien anzeigen
@@ -172,7 +295,7 @@ def main():
     
     # Visualisierung starten
     print(f"\n🚀 Starte Visualisierung für: {pdf_path}")
-    success = visualizer.visualize_pdf(pdf_path)
+    success = visualizer.visualize_pdf(pdf_path, thumbnail_dir=args.thumbnails, dpi=args.dpi)
     
     if success:
         print("\n✅ Visualisierung abgeschlossen!")
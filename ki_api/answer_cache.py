@@ -0,0 +1,232 @@
+"""
+Antwort-Cache für wiederkehrende Fragen an den Chat
+Zweistufige Suche: exakter Treffer über den normalisierten Fragetext,
+danach Ähnlichkeitssuche über Embeddings. Einträge laufen nach einer TTL ab
+und werden verworfen, sobald neue Protokolle indexiert wurden.
+"""
+
+import os
+import re
+import glob
+import time
+import hashlib
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+# Monatsnamen in Fragen, die wie Zahlen übereinstimmen müssen ("Sitzung im Juli")
+MONTH_NUMBERS = {
+    'januar': 1, 'jänner': 1, 'februar': 2, 'märz': 3, 'april': 4, 'mai': 5, 'juni': 6,
+    'juli': 7, 'august': 8, 'september': 9, 'oktober': 10, 'november': 11, 'dezember': 12
+}
+
+
+def normalize_question(text):
+    """Normalisiert eine Frage (Unicode, Groß-/Kleinschreibung, Satzzeichen, Leerzeichen)"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = re.sub(r'[^\w\s.:]', ' ', text)
+    # Satzendepunkte entfernen, Datumsangaben wie 20.07.2023 erhalten
+    text = re.sub(r'(?<!\d)[.:]|[.:](?!\d)', ' ', text)
+    return ' '.join(text.split())
+
+
+def literal_tokens(key):
+    """
+    Zahlen, Datumsangaben und Monatsnamen einer normalisierten Frage
+    (führende Nullen entfernt, Monatsnamen als Zahl, sortiert), z.B.
+    "sitzung am 03.07.2023" -> ('3.7.2023',)
+    """
+    tokens = []
+    for token in re.findall(r'\d+(?:[.:]\d+)*|[^\W\d_]+', key):
+        if token[0].isdigit():
+            tokens.append('.'.join(str(int(part)) for part in re.split(r'[.:]', token)))
+        elif token in MONTH_NUMBERS:
+            tokens.append(f'monat {MONTH_NUMBERS[token]}')
+    return tuple(sorted(tokens))
+
+
+def index_fingerprint(index_dir, pattern="*.json"):
+    """Fingerabdruck eines Protokoll-Verzeichnisses aus Dateinamen, Größe und Änderungszeit"""
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(index_dir, pattern))):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def make_embedder(client, deployment):
+    """Erstellt eine Embedding-Funktion auf Basis eines (Azure) OpenAI Clients"""
+    def embed(text):
+        response = client.embeddings.create(input=text, model=deployment)
+        return response.data[0].embedding
+    return embed
+
+
+class AnswerCache:
+    """
+    Cache für Antworten auf eigenständige Fragen
+
+    Args:
+        embed (callable): Text -> Vektor; ohne Angabe nur exakte Treffer
+        ttl (float): Lebensdauer eines Eintrags in Sekunden
+        similarity_threshold (float): Minimale Kosinus-Ähnlichkeit für einen semantischen Treffer;
+            zusätzlich müssen Zahlen, Daten und Monate beider Fragen übereinstimmen
+        max_entries (int): Maximale Anzahl Einträge (LRU)
+        index_dir (str): Protokoll-Verzeichnis; Änderungen darin leeren den Cache
+        index_check_interval (float): Mindestabstand zwischen zwei Prüfungen von index_dir in Sekunden
+    """
+
+    def __init__(self, embed=None, ttl=24 * 3600, similarity_threshold=0.95, max_entries=1000,
+                 index_dir=None, index_check_interval=30.0):
+        self.embed = embed
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.index_dir = index_dir
+        self.index_check_interval = index_check_interval
+
+        self._entries = OrderedDict()   # Schlüssel -> {"answer", "created", "vector"}
+        self._keys = []                 # Reihenfolge der Zeilen in _matrix
+        self._matrix = None             # L2-normalisierte Embeddings (float32)
+        self._matrix_dirty = False
+
+        self._index_version = index_fingerprint(index_dir) if index_dir else None
+        self._last_index_check = time.monotonic()
+
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "invalidations": 0,
+                      "embed_errors": 0}
+        self.last_embed_error = None
+
+    def get(self, question):
+        """
+        Sucht eine gecachte Antwort
+
+        Returns:
+            tuple: (Antwort, Trefferart "exact"/"semantic") oder (None, None)
+        """
+        self._check_index()
+        key = normalize_question(question)
+        if not key:
+            return None, None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._expired(entry):
+                self._remove(key)
+            else:
+                self._entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return entry["answer"], "exact"
+
+        if self.embed is not None and self._entries:
+            vector = self._embed(key)
+            if vector is None:
+                self.stats["misses"] += 1
+                return None, None
+            match_key = self._nearest(vector, literal_tokens(key))
+            if match_key is not None:
+                self._entries.move_to_end(match_key)
+                self.stats["semantic_hits"] += 1
+                # Vektor merken, damit dieselbe Formulierung künftig exakt trifft
+                self._store(key, self._entries[match_key]["answer"], vector,
+                            created=self._entries[match_key]["created"])
+                return self._entries[key]["answer"], "semantic"
+
+        self.stats["misses"] += 1
+        return None, None
+
+    def put(self, question, answer):
+        """Speichert eine Antwort zu einer Frage"""
+        key = normalize_question(question)
+        if not key:
+            return
+        vector = self._embed(key) if self.embed is not None else None
+        self._store(key, answer, vector)
+
+    def invalidate(self):
+        """Leert den Cache (z.B. nach dem Indexieren neuer Protokolle)"""
+        self._entries.clear()
+        self._keys = []
+        self._matrix = None
+        self._matrix_dirty = False
+        self.stats["invalidations"] += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, answer, vector, created=None):
+        self._entries[key] = {
+            "answer": answer,
+            "created": created if created is not None else time.time(),
+            "vector": vector
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._matrix_dirty = True
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        self._matrix_dirty = True
+
+    def _expired(self, entry):
+        return time.time() - entry["created"] > self.ttl
+
+    def _embed(self, key):
+        """Normalisiertes Embedding oder None, wenn der Embedding-Aufruf fehlschlägt"""
+        try:
+            return self._normalize_vector(self.embed(key))
+        except Exception as e:
+            self.stats["embed_errors"] += 1
+            self.last_embed_error = e
+            return None
+
+    @staticmethod
+    def _normalize_vector(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _nearest(self, vector, literals=()):
+        """
+        Liefert den Schlüssel des ähnlichsten gültigen Eintrags oder None
+
+        Einträge mit anderen Zahlen/Daten (literal_tokens) werden übersprungen:
+        "Sitzung vom 3. Juli" und "Sitzung vom 4. Juli" sind sich im Embedding
+        sehr ähnlich, brauchen aber verschiedene Antworten
+        """
+        if self._matrix_dirty or self._matrix is None:
+            self._keys = [k for k, e in self._entries.items() if e["vector"] is not None]
+            self._matrix = (np.vstack([self._entries[k]["vector"] for k in self._keys])
+                            if self._keys else None)
+            self._matrix_dirty = False
+        if self._matrix is None:
+            return None
+
+        similarities = self._matrix @ vector
+        for row in np.argsort(similarities)[::-1]:
+            if similarities[row] < self.similarity_threshold:
+                return None
+            key = self._keys[row]
+            entry = self._entries.get(key)
+            if entry is None or literal_tokens(key) != literals:
+                continue
+            if self._expired(entry):
+                self._remove(key)
+                continue
+            return key
+        return None
+
+    def _check_index(self):
+        """Leert den Cache, wenn sich das Protokoll-Verzeichnis geändert hat"""
+        if not self.index_dir:
+            return
+        now = time.monotonic()
+        if now - self._last_index_check < self.index_check_interval:
+            return
+        self._last_index_check = now
+        version = index_fingerprint(self.index_dir)
+        if version != self._index_version:
+            self._index_version = version
+            self.invalidate()
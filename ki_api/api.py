@@ -1,28 +1,77 @@
 import os
-from openai import AzureOpenAI
+import sys
+import time
+import argparse
+import threading
 from dotenv import load_dotenv
 
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
 
+# System-Nachricht für den Assistenten
+SYSTEM_MESSAGE = {
+    "role": "system", 
+    "content": "Du bist ein hilfreicher Assistent für die Stadt Pohlheim. Du hilfst bei Fragen zu kommunalen Angelegenheiten, Sitzungen und Terminen. Inhaltliche Informationen dürfen nur aus den bereitgestellten Daten kommen, wenn diese icht vorhanden sind, dann antworte, dass du es nicht weisst"
+}
+
+# Playground-Parameter für Chat-Anfragen
+CHAT_PARAMETERS = {
+    "temperature": 0.7,
+    "top_p": 0.95,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.0,
+    "max_tokens": 15000
+}
+
+# Befehle im Chat
+QUIT_COMMANDS = ['quit', 'exit', 'beenden', 'q']
+RESET_COMMANDS = ['clear', 'neu', 'reset']
+HISTORY_COMMANDS = ['history', 'verlauf', 'status']
+
+
+def summarize_conversation(messages):
+    """Gibt eine Zusammenfassung eines Chatverlaufs zurück"""
+    user_messages = [msg for msg in messages if msg["role"] == "user"]
+    assistant_messages = [msg for msg in messages if msg["role"] == "assistant"]
+    
+    return f"Gespräch: {len(user_messages)} Fragen, {len(assistant_messages)} Antworten"
+
+
 class AzureOpenAIChat:
-    def __init__(self):
-        """Initialisiere den Azure OpenAI Chat"""
-        # Erstelle Azure OpenAI Client
-        self.client = AzureOpenAI(
-            api_key=os.getenv('AZURE_API_KEY'),
-            api_version=os.getenv('AZURE_API_VERSION', '2023-07-01-preview'),
-            azure_endpoint=os.getenv('AZURE_ENDPOINT')
-        )
+    def __init__(self, stream=False, client=None, answer_cache=None):
+        """
+        Initialisiere den Azure OpenAI Chat
+        
+        Args:
+            stream (bool): Antworten tokenweise ausgeben, sobald sie eintreffen
+            client: Vorkonfigurierter Client (z.B. FakeAzureOpenAIClient für Offline-Betrieb)
+            answer_cache (AnswerCache): Optionaler Cache für wiederkehrende Fragen
+        """
+        # Erstelle Azure OpenAI Client (ohne Netzwerk-Roundtrip)
+        if client is None:
+            # Import erst hier, damit der Offline-Betrieb die Importkosten von openai spart
+            from openai import AzureOpenAI
+            client = AzureOpenAI(
+                api_key=os.getenv('AZURE_API_KEY'),
+                api_version=os.getenv('AZURE_API_VERSION', '2023-07-01-preview'),
+                azure_endpoint=os.getenv('AZURE_ENDPOINT')
+            )
+        self.client = client
         
         self.deployment = os.getenv('AZURE_DEPLOYMENT', 'gpt-35-turbo')
+        self.stream = stream
+        self.answer_cache = answer_cache
         self.messages = []
         
+        # Latenz-Messwerte der letzten Anfrage (time_to_first_token, total_latency in Sekunden)
+        self.last_metrics = None
+        
+        # Verbindungsstatus: None = noch nicht geprüft
+        self.connection_ok = None
+        self.connection_error = None
+        
         # System-Nachricht für den Assistenten
-        self.system_message = {
-            "role": "system", 
-            "content": "Du bist ein hilfreicher Assistent für die Stadt Pohlheim. Du hilfst bei Fragen zu kommunalen Angelegenheiten, Sitzungen und Terminen. Inhaltliche Informationen dürfen nur aus den bereitgestellten Daten kommen, wenn diese icht vorhanden sind, dann antworte, dass du es nicht weisst"
-        }
+        self.system_message = SYSTEM_MESSAGE
         
         # Initialisiere mit System-Nachricht
         self.messages.append(self.system_message)
@@ -33,41 +82,97 @@ class AzureOpenAIChat:
     
     def get_conversation_summary(self):
         """Gibt eine Zusammenfassung des aktuellen Gesprächs zurück"""
-        user_messages = [msg for msg in self.messages if msg["role"] == "user"]
-        assistant_messages = [msg for msg in self.messages if msg["role"] == "assistant"]
+        return summarize_conversation(self.messages)
+        
+    def initialize(self, connect="lazy"):
+        """
+        Initialisiere Azure OpenAI Verbindung
+        
+        Args:
+            connect (str): "lazy" - Verbindung wird mit der ersten Nachricht geprüft (kein Roundtrip beim Start)
+                           "background" - Verbindungstest läuft in einem Hintergrund-Thread
+                           "eager" - Verbindungstest blockiert bis zur Antwort
         
-        return f"Gespräch: {len(user_messages)} Fragen, {len(assistant_messages)} Antworten"
+        Returns:
+            bool: False nur wenn der blockierende Verbindungstest fehlschlägt
+        """
+        print(f"✅ Projekt-Instanz: {os.getenv('AZURE_ENDPOINT')}")
+        print(f"✅ Deployment: {self.deployment}")
+        print(f"✅ API-Version: {os.getenv('AZURE_API_VERSION')}")
         
-    def initialize(self):
-        """Initialisiere Azure OpenAI Verbindung"""
+        if connect == "eager":
+            if self.check_connection():
+                print(f"✅ Azure OpenAI Verbindung erfolgreich")
+                return True
+            print(f"❌ Fehler bei der Initialisierung: {self.connection_error}")
+            return False
+        
+        if connect == "background":
+            thread = threading.Thread(target=self._background_check, daemon=True)
+            thread.start()
+            return True
+        
+        print("ℹ️  Verbindung wird mit der ersten Nachricht geprüft")
+        return True
+    
+    def check_connection(self):
+        """Prüft die Verbindung mit einer minimalen Anfrage (1 Token)"""
         try:
-            # Teste die Verbindung mit einer einfachen Anfrage
-            test_response = self.client.chat.completions.create(
+            self.client.chat.completions.create(
                 model=self.deployment,
-                messages=[
-                    {"role": "system", "content": "Du bist ein Test-Assistent."},
-                    {"role": "user", "content": "Antworte nur mit 'Verbindung erfolgreich'"}
-                ],
-                temperature=0.7,
-                top_p=0.95,
-                frequency_penalty=0.0,
-                presence_penalty=0.0,
-                max_tokens=10000
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1
             )
-            
-            print(f"✅ Azure OpenAI Verbindung erfolgreich")
-            print(f"✅ Projekt-Instanz: {os.getenv('AZURE_ENDPOINT')}")
-            print(f"✅ Deployment: {self.deployment}")
-            print(f"✅ API-Version: {os.getenv('AZURE_API_VERSION')}")
-            return True
-            
+            self.connection_ok = True
+            self.connection_error = None
         except Exception as e:
-            print(f"❌ Fehler bei der Initialisierung: {e}")
-            return False
+            self.connection_ok = False
+            self.connection_error = e
+        return self.connection_ok
+    
+    def _background_check(self):
+        """Verbindungstest für den Hintergrund-Thread, meldet nur Fehler"""
+        if not self.check_connection():
+            print(f"\n❌ Azure OpenAI Verbindung fehlgeschlagen: {self.connection_error}")
     
-    def send_message(self, message):
-        """Sende eine Nachricht an Azure OpenAI"""
+    def send_message(self, message, stream=None, on_token=None):
+        """
+        Sende eine Nachricht an Azure OpenAI
+        
+        Args:
+            message (str): Benutzer-Nachricht
+            stream (bool): Streaming-Modus (Standard: Einstellung der Instanz)
+            on_token (callable): Wird im Streaming-Modus für jedes eintreffende Token aufgerufen
+        
+        Returns:
+            str: Vollständige Antwort des Assistenten
+        """
+        if stream is None:
+            stream = self.stream
+        self.last_metrics = None
+        
         try:
+            start_time = time.perf_counter()
+            
+            # Nur Fragen ohne vorherigen Gesprächskontext sind eigenständig und cachebar
+            standalone = not any(msg["role"] == "user" for msg in self.messages)
+            
+            if self.answer_cache is not None and standalone:
+                cached_answer, hit_type = self.answer_cache.get(message)
+                if cached_answer is not None:
+                    if stream and on_token:
+                        on_token(cached_answer)
+                    self.add_message_to_history("user", message)
+                    self.add_message_to_history("assistant", cached_answer)
+                    latency = time.perf_counter() - start_time
+                    self.last_metrics = {
+                        "stream": stream,
+                        "time_to_first_token": latency,
+                        "total_latency": latency,
+                        "cache": hit_type
+                    }
+                    return cached_answer
+            
             # Füge Benutzer-Nachricht zum Verlauf hinzu
             self.add_message_to_history("user", message)
             
@@ -75,24 +180,71 @@ class AzureOpenAIChat:
             response = self.client.chat.completions.create(
                 model=self.deployment,
                 messages=self.messages,
-                temperature=0.7,
-                top_p=0.95,
-                frequency_penalty=0.0,
-                presence_penalty=0.0,
-                max_tokens=15000
+                stream=stream,
+                **CHAT_PARAMETERS
             )
             
-            # Extrahiere die Antwort
-            assistant_message = response.choices[0].message.content
+            if stream:
+                assistant_message, first_token_time = self._collect_stream(response, on_token)
+            else:
+                # Extrahiere die Antwort
+                assistant_message = response.choices[0].message.content
+                first_token_time = None
+            
+            end_time = time.perf_counter()
+            self.last_metrics = {
+                "stream": stream,
+                "time_to_first_token": (first_token_time or end_time) - start_time,
+                "total_latency": end_time - start_time
+            }
+            
+            # Erste erfolgreiche Antwort bestätigt die Verbindung
+            if not self.connection_ok:
+                self.connection_ok = True
+                self.connection_error = None
             
             # Füge Assistant-Antwort zum Verlauf hinzu
             self.add_message_to_history("assistant", assistant_message)
             
+            if self.answer_cache is not None and standalone and assistant_message:
+                self.answer_cache.put(message, assistant_message)
+            
             return assistant_message
                 
         except Exception as e:
+            if self.connection_ok is None:
+                self.connection_ok = False
+                self.connection_error = e
             return f"❌ Fehler beim Senden der Nachricht: {e}"
     
+    def _collect_stream(self, response, on_token=None):
+        """Setzt die Antwort aus den Stream-Chunks zusammen und misst das erste Token"""
+        parts = []
+        first_token_time = None
+        
+        for chunk in response:
+            # Azure liefert Chunks ohne choices (z.B. prompt_filter_results)
+            if not chunk.choices:
+                continue
+            
+            token = chunk.choices[0].delta.content
+            if not token:
+                continue
+            
+            if first_token_time is None:
+                first_token_time = time.perf_counter()
+            
+            parts.append(token)
+            if on_token:
+                on_token(token)
+        
+        return "".join(parts), first_token_time
+    
+    def _print_token(self, token):
+        """Gibt ein Token ohne Zeilenumbruch sofort aus"""
+        sys.stdout.write(token)
+        sys.stdout.flush()
+    
     def chat_loop(self):
         """Hauptschleife für den Chat"""
         print("\n" + "="*60)
@@ -110,18 +262,18 @@ class AzureOpenAIChat:
                 user_input = input("\n👤 Sie: ").strip()
                 
                 # Beenden-Befehle
-                if user_input.lower() in ['quit', 'exit', 'beenden', 'q']:
+                if user_input.lower() in QUIT_COMMANDS:
                     print("👋 Auf Wiedersehen!")
                     break
                 
                 # Chat-Verlauf löschen
-                if user_input.lower() in ['clear', 'neu', 'reset']:
+                if user_input.lower() in RESET_COMMANDS:
                     self.messages = [self.system_message]  # Nur System-Nachricht behalten
                     print("✅ Chat-Verlauf gelöscht!")
                     continue
                 
                 # Chat-Verlauf anzeigen
-                if user_input.lower() in ['history', 'verlauf', 'status']:
+                if user_input.lower() in HISTORY_COMMANDS:
                     print(f"📊 {self.get_conversation_summary()}")
                     continue
                 
@@ -129,11 +281,22 @@ class AzureOpenAIChat:
                 if not user_input:
                     continue
                 
-                # Nachricht an Azure OpenAI senden
-                response = self.send_message(user_input)
+                # Nachricht an Azure OpenAI senden und Antwort anzeigen
+                if self.stream:
+                    print("🤖 Assistant: ", end="", flush=True)
+                    response = self.send_message(user_input, on_token=self._print_token)
+                    if self.last_metrics is None:
+                        print(response)
+                    else:
+                        print()
+                else:
+                    response = self.send_message(user_input)
+                    print(f"🤖 Assistant: {response}")
                 
-                # Antwort anzeigen
-                print(f"🤖 Assistant: {response}")
+                if self.last_metrics:
+                    cache_info = f" | Cache: {self.last_metrics['cache']}" if self.last_metrics.get('cache') else ""
+                    print(f"⏱️  Erstes Token: {self.last_metrics['time_to_first_token']:.2f}s | "
+                          f"Gesamt: {self.last_metrics['total_latency']:.2f}s{cache_info}")
                 
             except KeyboardInterrupt:
                 print("\n👋 Chat beendet!")
@@ -143,9 +306,38 @@ class AzureOpenAIChat:
 
 def main():
     """Hauptfunktion"""
-    chat = AzureOpenAIChat()
+    parser = argparse.ArgumentParser(description='Session Net Pohlheim Azure OpenAI Chat')
+    parser.add_argument('--stream', action='store_true',
+                       help='Antworten tokenweise ausgeben, sobald sie eintreffen')
+    parser.add_argument('--offline', action='store_true',
+                       help='Offline-Client ohne Azure-Verbindung verwenden')
+    parser.add_argument('--cache', action='store_true',
+                       help='Antworten auf wiederkehrende Fragen zwischenspeichern')
+    parser.add_argument('--connect', choices=['lazy', 'background', 'eager'], default='lazy',
+                       help='Zeitpunkt des Verbindungstests (Standard: lazy)')
+    args = parser.parse_args()
+    
+    client = None
+    if args.offline:
+        from fake_client import FakeAzureOpenAIClient
+        client = FakeAzureOpenAIClient(first_token_delay=0.3, token_delay=0.05)
+    
+    chat = AzureOpenAIChat(stream=args.stream, client=client)
+    
+    if args.cache:
+        from answer_cache import AnswerCache, make_embedder
+        # Ohne Embedding-Deployment nur exakte Treffer auf den normalisierten Fragetext
+        embedding_deployment = os.getenv('AZURE_EMBEDDING_DEPLOYMENT')
+        embed = None
+        if embedding_deployment or args.offline:
+            embed = make_embedder(chat.client, embedding_deployment or 'text-embedding-ada-002')
+        chat.answer_cache = AnswerCache(
+            embed=embed,
+            ttl=float(os.getenv('CHAT_CACHE_TTL', 24 * 3600)),
+            index_dir=os.getenv('CHAT_CACHE_INDEX_DIR', 'training/output')
+        )
     
-    if chat.initialize():
+    if chat.initialize(connect=args.connect):
         chat.chat_loop()
     else:
         print("❌ Chat konnte nicht initialisiert werden.")
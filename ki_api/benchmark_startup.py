@@ -0,0 +1,102 @@
+"""
+Startzeit-Benchmark für den Azure OpenAI Chat
+Misst die Importkosten von openai/dotenv/api in frischen Prozessen sowie
+die Dauer von initialize() für die Verbindungsmodi lazy/background/eager
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+import subprocess
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_TARGETS = {
+    "dotenv": "import dotenv",
+    "openai": "import openai",
+    "api (Modul)": "import api",
+    # Client-Erzeugung ohne Netzwerkzugriff, Dummy-Werte nur falls config.env fehlt
+    "api + AzureOpenAIChat()": (
+        "import os; os.environ.setdefault('AZURE_API_KEY', 'benchmark'); "
+        "os.environ.setdefault('AZURE_ENDPOINT', 'https://example.openai.azure.com'); "
+        "import api; api.AzureOpenAIChat()"
+    ),
+}
+
+
+def measure_import(statement, runs):
+    """Misst ein Import-Statement in jeweils frischen Python-Prozessen"""
+    code = (
+        "import time; _t = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - _t)"
+    )
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], cwd=SCRIPT_DIR,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings, None
+
+
+def measure_initialize(connect, probe_latency, runs):
+    """Misst initialize() mit einem Offline-Client, dessen Anfragen probe_latency dauern"""
+    sys.path.insert(0, SCRIPT_DIR)
+    from api import AzureOpenAIChat
+    from fake_client import FakeAzureOpenAIClient
+
+    timings = []
+    devnull = open(os.devnull, 'w')
+    for _ in range(runs):
+        chat = AzureOpenAIChat(client=FakeAzureOpenAIClient(first_token_delay=probe_latency))
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            start_time = time.perf_counter()
+            chat.initialize(connect=connect)
+            timings.append(time.perf_counter() - start_time)
+        finally:
+            sys.stdout = stdout
+    devnull.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startzeit-Benchmark für den Azure OpenAI Chat')
+    parser.add_argument('--runs', type=int, default=5, help='Wiederholungen pro Messung')
+    parser.add_argument('--probe-latency', type=float, default=1.5,
+                       help='Simulierte Dauer des Verbindungstests in Sekunden')
+    parser.add_argument('--output', help='Ergebnisse zusätzlich als JSON speichern')
+    args = parser.parse_args()
+
+    results = {"imports": {}, "initialize": {}}
+
+    print("📦 IMPORTKOSTEN (frischer Prozess, Median):")
+    for name, statement in IMPORT_TARGETS.items():
+        timings, error = measure_import(statement, args.runs)
+        if timings is None:
+            print(f"   ❌ {name}: {error}")
+            continue
+        median = statistics.median(timings)
+        results["imports"][name] = median
+        print(f"   {name:<28} {median * 1000:8.1f} ms")
+
+    print(f"\n🔌 INITIALIZE() (simulierte Probe-Latenz: {args.probe_latency:.2f}s, Median):")
+    for connect in ['eager', 'background', 'lazy']:
+        median = statistics.median(measure_initialize(connect, args.probe_latency, args.runs))
+        results["initialize"][connect] = median
+        print(f"   {connect:<28} {median * 1000:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Ergebnisse gespeichert in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Offline-Ersatz für den AzureOpenAI-Client
+Liefert feste Antworten ohne Netzwerkzugriff, damit der Chat ohne
+Azure-Zugang ausprobiert und getestet werden kann
+"""
+
+import math
+import time
+import zlib
+import asyncio
+from types import SimpleNamespace
+
+
+class _FakeCompletions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, model, messages, stream=False, **kwargs):
+        """Bildet chat.completions.create nach (mit und ohne Streaming)"""
+        owner = self._owner
+        owner.calls.append({"model": model, "messages": list(messages), "stream": stream, **kwargs})
+        text = owner.reply_for(messages)
+
+        if not stream:
+            time.sleep(owner.first_token_delay + owner.token_delay * len(owner.split_tokens(text)))
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")]
+            )
+
+        return self._stream_chunks(text)
+
+    def _stream_chunks(self, text):
+        owner = self._owner
+
+        # Azure schickt als erstes einen Chunk ohne choices (prompt_filter_results)
+        yield SimpleNamespace(choices=[])
+
+        time.sleep(owner.first_token_delay)
+        for token in owner.split_tokens(text):
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=token), finish_reason=None)]
+            )
+            time.sleep(owner.token_delay)
+
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=None), finish_reason="stop")]
+        )
+
+
+class FakeAzureOpenAIClient:
+    """
+    Minimaler Nachbau von openai.AzureOpenAI für Offline-Betrieb
+
+    Args:
+        response_text (str): Feste Antwort; ohne Angabe wird die Benutzerfrage gespiegelt
+        first_token_delay (float): Simulierte Wartezeit bis zum ersten Token in Sekunden
+        token_delay (float): Simulierte Wartezeit zwischen zwei Tokens in Sekunden
+        embedding_dimensions (int): Dimension der simulierten Embeddings
+    """
+
+    def __init__(self, response_text=None, first_token_delay=0.0, token_delay=0.0, embedding_dimensions=1536):
+        self.response_text = response_text
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.embedding_dimensions = embedding_dimensions
+        self.calls = []
+        self.embedding_calls = []
+        self.chat = SimpleNamespace(completions=_FakeCompletions(self))
+        self.embeddings = _FakeEmbeddings(self)
+
+    def reply_for(self, messages):
+        """Ermittelt die Antwort für einen Nachrichtenverlauf"""
+        if self.response_text is not None:
+            return self.response_text
+
+        last_user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        return f"(Offline) Sie fragten: {last_user}"
+
+    @staticmethod
+    def split_tokens(text):
+        """Zerlegt Text grob in Tokens (Wörter inklusive folgendem Leerzeichen)"""
+        tokens = []
+        current = ""
+        for char in text:
+            current += char
+            if char == " ":
+                tokens.append(current)
+                current = ""
+        if current:
+            tokens.append(current)
+        return tokens
+
+
+class _FakeAsyncCompletions(_FakeCompletions):
+    async def create(self, model, messages, stream=False, **kwargs):
+        """Asynchrone Variante von chat.completions.create"""
+        owner = self._owner
+        owner.calls.append({"model": model, "messages": list(messages), "stream": stream, **kwargs})
+        text = owner.reply_for(messages)
+
+        await asyncio.sleep(owner.first_token_delay + owner.token_delay * len(owner.split_tokens(text)))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")]
+        )
+
+
+class FakeAsyncAzureOpenAIClient(FakeAzureOpenAIClient):
+    """Offline-Nachbau von openai.AsyncAzureOpenAI (ohne Streaming)"""
+
+    def __init__(self, response_text=None, first_token_delay=0.0, token_delay=0.0, embedding_dimensions=1536):
+        super().__init__(response_text, first_token_delay, token_delay, embedding_dimensions)
+        self.chat = SimpleNamespace(completions=_FakeAsyncCompletions(self))
+
+    async def close(self):
+        pass
+
+
+class _FakeEmbeddings:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, input, model, **kwargs):
+        """Bildet embeddings.create nach: deterministische Vektoren aus Zeichen-Trigrammen"""
+        owner = self._owner
+        texts = [input] if isinstance(input, str) else list(input)
+        owner.embedding_calls.append({"model": model, "input": texts})
+        data = [
+            SimpleNamespace(index=i, embedding=fake_embedding(text, owner.embedding_dimensions))
+            for i, text in enumerate(texts)
+        ]
+        return SimpleNamespace(data=data, model=model)
+
+
+def fake_embedding(text, dimensions=1536):
+    """
+    Deterministischer Embedding-Ersatz: Zeichen-Trigramme werden per CRC32 auf
+    Dimensionen gehasht und L2-normalisiert. Ähnliche Texte liefern ähnliche Vektoren.
+    """
+    vector = [0.0] * dimensions
+    padded = f"  {text.lower()}  "
+    for i in range(len(padded) - 2):
+        bucket = zlib.crc32(padded[i:i + 3].encode('utf-8')) % dimensions
+        vector[bucket] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
@@ -0,0 +1,294 @@
+"""
+Asynchroner HTTP-Chat-Service für mehrere gleichzeitige Sitzungen
+Stellt den AzureOpenAIChat (System-Nachricht, Reset- und Verlaufs-Befehle)
+über aiohttp bereit, mit einem gemeinsamen AsyncAzureOpenAI-Client
+
+Endpoints:
+    POST /sessions/{session_id}/messages   {"message": "..."}
+    POST /sessions/{session_id}/reset
+    GET  /sessions/{session_id}/history
+    GET  /metrics
+    GET  /health
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import contextlib
+from collections import OrderedDict, deque
+
+import httpx
+from aiohttp import web
+from openai import AsyncAzureOpenAI
+
+from api import SYSTEM_MESSAGE, CHAT_PARAMETERS, summarize_conversation
+
+
+class SessionStore:
+    """
+    Begrenzter LRU-Speicher für Chatverläufe
+
+    Bei Überschreiten von max_sessions wird die am längsten nicht
+    verwendete Sitzung verworfen. Sitzungen mit laufender oder wartender
+    Anfrage bleiben erhalten, bis die Anfrage beendet ist.
+    """
+
+    def __init__(self, max_sessions=1000):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._locks = {}
+        self._users = {}    # Sitzung -> Anzahl laufender/wartender Anfragen
+
+    def get(self, session_id):
+        """Liefert den Verlauf einer Sitzung (legt ihn bei Bedarf an)"""
+        messages = self._sessions.get(session_id)
+        if messages is None:
+            messages = [SYSTEM_MESSAGE]
+            self._sessions[session_id] = messages
+            self._locks[session_id] = asyncio.Lock()
+            self._evict(keep=session_id)
+        else:
+            self._sessions.move_to_end(session_id)
+        return messages
+
+    def peek(self, session_id):
+        """Liefert den Verlauf einer bestehenden Sitzung oder None (legt keine Sitzung an)"""
+        messages = self._sessions.get(session_id)
+        if messages is not None:
+            self._sessions.move_to_end(session_id)
+        return messages
+
+    @contextlib.asynccontextmanager
+    async def session(self, session_id):
+        """
+        Exklusiver Zugriff auf den Verlauf einer Sitzung (serialisiert Anfragen)
+
+        Danach wird die Verdrängung nachgeholt, die für diese Sitzung
+        übersprungen wurde, solange sie in Benutzung war
+        """
+        self.get(session_id)
+        self._users[session_id] = self._users.get(session_id, 0) + 1
+        try:
+            async with self._locks[session_id]:
+                yield self._sessions[session_id]
+        finally:
+            self._users[session_id] -= 1
+            if not self._users[session_id]:
+                del self._users[session_id]
+            self._evict()
+
+    async def reset(self, session_id):
+        """Setzt den Verlauf auf die System-Nachricht zurück (wartet auf laufende Anfragen der Sitzung)"""
+        async with self.session(session_id):
+            self._sessions[session_id] = [SYSTEM_MESSAGE]
+            self._sessions.move_to_end(session_id)
+
+    def _evict(self, keep=None):
+        """Verwirft die ältesten Sitzungen; Sitzungen mit laufender oder wartender Anfrage bleiben"""
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if session_id == keep or session_id in self._users:
+                continue
+            del self._sessions[session_id]
+            del self._locks[session_id]
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class LatencyMetrics:
+    """Sammelt Latenzen pro Route in einem gleitenden Fenster"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._latencies = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, route, latency, error=False):
+        self._latencies.setdefault(route, deque(maxlen=self.window)).append(latency)
+        self._counts[route] = self._counts.get(route, 0) + 1
+        if error:
+            self._errors[route] = self._errors.get(route, 0) + 1
+
+    def summary(self):
+        result = {}
+        for route, values in self._latencies.items():
+            ordered = sorted(values)
+            result[route] = {
+                "count": self._counts[route],
+                "errors": self._errors.get(route, 0),
+                "avg_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2)
+            }
+        return result
+
+
+class ChatService:
+    """
+    Mehrbenutzer-Variante des AzureOpenAIChat
+
+    Args:
+        client: AsyncAzureOpenAI-kompatibler Client (Standard: aus config.env)
+        max_sessions (int): Maximale Anzahl gehaltener Sitzungen (LRU)
+        max_concurrency (int): Maximale Anzahl gleichzeitiger Modell-Anfragen
+    """
+
+    def __init__(self, client=None, max_sessions=1000, max_concurrency=8):
+        self.max_concurrency = max_concurrency
+        self.client = client or self._create_client(max_concurrency)
+        self.deployment = os.getenv('AZURE_DEPLOYMENT', 'gpt-35-turbo')
+        self.sessions = SessionStore(max_sessions)
+        self.metrics = LatencyMetrics()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @staticmethod
+    def _create_client(max_concurrency):
+        """Erstellt einen AsyncAzureOpenAI-Client mit Keep-Alive-Verbindungspool"""
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency * 2,
+                                max_keepalive_connections=max_concurrency),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+        return AsyncAzureOpenAI(
+            api_key=os.getenv('AZURE_API_KEY'),
+            api_version=os.getenv('AZURE_API_VERSION', '2023-07-01-preview'),
+            azure_endpoint=os.getenv('AZURE_ENDPOINT'),
+            http_client=http_client
+        )
+
+    async def send_message(self, session_id, message):
+        """Sendet eine Nachricht im Kontext einer Sitzung und liefert die Antwort"""
+        async with self.sessions.session(session_id) as messages:
+            request_messages = messages + [{"role": "user", "content": message}]
+
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(
+                    model=self.deployment,
+                    messages=request_messages,
+                    **CHAT_PARAMETERS
+                )
+
+            answer = response.choices[0].message.content
+
+            # Verlauf erst nach erfolgreicher Antwort erweitern
+            messages.append({"role": "user", "content": message})
+            messages.append({"role": "assistant", "content": answer})
+            return answer
+
+    # --- HTTP-Handler ---
+
+    @web.middleware
+    async def metrics_middleware(self, request, handler):
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        start_time = time.perf_counter()
+        error = False
+        try:
+            response = await handler(request)
+            error = response.status >= 400
+            return response
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.metrics.record(f"{request.method} {route}", time.perf_counter() - start_time, error)
+
+    async def handle_message(self, request):
+        session_id = request.match_info['session_id']
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.json_response({"error": "Ungültiges JSON"}, status=400)
+        if not isinstance(payload, dict):
+            return web.json_response({"error": "JSON-Objekt erwartet"}, status=400)
+
+        message = (payload.get("message") or "").strip()
+        if not message:
+            return web.json_response({"error": "Feld 'message' fehlt"}, status=400)
+
+        start_time = time.perf_counter()
+        try:
+            answer = await self.send_message(session_id, message)
+        except Exception as e:
+            return web.json_response({"error": f"Fehler beim Senden der Nachricht: {e}"}, status=502)
+
+        return web.json_response({
+            "session_id": session_id,
+            "answer": answer,
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 2)
+        })
+
+    async def handle_reset(self, request):
+        session_id = request.match_info['session_id']
+        await self.sessions.reset(session_id)
+        return web.json_response({"session_id": session_id, "status": "Chat-Verlauf gelöscht"})
+
+    async def handle_history(self, request):
+        session_id = request.match_info['session_id']
+        messages = self.sessions.peek(session_id)
+        if messages is None:
+            return web.json_response({"error": "Sitzung nicht gefunden"}, status=404)
+        return web.json_response({
+            "session_id": session_id,
+            "summary": summarize_conversation(messages),
+            "messages": [msg for msg in messages if msg["role"] != "system"]
+        })
+
+    async def handle_metrics(self, request):
+        return web.json_response({
+            "sessions": len(self.sessions),
+            "max_concurrency": self.max_concurrency,
+            "routes": self.metrics.summary()
+        })
+
+    async def handle_health(self, request):
+        return web.json_response({"status": "ok"})
+
+    async def _close_client(self, app):
+        await self.client.close()
+
+    def create_app(self):
+        """Erstellt die aiohttp-Anwendung"""
+        app = web.Application(middlewares=[self.metrics_middleware])
+        app.router.add_post('/sessions/{session_id}/messages', self.handle_message)
+        app.router.add_post('/sessions/{session_id}/reset', self.handle_reset)
+        app.router.add_get('/sessions/{session_id}/history', self.handle_history)
+        app.router.add_get('/metrics', self.handle_metrics)
+        app.router.add_get('/health', self.handle_health)
+        app.on_cleanup.append(self._close_client)
+        return app
+
+
+def main():
+    """Startet den Chat-Service"""
+    parser = argparse.ArgumentParser(description='Session Net Pohlheim Chat-Service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-sessions', type=int, default=int(os.getenv('CHAT_MAX_SESSIONS', '1000')),
+                       help='Maximale Anzahl gehaltener Sitzungen')
+    parser.add_argument('--max-concurrency', type=int, default=int(os.getenv('CHAT_MAX_CONCURRENCY', '8')),
+                       help='Maximale Anzahl gleichzeitiger Modell-Anfragen')
+    parser.add_argument('--offline', action='store_true',
+                       help='Offline-Client ohne Azure-Verbindung verwenden')
+    args = parser.parse_args()
+
+    client = None
+    if args.offline:
+        from fake_client import FakeAsyncAzureOpenAIClient
+        client = FakeAsyncAzureOpenAIClient(first_token_delay=0.2)
+
+    async def create_app():
+        service = ChatService(client=client, max_sessions=args.max_sessions,
+                              max_concurrency=args.max_concurrency)
+        return service.create_app()
+
+    print(f"🤖 Chat-Service startet auf http://{args.host}:{args.port}")
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
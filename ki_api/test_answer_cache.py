@@ -0,0 +1,67 @@
+"""
+Tests für den Antwort-Cache: semantische Treffer nur bei gleichen Zahlen/Daten
+Aufruf: python -m pytest ki_api/test_answer_cache.py  (oder direkt: python test_answer_cache.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from answer_cache import AnswerCache, literal_tokens, normalize_question
+
+
+def letters_only_embed(text):
+    """Embedding, das Ziffern ignoriert: Fragen, die sich nur in Zahlen unterscheiden, sind identisch"""
+    vector = [0.0] * 27
+    for char in text:
+        if 'a' <= char <= 'z':
+            vector[ord(char) - ord('a')] += 1.0
+        elif char.isalpha():
+            vector[26] += 1.0
+    return vector
+
+
+def test_literal_tokens():
+    assert literal_tokens(normalize_question('Wer war am 03.07.2023 anwesend?')) == ('3.7.2023',)
+    assert literal_tokens(normalize_question('Sitzung im Juli 2023')) == ('2023', 'monat 7')
+    assert literal_tokens(normalize_question('Wer war anwesend?')) == ()
+
+
+def test_semantic_hit_requires_same_date():
+    cache = AnswerCache(embed=letters_only_embed)
+    cache.put('Wer war am 03.07.2023 anwesend?', 'Antwort Juli')
+
+    # Andere Formulierung, gleiches Datum -> semantischer Treffer
+    assert cache.get('Wer war am 3.7.2023 anwesend') == ('Antwort Juli', 'semantic')
+
+    # Fast gleiche Frage mit anderem Datum -> kein Treffer trotz Ähnlichkeit 1.0
+    assert cache.get('Wer war am 04.07.2023 anwesend?') == (None, None)
+    assert cache.get('Wer war am 03.08.2023 anwesend?') == (None, None)
+    assert cache.stats['semantic_hits'] == 1
+    assert cache.stats['misses'] == 2
+
+
+def test_semantic_hit_requires_same_number_and_month():
+    cache = AnswerCache(embed=letters_only_embed)
+    cache.put('Was wurde zu TOP 12 beschlossen?', 'Antwort TOP 12')
+    cache.put('Wann war die Sitzung im Juli?', 'Antwort Juli')
+
+    assert cache.get('Was wurde zu TOP 13 beschlossen?') == (None, None)
+    assert cache.get('Was wurde zu TOP 12 beschlossen') == ('Antwort TOP 12', 'exact')
+    assert cache.get('Wann war die Sitzung im Juni?') == (None, None)
+
+
+def test_matching_entry_behind_near_miss_is_found():
+    cache = AnswerCache(embed=letters_only_embed)
+    cache.put('Wer war am 04.07.2023 anwesend?', 'Antwort 4. Juli')
+    cache.put('Wer war am 03.07.2023 anwesend?', 'Antwort 3. Juli')
+
+    assert cache.get('Wer war am 3.7.2023 anwesend') == ('Antwort 3. Juli', 'semantic')
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
@@ -1,35 +1,48 @@
 import os
+import sys
+import argparse
 from dotenv import load_dotenv
-from azure.ai.documentintelligence import DocumentIntelligenceAdministrationClient
-from azure.core.credentials import AzureKeyCredential
 
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
 
-endpoint = os.getenv('DOCUMENTINTELLIGENCE_ENDPOINT')
-key = os.getenv('DOCUMENTINTELLIGENCE_API_KEY')
-
-print(f"Endpoint: {endpoint}")
-print(f"Key vorhanden: {'Ja' if key else 'Nein'}")
-
-# Erstelle DocumentIntelligenceAdministrationClient
-client = DocumentIntelligenceAdministrationClient(endpoint=endpoint, credential=AzureKeyCredential(key))
-
-try:
-    # Liste alle verfügbaren Modelle
-    print("\nVerfügbare Modelle:")
-    models = client.list_models()
-    
-    model_count = 0
-    for model in models:
-        model_count += 1
-        print(f"{model_count}: {model.model_id}")
-        if model_count >= 10:  # Nur erste 10 Modelle anzeigen
-            print("... (weitere Modelle vorhanden)")
-            break
-    
-    if model_count == 0:
-        print("Keine Modelle gefunden.")
-    
-except Exception as e:
-    print(f"Fehler beim Abrufen der Modelle: {e}")
+# Modell-Liste (Seiten, Cache, Filter) kommt vom DocumentModelTrainer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from train_model import DocumentModelTrainer, parse_datetime
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Document Intelligence Modelle auflisten')
+    parser.add_argument('--prefix', help='Nur Modelle, deren ID damit beginnt')
+    parser.add_argument('--since', type=parse_datetime,
+                        help='Nur Modelle, die nach diesem Zeitpunkt erstellt wurden (z.B. 2025-01-01, ohne Zeitzone UTC)')
+    parser.add_argument('--limit', type=int, help='Maximale Anzahl angezeigter Modelle')
+    parser.add_argument('--no-cache', action='store_true', help='Lokalen Cache ignorieren')
+    args = parser.parse_args()
+
+    print(f"Endpoint: {os.getenv('DOCUMENTINTELLIGENCE_ENDPOINT')}")
+    print(f"Key vorhanden: {'Ja' if os.getenv('DOCUMENTINTELLIGENCE_API_KEY') else 'Nein'}")
+
+    try:
+        with DocumentModelTrainer(console_log_level='WARNING', debug_log=False) as trainer:
+            # Liste alle verfügbaren Modelle
+            print("\nVerfügbare Modelle:")
+
+            model_count = 0
+            for model in trainer.iter_models(prefix=args.prefix, created_after=args.since,
+                                             use_cache=not args.no_cache):
+                model_count += 1
+                print(f"{model_count}: {model['modelId']} ({model.get('createdDateTime') or 'unbekannt'})")
+                if args.limit and model_count >= args.limit:
+                    print("... (weitere Modelle möglich)")
+                    break
+
+            if model_count == 0:
+                print("Keine Modelle gefunden.")
+
+    except Exception as e:
+        print(f"Fehler beim Abrufen der Modelle: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark für den quantisierten Vektor-Store
+Vergleicht Speicherbedarf, Suchlatenz und Recall@10 gegenüber der exakten
+float32-Suche für float32/float16/int8, jeweils ohne und mit IVF-Partitionen.
+Verwendet den Store der Embedding-Pipeline oder synthetische Daten.
+"""
+
+import os
+import time
+import json
+import argparse
+
+import numpy as np
+
+from vector_store import VectorStore, QUANTIZATIONS
+
+
+def synthetic_vectors(n_rows, dimensions, n_topics=200, seed=0):
+    """Geclusterte Zufallsvektoren (ähnliche TOPs liegen nahe beieinander)"""
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dimensions)).astype(np.float32)
+    vectors = topics[rng.integers(n_topics, size=n_rows)]
+    vectors += 0.6 * rng.standard_normal((n_rows, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(vectors, queries, k):
+    """Referenz: exakte Kosinus-Suche in float32"""
+    scores = queries @ vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark für den quantisierten Vektor-Store')
+    parser.add_argument('--store', help='Verzeichnis der Embedding-Pipeline (vectors.npy)')
+    parser.add_argument('--rows', type=int, default=50000, help='Anzahl synthetischer Vektoren')
+    parser.add_argument('--dimensions', type=int, default=1536)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--lists', type=int, default=0, help='IVF-Partitionen (Standard: ~sqrt(N))')
+    parser.add_argument('--nprobe', type=int, default=8)
+    parser.add_argument('--output', help='Ergebnisse zusätzlich als JSON speichern')
+    args = parser.parse_args()
+
+    if args.store:
+        vectors = np.load(os.path.join(args.store, 'vectors.npy'), mmap_mode='r')
+        print(f"📦 Vektoren aus {args.store}: {vectors.shape}")
+    else:
+        vectors = synthetic_vectors(args.rows, args.dimensions)
+        print(f"🧪 Synthetische Vektoren: {vectors.shape}")
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    rng = np.random.default_rng(1)
+    query_rows = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    queries = vectors[query_rows] + 0.05 * rng.standard_normal((len(query_rows), vectors.shape[1])).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    k = min(args.k, len(vectors))
+
+    truth = exact_top_k(vectors, queries, k)
+    n_lists = args.lists or max(1, int(np.sqrt(len(vectors))))
+
+    # Referenz: Python-Liste von float64 wie von model/ada.py geliefert
+    list_bytes = len(vectors) * (vectors.shape[1] * (24 + 8) + 56)
+    print(f"\n   Python-Listen (float64, geschätzt): {list_bytes / 1e6:10.1f} MB")
+    print(f"   NumPy float32 (roh):                {vectors.nbytes / 1e6:10.1f} MB\n")
+
+    print(f"{'Variante':<22}{'Speicher MB':>12}{'Build s':>10}{'ms/Query':>10}{'Recall@' + str(k):>11}")
+    results = []
+    for quantization in QUANTIZATIONS:
+        for lists in (0, n_lists):
+            start_time = time.perf_counter()
+            store = VectorStore.build(vectors, quantization=quantization, n_lists=lists)
+            build_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            found = [store.search(query, k=k, nprobe=args.nprobe)[0] for query in queries]
+            query_ms = (time.perf_counter() - start_time) / len(queries) * 1000
+
+            recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+            name = f"{quantization}" + (f" IVF{lists}/{args.nprobe}" if lists else " exakt")
+            print(f"{name:<22}{store.nbytes / 1e6:>12.1f}{build_time:>10.2f}{query_ms:>10.2f}{recall:>11.3f}")
+            results.append({
+                "variant": name,
+                "bytes": int(store.nbytes),
+                "build_seconds": build_time,
+                "query_ms": query_ms,
+                "recall": float(recall)
+            })
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Ergebnisse gespeichert in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Embedding-Pipeline für die TOPs aller Protokolle
+Liest training/output/*.json, zerlegt top_contents in Abschnitte, erzeugt
+Embeddings (text-embedding-ada-002) in Batches mit parallelen Anfragen und
+Backoff bei Rate-Limits und speichert die Vektoren als float32 .npy.
+Unveränderte Abschnitte werden über einen Inhalts-Hash wiederverwendet.
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import random
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Lade Umgebungsvariablen aus config.env
+load_dotenv('../config.env')
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBEDDING_DIMENSIONS = 1536
+
+# Maximale Anzahl Inputs pro Embeddings-Anfrage laut API
+MAX_BATCH_SIZE = 2048
+
+# Statuscodes, bei denen ein erneuter Versuch sinnvoll ist
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def chunk_text(text, max_chars=2000, overlap=200):
+    """
+    Zerlegt Text an Absatz-/Zeilengrenzen in Abschnitte von höchstens max_chars Zeichen
+
+    Zu lange Zeilen werden hart geschnitten; aufeinanderfolgende Abschnitte
+    überlappen um bis zu overlap Zeichen.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    chunks = []
+    current = ""
+    for line in text.split('\n'):
+        if len(line) > max_chars:
+            # Überlange Zeile in überlappende Fenster schneiden
+            if current:
+                chunks.append(current)
+            step = max(1, max_chars - overlap)
+            pieces = [line[start:start + max_chars] for start in range(0, len(line) - overlap, step)]
+            chunks.extend(pieces[:-1])
+            current = pieces[-1]
+            continue
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > max_chars:
+            chunks.append(current)
+            tail = current[-overlap:] if overlap else ""
+            current = f"{tail}\n{line}" if tail and len(tail) + len(line) < max_chars else line
+        else:
+            current = candidate
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def load_protocol_chunks(input_dir, max_chars=2000, overlap=200):
+    """
+    Liest alle Protokolle und liefert die Abschnitte aller TOPs
+
+    Returns:
+        list: Dicts mit chunk_id, doc_id, top, date, text und hash
+    """
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(input_dir, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            protocol = json.load(f)
+
+        doc_id = protocol.get('id') or os.path.splitext(os.path.basename(path))[0]
+        for top in protocol.get('top_contents', []):
+            heading = (top.get('ueberschrift') or f"TOP {top.get('nummer', '')}").strip()
+            body = (top.get('inhalt') or '').strip()
+            for i, part in enumerate(chunk_text(body, max_chars, overlap) or [""]):
+                text = f"{heading}\n{part}".strip()
+                chunks.append({
+                    "chunk_id": f"{doc_id}#TOP{top.get('nummer', '')}#{i}",
+                    "doc_id": doc_id,
+                    "top": top.get('nummer', ''),
+                    "date": protocol.get('date'),
+                    "text": text,
+                    "hash": content_hash(text)
+                })
+    return chunks
+
+
+def content_hash(text, model=EMBEDDING_MODEL):
+    """Hash über Modell und Text – ändert sich das Modell, wird neu eingebettet"""
+    return hashlib.sha256(f"{model}\n{text}".encode('utf-8')).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Ablage der Vektoren als float32-Matrix (vectors.npy) plus Metadaten (index.json)
+
+    Zeile i in vectors.npy gehört zu Eintrag i in index.json.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.vectors_path = os.path.join(store_dir, 'vectors.npy')
+        self.index_path = os.path.join(store_dir, 'index.json')
+
+    def exists(self):
+        return os.path.exists(self.vectors_path) and os.path.exists(self.index_path)
+
+    def load(self, mmap=True):
+        """
+        Lädt Matrix und Metadaten
+
+        Returns:
+            tuple: (vectors als np.memmap bzw. ndarray, Liste der Metadaten)
+        """
+        if not self.exists():
+            return np.zeros((0, EMBEDDING_DIMENSIONS), dtype=np.float32), []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)["entries"]
+        vectors = np.load(self.vectors_path, mmap_mode='r' if mmap else None)
+        return vectors, entries
+
+    def save(self, vectors_by_row, entries, dimensions):
+        """Schreibt Matrix und Metadaten atomar (temporäre Datei + Umbenennen)"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_vectors = self.vectors_path + '.tmp'
+        matrix = np.lib.format.open_memmap(tmp_vectors, mode='w+', dtype=np.float32,
+                                           shape=(len(entries), dimensions))
+        for row, vector in enumerate(vectors_by_row):
+            matrix[row] = vector
+        matrix.flush()
+        del matrix
+
+        tmp_index = self.index_path + '.tmp'
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            json.dump({"model": EMBEDDING_MODEL, "dimensions": dimensions, "entries": entries},
+                      f, ensure_ascii=False)
+
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_index, self.index_path)
+
+
+class EmbeddingPipeline:
+    """
+    Erzeugt Embeddings für alle TOP-Abschnitte
+
+    Args:
+        client: OpenAI-Client (bzw. kompatibel) mit embeddings.create
+        store_dir (str): Zielverzeichnis für vectors.npy/index.json
+        batch_size (int): Inputs pro Anfrage (höchstens MAX_BATCH_SIZE)
+        max_workers (int): Anzahl paralleler Anfragen
+        max_retries (int): Maximale Wiederholungen pro Batch
+    """
+
+    def __init__(self, client, store_dir='embeddings', model=EMBEDDING_MODEL,
+                 batch_size=256, max_workers=4, max_retries=6):
+        self.client = client
+        self.store = EmbeddingStore(store_dir)
+        self.model = model
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.stats = {"chunks": 0, "cached": 0, "embedded": 0, "requests": 0, "retries": 0}
+        self._stats_lock = threading.Lock()
+
+    def run(self, chunks):
+        """
+        Bettet alle noch nicht bekannten Abschnitte ein und schreibt den Store neu
+
+        Returns:
+            dict: Statistik (chunks, cached, embedded, requests, retries, seconds)
+        """
+        start_time = time.perf_counter()
+        self.stats["chunks"] = len(chunks)
+
+        # Vorhandene Vektoren über den Inhalts-Hash wiederverwenden
+        old_vectors, old_entries = self.store.load(mmap=True)
+        row_by_hash = {entry["hash"]: row for row, entry in enumerate(old_entries)}
+
+        vectors = [None] * len(chunks)
+        missing = []
+        for i, chunk in enumerate(chunks):
+            row = row_by_hash.get(chunk["hash"])
+            if row is not None:
+                # Kopie, damit die alte Datei danach ersetzt werden kann (Windows)
+                vectors[i] = np.array(old_vectors[row], dtype=np.float32)
+            else:
+                missing.append(i)
+        self.stats["cached"] = len(chunks) - len(missing)
+
+        # Gleiche Texte nur einmal einbetten
+        unique_texts = {}
+        for i in missing:
+            unique_texts.setdefault(chunks[i]["hash"], chunks[i]["text"])
+        hashes = list(unique_texts)
+        batches = [hashes[i:i + self.batch_size] for i in range(0, len(hashes), self.batch_size)]
+
+        embedded = {}
+        if batches:
+            print(f"🚀 Bette {len(hashes)} Abschnitte in {len(batches)} Batches ein "
+                  f"({self.max_workers} parallel)...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for batch, batch_vectors in zip(batches, executor.map(
+                        lambda b: self._embed_batch([unique_texts[h] for h in b]), batches)):
+                    embedded.update(zip(batch, batch_vectors))
+        self.stats["embedded"] = len(embedded)
+
+        for i in missing:
+            vectors[i] = embedded[chunks[i]["hash"]]
+
+        dimensions = len(vectors[0]) if vectors else EMBEDDING_DIMENSIONS
+        entries = [{k: chunk[k] for k in ("chunk_id", "doc_id", "top", "date", "hash")} for chunk in chunks]
+        del old_vectors
+        self.store.save(vectors, entries, dimensions)
+
+        self.stats["seconds"] = round(time.perf_counter() - start_time, 3)
+        return self.stats
+
+    def _embed_batch(self, texts):
+        """Eine Embeddings-Anfrage mit exponentiellem Backoff (beachtet Retry-After)"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._count("requests")
+                response = self.client.embeddings.create(input=texts, model=self.model)
+                data = sorted(response.data, key=lambda d: d.index)
+                return [np.asarray(d.embedding, dtype=np.float32) for d in data]
+            except Exception as e:
+                status = getattr(e, 'status_code', None)
+                if status not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    raise
+                self._count("retries")
+                time.sleep(self._retry_delay(e, attempt))
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _retry_delay(error, attempt):
+        """Wartezeit aus Retry-After, sonst exponentiell mit Jitter (max. 60s)"""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return min(60.0, 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Embeddings für alle TOPs der Protokolle erzeugen')
+    parser.add_argument('--input', default='../training/output', help='Verzeichnis mit Protokoll-JSONs')
+    parser.add_argument('--store', default='embeddings', help='Zielverzeichnis für die Vektoren')
+    parser.add_argument('--batch-size', type=int, default=256, help=f'Inputs pro Anfrage (max. {MAX_BATCH_SIZE})')
+    parser.add_argument('--workers', type=int, default=4, help='Parallele Anfragen')
+    parser.add_argument('--max-chars', type=int, default=2000, help='Maximale Abschnittslänge in Zeichen')
+    parser.add_argument('--fake', action='store_true', help='Lokalen Fake-Embedding-Server verwenden')
+    args = parser.parse_args()
+
+    from openai import OpenAI
+
+    chunks = load_protocol_chunks(args.input, max_chars=args.max_chars)
+    print(f"📄 {len(chunks)} Abschnitte aus {args.input}")
+
+    server = None
+    if args.fake:
+        from fake_embedding_server import FakeEmbeddingServer
+        server = FakeEmbeddingServer(rate_limit_every=7).start()
+        client = OpenAI(api_key="fake", base_url=server.base_url, max_retries=0)
+        print(f"🧪 Fake-Embedding-Server: {server.base_url}")
+    else:
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            print("❌ OPENAI_API_KEY ist nicht in der config.env gesetzt!")
+            sys.exit(1)
+        # Wiederholungen übernimmt die Pipeline selbst
+        client = OpenAI(api_key=api_key, max_retries=0)
+
+    try:
+        pipeline = EmbeddingPipeline(client, store_dir=args.store, batch_size=args.batch_size,
+                                     max_workers=args.workers)
+        stats = pipeline.run(chunks)
+    finally:
+        if server:
+            server.stop()
+
+    print(f"✅ Fertig in {stats['seconds']:.2f}s")
+    print(f"   📦 Abschnitte: {stats['chunks']} (aus Cache: {stats['cached']}, neu: {stats['embedded']})")
+    print(f"   🌐 Anfragen: {stats['requests']} (Wiederholungen: {stats['retries']})")
+    print(f"   💾 Store: {pipeline.store.vectors_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Lokaler Ersatz für den OpenAI Embeddings-Endpunkt (POST /v1/embeddings)
+Liefert deterministische Vektoren und kann Rate-Limits (429 + Retry-After)
+simulieren, damit die Embedding-Pipeline offline getestet werden kann
+"""
+
+import json
+import zlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+
+def fake_embedding(text, dimensions=1536):
+    """Deterministischer Vektor aus gehashten Zeichen-Trigrammen (L2-normalisiert)"""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    padded = f"  {text.lower()}  "
+    for i in range(len(padded) - 2):
+        vector[zlib.crc32(padded[i:i + 3].encode('utf-8')) % dimensions] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class FakeEmbeddingServer:
+    """
+    HTTP-Server, der sich wie die OpenAI Embeddings-API verhält
+
+    Args:
+        dimensions (int): Dimension der Vektoren (ada-002: 1536)
+        rate_limit_every (int): Jede n-te Anfrage mit 429 beantworten (0 = nie)
+        retry_after (float): Wert des Retry-After Headers in Sekunden
+        max_batch_size (int): Maximale Anzahl Inputs pro Anfrage (wie die echte API: 2048)
+    """
+
+    def __init__(self, dimensions=1536, rate_limit_every=0, retry_after=0.1, max_batch_size=2048):
+        self.dimensions = dimensions
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.max_batch_size = max_batch_size
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.embedded_inputs = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        """Startet den Server auf einem freien Port in einem Hintergrund-Thread"""
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                owner._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, handler):
+        length = int(handler.headers.get('Content-Length', 0))
+        payload = json.loads(handler.rfile.read(length) or b'{}')
+
+        with self._lock:
+            self.request_count += 1
+            rate_limited = self.rate_limit_every and self.request_count % self.rate_limit_every == 0
+            if rate_limited:
+                self.rate_limited_count += 1
+
+        if not handler.path.endswith('/embeddings'):
+            return self._send(handler, 404, {"error": {"message": "Not found"}})
+
+        if rate_limited:
+            return self._send(handler, 429, {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                              headers={"Retry-After": str(self.retry_after)})
+
+        inputs = payload.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        if len(inputs) > self.max_batch_size:
+            return self._send(handler, 400, {"error": {"message": f"Too many inputs (max {self.max_batch_size})"}})
+
+        with self._lock:
+            self.embedded_inputs += len(inputs)
+
+        data = [
+            {"object": "embedding", "index": i, "embedding": fake_embedding(text, self.dimensions).tolist()}
+            for i, text in enumerate(inputs)
+        ]
+        self._send(handler, 200, {
+            "object": "list",
+            "data": data,
+            "model": payload.get("model", "text-embedding-ada-002"),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0}
+        })
+
+    @staticmethod
+    def _send(handler, status, body, headers=None):
+        raw = json.dumps(body).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(raw)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(raw)
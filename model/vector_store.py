@@ -0,0 +1,234 @@
+"""
+Quantisierter Vektor-Store für Protokoll-Embeddings
+Speichert die Embeddings als float16 oder int8 (mit Skalierung pro Vektor),
+sucht per NumPy-vektorisierter Kosinus-Ähnlichkeit blockweise über
+memory-mapped Matrizen und kann optional IVF-artig in Partitionen
+(k-Means-Zentroiden) vorsortieren, sodass nur nprobe Partitionen
+durchsucht werden.
+"""
+
+import os
+import json
+
+import numpy as np
+
+QUANTIZATIONS = ('float32', 'float16', 'int8')
+
+# Zeilen pro Block beim Durchsuchen (begrenzt den temporären float32-Speicher)
+SEARCH_BLOCK_ROWS = 4096
+
+
+def quantize(vectors, quantization):
+    """
+    Quantisiert eine float32-Matrix
+
+    Returns:
+        tuple: (quantisierte Matrix, Skalierung pro Zeile oder None)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if quantization == 'float32':
+        return vectors, None
+    if quantization == 'float16':
+        return vectors.astype(np.float16), None
+    if quantization == 'int8':
+        # Symmetrische Quantisierung pro Vektor: v ≈ q * scale
+        max_abs = np.abs(vectors).max(axis=1)
+        scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return quantized, scales
+    raise ValueError(f"Unbekannte Quantisierung: {quantization} (erlaubt: {', '.join(QUANTIZATIONS)})")
+
+
+def kmeans(vectors, n_clusters, iterations=10, sample_size=20000, seed=0):
+    """Einfaches sphärisches k-Means (Lloyd) auf einer Stichprobe, liefert normalisierte Zentroiden"""
+    rng = np.random.default_rng(seed)
+    n_rows = len(vectors)
+    sample_rows = np.sort(rng.choice(n_rows, size=min(sample_size, n_rows), replace=False))
+    sample = _normalize_rows(np.asarray(vectors[sample_rows], dtype=np.float32))
+
+    centroids = sample[rng.choice(len(sample), size=n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(n_clusters):
+            members = sample[assignment == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+            else:
+                # Leere Partition mit zufälligem Punkt neu besetzen
+                centroids[c] = sample[rng.integers(len(sample))]
+        centroids = _normalize_rows(centroids)
+    return centroids
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorStore:
+    """
+    Kosinus-Suche über quantisierte Embeddings
+
+    Die Zeilen liegen (bei IVF nach Partition sortiert) in matrix; ids bildet
+    jede Zeile auf die ursprüngliche Zeilennummer des Eingabe-Arrays ab.
+    """
+
+    def __init__(self, matrix, scales, inv_norms, ids, quantization,
+                 centroids=None, list_offsets=None):
+        self.matrix = matrix
+        self.scales = scales
+        self.inv_norms = inv_norms
+        self.ids = ids
+        self.quantization = quantization
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+
+    @classmethod
+    def build(cls, vectors, quantization='int8', n_lists=0, kmeans_iterations=10):
+        """
+        Erstellt einen Store aus einer float32-Matrix (auch memory-mapped)
+
+        Args:
+            vectors: Matrix (N x D)
+            quantization (str): 'float32', 'float16' oder 'int8'
+            n_lists (int): Anzahl IVF-Partitionen (0 = keine Partitionierung)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ids = np.arange(len(vectors), dtype=np.int64)
+        centroids = list_offsets = None
+
+        n_lists = min(n_lists, len(vectors))
+        if n_lists:
+            centroids = kmeans(vectors, n_lists, iterations=kmeans_iterations)
+            assignment = np.empty(len(vectors), dtype=np.int32)
+            for start in range(0, len(vectors), SEARCH_BLOCK_ROWS):
+                block = vectors[start:start + SEARCH_BLOCK_ROWS]
+                assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+            ids = np.argsort(assignment, kind='stable')
+            vectors = vectors[ids]
+            counts = np.bincount(assignment, minlength=n_lists)
+            list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        matrix, scales = quantize(vectors, quantization)
+
+        # Normen der (de)quantisierten Vektoren, damit die Kosinus-Ähnlichkeit exakt normiert ist
+        inv_norms = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), SEARCH_BLOCK_ROWS):
+            block = cls._dequantize_block(matrix, scales, start, start + SEARCH_BLOCK_ROWS)
+            norms = np.linalg.norm(block, axis=1)
+            inv_norms[start:start + len(block)] = np.where(norms > 0, 1.0 / np.maximum(norms, 1e-12), 0.0)
+
+        return cls(matrix, scales, inv_norms, ids, quantization, centroids, list_offsets)
+
+    @staticmethod
+    def _dequantize_block(matrix, scales, start, stop):
+        block = np.asarray(matrix[start:stop], dtype=np.float32)
+        if scales is not None:
+            block *= scales[start:stop, None]
+        return block
+
+    def __len__(self):
+        return len(self.matrix)
+
+    @property
+    def nbytes(self):
+        """Speicherbedarf der Vektordaten in Bytes"""
+        total = self.matrix.nbytes + self.inv_norms.nbytes + self.ids.nbytes
+        if self.scales is not None:
+            total += self.scales.nbytes
+        if self.centroids is not None:
+            total += self.centroids.nbytes + self.list_offsets.nbytes
+        return total
+
+    def search(self, query, k=10, nprobe=8):
+        """
+        Liefert die k ähnlichsten Vektoren
+
+        Args:
+            query: Suchvektor (D)
+            k (int): Anzahl Treffer
+            nprobe (int): Anzahl durchsuchter Partitionen (nur mit IVF)
+
+        Returns:
+            tuple: (ursprüngliche Zeilennummern, Kosinus-Ähnlichkeiten), absteigend sortiert
+        """
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        if self.centroids is not None:
+            probe = np.argsort(self.centroids @ query)[::-1][:nprobe]
+            ranges = [(self.list_offsets[c], self.list_offsets[c + 1]) for c in probe]
+        else:
+            ranges = [(0, len(self.matrix))]
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for range_start, range_stop in ranges:
+            for start in range(range_start, range_stop, SEARCH_BLOCK_ROWS):
+                stop = min(start + SEARCH_BLOCK_ROWS, range_stop)
+                scores = self._score_block(query, start, stop)
+                if len(scores) > k:
+                    top = np.argpartition(scores, -k)[-k:]
+                else:
+                    top = np.arange(len(scores))
+                best_rows = np.concatenate([best_rows, top + start])
+                best_scores = np.concatenate([best_scores, scores[top]])
+                if len(best_scores) > k:
+                    keep = np.argpartition(best_scores, -k)[-k:]
+                    best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(best_scores)[::-1]
+        return self.ids[best_rows[order]], best_scores[order]
+
+    def _score_block(self, query, start, stop):
+        block = self.matrix[start:stop]
+        if self.quantization == 'float32':
+            scores = block @ query
+        else:
+            # Skalierung erst nach dem Skalarprodukt anwenden (ein Faktor pro Zeile)
+            scores = np.asarray(block, dtype=np.float32) @ query
+            if self.scales is not None:
+                scores *= self.scales[start:stop]
+        return scores * self.inv_norms[start:stop]
+
+    def save(self, store_dir):
+        """Speichert den Store als .npy-Dateien plus meta.json"""
+        os.makedirs(store_dir, exist_ok=True)
+        np.save(os.path.join(store_dir, 'matrix.npy'), self.matrix)
+        np.save(os.path.join(store_dir, 'inv_norms.npy'), self.inv_norms)
+        np.save(os.path.join(store_dir, 'ids.npy'), self.ids)
+        if self.scales is not None:
+            np.save(os.path.join(store_dir, 'scales.npy'), self.scales)
+        if self.centroids is not None:
+            np.save(os.path.join(store_dir, 'centroids.npy'), self.centroids)
+            np.save(os.path.join(store_dir, 'list_offsets.npy'), self.list_offsets)
+        with open(os.path.join(store_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                "quantization": self.quantization,
+                "rows": len(self.matrix),
+                "dimensions": int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0,
+                "n_lists": 0 if self.centroids is None else len(self.centroids)
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, store_dir, mmap=True):
+        """Lädt einen gespeicherten Store; die Vektormatrix wird memory-mapped"""
+        with open(os.path.join(store_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        def optional(name):
+            path = os.path.join(store_dir, name)
+            return np.load(path) if os.path.exists(path) else None
+
+        return cls(
+            matrix=np.load(os.path.join(store_dir, 'matrix.npy'), mmap_mode='r' if mmap else None),
+            scales=optional('scales.npy'),
+            inv_norms=np.load(os.path.join(store_dir, 'inv_norms.npy')),
+            ids=np.load(os.path.join(store_dir, 'ids.npy')),
+            quantization=meta["quantization"],
+            centroids=optional('centroids.npy'),
+            list_offsets=optional('list_offsets.npy')
+        )
@@ -4,8 +4,32 @@ import fitz  # pymupdf
 import re
 import os
 import json
+import time
+import bisect
+import difflib
+import itertools
 from datetime import datetime
 
+from document_training import protocol_patterns as patterns
+
+# Wort-Tokens für die Ausrichtung
+TOKEN_PATTERN = re.compile(r'\S+')
+
+# Kontext (Zeichen) vor/nach einem Unterschied und maximale Länge des Unterschieds im Bericht
+CONTEXT_CHARS = 40
+MAX_DIFF_TEXT = 500
+
+# Muster für den Vergleich der Backends
+PROTOCOL_PATTERNS = {
+    'anwesenheit': patterns.ANWESENHEIT_SECTION,
+    'abwesend': patterns.ABWESEND_SECTION,
+    'tagesordnung': patterns.TAGESORDNUNG_SECTION,
+    'top_numbers': patterns.TOP_NUMBER,
+    'datum': patterns.DATE,
+    'zeit': patterns.TIME,
+    'ort': patterns.ORT
+}
+
 def extract_with_pypdf2(pdf_path):
     """Extrahiere Text mit PyPDF2"""
     try:
@@ -43,72 +67,180 @@ def extract_with_pymupdf(pdf_path):
     except Exception as e:
         return f"Fehler bei pymupdf: {e}"
 
-def find_differences(text1, text2, method1_name, method2_name):
-    """Finde und dokumentiere Unterschiede zwischen zwei Texten"""
-    differences = []
+def tokenize(text):
+    """
+    Zerlegt Text in Wörter (zusammenhängende Nicht-Leerzeichen) mit Zeichen-Offsets
+    
+    Unterschiedliche Zeilenumbrüche oder Leerzeichen der Backends erzeugen so
+    keine Verschiebung aller folgenden Positionen.
+    
+    Returns:
+        tuple: (Liste der Wörter, Liste der (start, ende) Offsets)
+    """
+    tokens, spans = [], []
+    for match in TOKEN_PATTERN.finditer(text):
+        tokens.append(match.group())
+        spans.append(match.span())
+    return tokens, spans
+
+def align_texts(text1, text2, autojunk=True):
+    """
+    Richtet zwei Texte wortweise aus (difflib.SequenceMatcher)
+    
+    Args:
+        autojunk (bool): Sehr häufige Wörter (> 1 %) nicht als Anker verwenden;
+                         deutlich schneller bei langen Texten, Treffer werden trotzdem über sie verlängert
+    
+    Returns:
+        dict: tokens1, tokens2, spans1, spans2, opcodes
+    """
+    tokens1, spans1 = tokenize(text1)
+    tokens2, spans2 = tokenize(text2)
+    matcher = difflib.SequenceMatcher(None, tokens1, tokens2, autojunk=autojunk)
+    return {
+        'tokens1': tokens1,
+        'tokens2': tokens2,
+        'spans1': spans1,
+        'spans2': spans2,
+        'opcodes': matcher.get_opcodes()
+    }
+
+def _clip(text, max_chars=MAX_DIFF_TEXT):
+    if len(text) <= max_chars:
+        return text
+    return f'{text[:max_chars]}... [{len(text) - max_chars} Zeichen gekürzt]'
+
+def _char_range(spans, start, end, text_length):
+    """Zeichenbereich der Tokens [start, end); bei leerem Bereich die Einfügeposition"""
+    if end > start:
+        return spans[start][0], spans[end - 1][1]
+    position = spans[start][0] if start < len(spans) else text_length
+    return position, position
+
+def iter_differences(text1, text2, alignment=None, context_chars=CONTEXT_CHARS):
+    """
+    Liefert echte Einfügungen, Löschungen und Ersetzungen zwischen zwei Texten
+    
+    Yields:
+        dict: type, position1/2 (Zeichen), line1/2, text1/2, context1/2
+    """
+    alignment = alignment or align_texts(text1, text2)
+    line_starts1 = [0] + [m.end() for m in re.finditer('\n', text1)]
+    line_starts2 = [0] + [m.end() for m in re.finditer('\n', text2)]
+    
+    for tag, i1, i2, j1, j2 in alignment['opcodes']:
+        if tag == 'equal':
+            continue
+        start1, end1 = _char_range(alignment['spans1'], i1, i2, len(text1))
+        start2, end2 = _char_range(alignment['spans2'], j1, j2, len(text2))
+        yield {
+            'type': tag,
+            'position1': start1,
+            'position2': start2,
+            'line1': bisect.bisect_right(line_starts1, start1),
+            'line2': bisect.bisect_right(line_starts2, start2),
+            'text1': _clip(text1[start1:end1]),
+            'text2': _clip(text2[start2:end2]),
+            'context1': text1[max(0, start1 - context_chars):end1 + context_chars] if end1 - start1 <= MAX_DIFF_TEXT else '',
+            'context2': text2[max(0, start2 - context_chars):end2 + context_chars] if end2 - start2 <= MAX_DIFF_TEXT else ''
+        }
+
+def difference_statistics(text1, text2, alignment, method1_name, method2_name):
+    """Kennzahlen einer Ausrichtung (ohne die einzelnen Unterschiede aufzuzählen)"""
+    counts = {'insert': 0, 'delete': 0, 'replace': 0}
+    inserted = deleted = matched = 0
+    for tag, i1, i2, j1, j2 in alignment['opcodes']:
+        if tag == 'equal':
+            matched += i2 - i1
+            continue
+        counts[tag] += 1
+        deleted += i2 - i1
+        inserted += j2 - j1
     
-    # Grundlegende Statistiken
-    stats = {
+    total_tokens = len(alignment['tokens1']) + len(alignment['tokens2'])
+    return {
         'method1': method1_name,
         'method2': method2_name,
         'length1': len(text1),
         'length2': len(text2),
         'length_diff': len(text1) - len(text2),
+        'tokens1': len(alignment['tokens1']),
+        'tokens2': len(alignment['tokens2']),
+        'lines1': text1.count('\n') + 1,
+        'lines2': text2.count('\n') + 1,
+        'similarity': round(2.0 * matched / total_tokens, 4) if total_tokens else 1.0,
+        'insertions': counts['insert'],
+        'deletions': counts['delete'],
+        'replacements': counts['replace'],
+        'tokens_only_in_1': deleted,
+        'tokens_only_in_2': inserted,
         'timestamp': datetime.now().isoformat()
     }
-    
-    # Zeichen-für-Zeichen Vergleich
-    min_length = min(len(text1), len(text2))
-    char_differences = []
-    
-    for i in range(min_length):
-        if text1[i] != text2[i]:
-            char_differences.append({
-                'position': i,
-                'char1': text1[i],
-                'char2': text2[i],
-                'context1': text1[max(0, i-20):i+20],
-                'context2': text2[max(0, i-20):i+20]
-            })
-            
-            # Begrenze auf erste 50 Unterschiede
-            if len(char_differences) >= 50:
-                char_differences.append({
-                    'position': '...',
-                    'char1': '...',
-                    'char2': '...',
-                    'context1': f'... und {len(text1) - min_length} weitere Unterschiede',
-                    'context2': f'... und {len(text2) - min_length} weitere Unterschiede'
-                })
-                break
-    
-    # Spezifische Muster-Tests
-    patterns = {
-        'anwesenheit': r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)',
-        'abwesend': r'Abwesend[:\s]*(.*?)(?=TOP|Tagesordnung)',
-        'tagesordnung': r'Tagesordnung[:\s]*(.*?)(?=TOP\s+1|Beschluss)',
-        'top_numbers': r'TOP\s+(\d+(?:\.\d+)?)',
-        'datum': r'(\d{1,2}\.\d{1,2}\.\d{4})',
-        'zeit': r'(\d{1,2}:\d{2})',
-        'ort': r'(Pohlheim|Sitzungssaal)'
-    }
+
+def count_patterns(text, max_matches=10):
+    """Treffer der Protokoll-Muster in einem Text: Anzahl und erste max_matches Treffer"""
+    results = {}
+    for pattern_name, pattern in PROTOCOL_PATTERNS.items():
+        matches = pattern.findall(text)
+        results[pattern_name] = {'count': len(matches), 'matches': matches[:max_matches]}
+    return results
+
+def compare_patterns(text1, text2):
+    """Zählt die Treffer der Protokoll-Muster in beiden Texten"""
+    counts1 = count_patterns(text1)
+    counts2 = count_patterns(text2)
     
     pattern_results = {}
-    for pattern_name, pattern in patterns.items():
-        matches1 = re.findall(pattern, text1, re.DOTALL | re.IGNORECASE)
-        matches2 = re.findall(pattern, text2, re.DOTALL | re.IGNORECASE)
-        
+    for pattern_name in PROTOCOL_PATTERNS:
         pattern_results[pattern_name] = {
-            'method1_count': len(matches1),
-            'method2_count': len(matches2),
-            'method1_matches': matches1[:10],  # Erste 10 Matches
-            'method2_matches': matches2[:10]
+            'method1_count': counts1[pattern_name]['count'],
+            'method2_count': counts2[pattern_name]['count'],
+            'method1_matches': counts1[pattern_name]['matches'],  # Erste 10 Matches
+            'method2_matches': counts2[pattern_name]['matches']
         }
+    return pattern_results
+
+def find_differences(text1, text2, method1_name, method2_name, max_differences=None, autojunk=True):
+    """Finde und dokumentiere Unterschiede zwischen zwei Texten (wortweise Ausrichtung)"""
+    alignment = align_texts(text1, text2, autojunk=autojunk)
+    differences = list(itertools.islice(iter_differences(text1, text2, alignment), max_differences))
     
     return {
-        'statistics': stats,
-        'character_differences': char_differences,
-        'pattern_analysis': pattern_results
+        'statistics': difference_statistics(text1, text2, alignment, method1_name, method2_name),
+        'differences': differences,
+        'pattern_analysis': compare_patterns(text1, text2)
+    }
+
+def write_differences_report(path, text1, text2, method1_name, method2_name, autojunk=True):
+    """
+    Schreibt einen *_differences.json Bericht inkrementell
+    
+    Die Unterschiede werden einzeln geschrieben, sobald sie berechnet sind,
+    statt die komplette Liste im Speicher aufzubauen.
+    
+    Returns:
+        dict: statistics und pattern_analysis (ohne die einzelnen Unterschiede)
+    """
+    start_time = time.perf_counter()
+    alignment = align_texts(text1, text2, autojunk=autojunk)
+    statistics = difference_statistics(text1, text2, alignment, method1_name, method2_name)
+    statistics['seconds'] = round(time.perf_counter() - start_time, 3)
+    pattern_analysis = compare_patterns(text1, text2)
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "statistics": ')
+        f.write(json.dumps(statistics, ensure_ascii=False))
+        f.write(',\n  "differences": [')
+        for index, difference in enumerate(iter_differences(text1, text2, alignment)):
+            f.write(',\n    ' if index else '\n    ')
+            f.write(json.dumps(difference, ensure_ascii=False))
+        f.write('\n  ],\n  "pattern_analysis": ')
+        f.write(json.dumps(pattern_analysis, ensure_ascii=False))
+        f.write('\n}\n')
+    
+    return {
+        'statistics': statistics,
+        'pattern_analysis': pattern_analysis
     }
 
 def analyze_specific_sections(text, method_name):
@@ -120,46 +252,46 @@ def analyze_specific_sections(text, method_name):
     }
     
     # Anwesenheitsliste
-    anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', text, re.DOTALL | re.IGNORECASE)
+    anwesen_match = patterns.ANWESENHEIT_SECTION.search(text)
     if anwesen_match:
         anwesen_text = anwesen_match.group(1).strip()
         analysis['sections']['anwesenheit'] = {
             'found': True,
             'length': len(anwesen_text),
             'preview': anwesen_text[:200],
-            'person_count': len(re.findall(r'STV\s+\w+', anwesen_text))
+            'person_count': len(patterns.STV_PERSON.findall(anwesen_text))
         }
     else:
         analysis['sections']['anwesenheit'] = {'found': False}
     
     # Abwesend
-    abwesend_match = re.search(r'Abwesend[:\s]*(.*?)(?=TOP|Tagesordnung)', text, re.DOTALL | re.IGNORECASE)
+    abwesend_match = patterns.ABWESEND_SECTION.search(text)
     if abwesend_match:
         abwesend_text = abwesend_match.group(1).strip()
         analysis['sections']['abwesend'] = {
             'found': True,
             'length': len(abwesend_text),
             'preview': abwesend_text[:200],
-            'person_count': len(re.findall(r'STV\s+\w+', abwesend_text))
+            'person_count': len(patterns.STV_PERSON.findall(abwesend_text))
         }
     else:
         analysis['sections']['abwesend'] = {'found': False}
     
     # Tagesordnung
-    tagesordnung_match = re.search(r'Tagesordnung[:\s]*(.*?)(?=TOP\s+1|Beschluss)', text, re.DOTALL | re.IGNORECASE)
+    tagesordnung_match = patterns.TAGESORDNUNG_SECTION.search(text)
     if tagesordnung_match:
         tagesordnung_text = tagesordnung_match.group(1).strip()
         analysis['sections']['tagesordnung'] = {
             'found': True,
             'length': len(tagesordnung_text),
             'preview': tagesordnung_text[:200],
-            'top_count': len(re.findall(r'TOP\s+(\d+(?:\.\d+)?)', tagesordnung_text))
+            'top_count': len(patterns.TOP_NUMBER.findall(tagesordnung_text))
         }
     else:
         analysis['sections']['tagesordnung'] = {'found': False}
     
     # TOP-Erkennung
-    top_matches = re.findall(r'TOP\s+(\d+(?:\.\d+)?)', text, re.IGNORECASE)
+    top_matches = patterns.TOP_NUMBER.findall(text)
     analysis['sections']['top_erkenntnis'] = {
         'total_tops': len(top_matches),
         'top_numbers': top_matches[:20]  # Erste 20 TOPs
@@ -193,23 +325,17 @@ def main():
     pdfplumber_analysis = analyze_specific_sections(pdfplumber_text, 'pdfplumber')
     pymupdf_analysis = analyze_specific_sections(pymupdf_text, 'pymupdf')
     
-    # Finde Unterschiede
+    # Finde Unterschiede (Berichte werden inkrementell geschrieben)
     print('Finde Unterschiede...')
-    pypdf2_vs_pdfplumber = find_differences(pypdf2_text, pdfplumber_text, 'PyPDF2', 'pdfplumber')
-    pymupdf_vs_pypdf2 = find_differences(pymupdf_text, pypdf2_text, 'pymupdf', 'PyPDF2')
+    pypdf2_vs_pdfplumber = write_differences_report('pypdf2_vs_pdfplumber_differences.json',
+                                                    pypdf2_text, pdfplumber_text, 'PyPDF2', 'pdfplumber')
+    pymupdf_vs_pypdf2 = write_differences_report('pymupdf_vs_pypdf2_differences.json',
+                                                 pymupdf_text, pypdf2_text, 'pymupdf', 'PyPDF2')
     
     # Speichere Ergebnisse
     print('Speichere Ergebnisse...')
     
-    # PyPDF2 vs pdfplumber Unterschiede
-    with open('pypdf2_vs_pdfplumber_differences.json', 'w', encoding='utf-8') as f:
-        json.dump(pypdf2_vs_pdfplumber, f, ensure_ascii=False, indent=2)
-    
-    # pymupdf vs PyPDF2 Unterschiede
-    with open('pymupdf_vs_pypdf2_differences.json', 'w', encoding='utf-8') as f:
-        json.dump(pymupdf_vs_pypdf2, f, ensure_ascii=False, indent=2)
-    
-    # Vollständige Analyse
+    # Vollständige Analyse (einzelne Unterschiede stehen in den *_differences.json Dateien)
     complete_analysis = {
         'timestamp': datetime.now().isoformat(),
         'pdf_file': pdf_file,
@@ -229,8 +355,10 @@ def main():
     
     # Zeige Zusammenfassung
     print('\n=== ZUSAMMENFASSUNG ===')
-    print(f'PyPDF2 vs pdfplumber: {pypdf2_vs_pdfplumber["statistics"]["length_diff"]} Zeichen Unterschied')
-    print(f'pymupdf vs PyPDF2: {pymupdf_vs_pypdf2["statistics"]["length_diff"]} Zeichen Unterschied')
+    for label, result in (('PyPDF2 vs pdfplumber', pypdf2_vs_pdfplumber), ('pymupdf vs PyPDF2', pymupdf_vs_pypdf2)):
+        stats = result["statistics"]
+        print(f'{label}: {stats["length_diff"]} Zeichen Unterschied, Ähnlichkeit {stats["similarity"]:.1%}, '
+              f'{stats["insertions"]} Einfügungen, {stats["deletions"]} Löschungen, {stats["replacements"]} Ersetzungen')
     print()
     
     print('Anwesenheitsliste:')
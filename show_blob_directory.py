@@ -1,7 +1,12 @@
 import os
+import sys
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
+# Gleicher Modulpfad wie in document_training (ein blob_access-Modul, ein Client-Pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from blob_access import parse_sas_url
+
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
 
@@ -21,7 +26,7 @@ print(f"Query Parameter: {parsed.query}")
 print()
 
 # Extrahiere Container-Name
-container_name = parsed.path.split('/')[-1]
+container_name = parse_sas_url(blob_url).container_name
 print(f"Container Name: {container_name}")
 print()
 
@@ -1,7 +1,10 @@
 import os
+import sys
 from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient
-from urllib.parse import urlparse
+
+# Gleicher Modulpfad wie in document_training (ein blob_access-Modul, ein Client-Pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from blob_access import get_container_client, parse_sas_url
 
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
@@ -13,18 +16,13 @@ if not blob_sas_url:
     print("❌ BLOBSASURL ist nicht gesetzt!")
     exit(1)
 
-# Parse die URL
-parsed_url = urlparse(blob_sas_url)
-container_name = parsed_url.path.split('/')[-1]
+# Container-Name aus der SAS URL
+container_name = parse_sas_url(blob_sas_url).container_name
 print(f"Container Name: {container_name}")
 
 try:
-    # Erstelle BlobServiceClient
-    blob_service_client = BlobServiceClient(account_url=blob_sas_url)
-    print("✅ BlobServiceClient erfolgreich erstellt")
-    
-    # Erstelle Container Client
-    container_client = blob_service_client.get_container_client(container_name)
+    # Gemeinsamer, gepoolter Container Client
+    container_client = get_container_client(sas_url=blob_sas_url)
     print("✅ Container Client erfolgreich erstellt")
     
     # Zeige Container-Eigenschaften
@@ -1,3 +1,4 @@
+import itertools
 import json
 
 # Lade die neuen Unterschiede-Dateien
@@ -7,29 +8,48 @@ with open('pypdf2_vs_pdfplumber_differences.json', 'r', encoding='utf-8') as f:
 with open('pymupdf_vs_pypdf2_differences.json', 'r', encoding='utf-8') as f:
     pymupdf_vs_pypdf2 = json.load(f)
 
-print('=== ZUSAMMENFASSUNG DER UNTERSCHIEDE ===')
-print()
-print('PyPDF2 vs pdfplumber:')
-print(f'  Textlängen-Unterschied: {pypdf2_vs_pdfplumber["statistics"]["length_difference"]} Zeichen')
-print(f'  PyPDF2: {pypdf2_vs_pdfplumber["statistics"]["pypdf2_length"]} Zeichen')
-print(f'  pdfplumber: {pypdf2_vs_pdfplumber["statistics"]["pdfplumber_length"]} Zeichen')
-print(f'  Gefundene Zeichen-Unterschiede: {len(pypdf2_vs_pdfplumber["character_differences"])}')
-print()
 
-print('pymupdf vs PyPDF2:')
-print(f'  Textlängen-Unterschied: {pymupdf_vs_pypdf2["statistics"]["length_difference"]} Zeichen')
-print(f'  pymupdf: {pymupdf_vs_pypdf2["statistics"]["pymupdf_length"]} Zeichen')
-print(f'  PyPDF2: {pymupdf_vs_pypdf2["statistics"]["pypdf2_length"]} Zeichen')
-print(f'  Gefundene Zeichen-Unterschiede: {len(pymupdf_vs_pypdf2["character_differences"])}')
-print()
+def format_stat(value, fmt=''):
+    """Formatiert einen Kennwert; ältere Berichte (nur Zeichenvergleich) haben ihn nicht"""
+    return 'n/a' if value is None else format(value, fmt)
 
-print('Erste 5 Zeichen-Unterschiede (PyPDF2 vs pdfplumber):')
-for i, diff in enumerate(pypdf2_vs_pdfplumber['character_differences'][:5]):
-    print(f'  Position {diff["position"]}: PyPDF2="{diff["pypdf2_char"]}" vs pdfplumber="{diff["pdfplumber_char"]}"')
-    print(f'    Kontext: {diff["context"]}')
+
+def iter_report_differences(report):
+    """Unterschiede im neuen Format; ältere Berichte enthalten nur 'character_differences'"""
+    if 'differences' in report:
+        yield from report['differences']
+        return
+    for diff in report.get('character_differences', []):
+        yield {
+            'type': 'replace',
+            'line1': '?',
+            'line2': '?',
+            'text1': diff.get('char1', ''),
+            'text2': diff.get('char2', ''),
+            'context1': diff.get('context1', '')
+        }
+
+print('=== ZUSAMMENFASSUNG DER UNTERSCHIEDE ===')
 print()
 
-print('Erste 5 Zeichen-Unterschiede (pymupdf vs PyPDF2):')
-for i, diff in enumerate(pymupdf_vs_pypdf2['character_differences'][:5]):
-    print(f'  Position {diff["position"]}: pymupdf="{diff["pymupdf_char"]}" vs PyPDF2="{diff["pypdf2_char"]}"')
-    print(f'    Kontext: {diff["context"]}')
+for label, report in (('PyPDF2 vs pdfplumber', pypdf2_vs_pdfplumber), ('pymupdf vs PyPDF2', pymupdf_vs_pypdf2)):
+    stats = report["statistics"]
+    print(f'{label}:')
+    print(f'  Textlängen-Unterschied: {stats["length_diff"]} Zeichen')
+    print(f'  {stats["method1"]}: {stats["length1"]} Zeichen, {format_stat(stats.get("tokens1"))} Wörter')
+    print(f'  {stats["method2"]}: {stats["length2"]} Zeichen, {format_stat(stats.get("tokens2"))} Wörter')
+    print(f'  Ähnlichkeit (wortweise): {format_stat(stats.get("similarity"), ".1%")}')
+    print(f'  Einfügungen: {format_stat(stats.get("insertions"))}, Löschungen: {format_stat(stats.get("deletions"))}, '
+          f'Ersetzungen: {format_stat(stats.get("replacements"))}')
+    if 'differences' not in report:
+        print('  Hinweis: Bericht im alten Format, mit pdf_extraction_comparison.py neu erzeugen')
+    print()
+
+for label, report in (('PyPDF2 vs pdfplumber', pypdf2_vs_pdfplumber), ('pymupdf vs PyPDF2', pymupdf_vs_pypdf2)):
+    stats = report["statistics"]
+    print(f'Erste 5 Unterschiede ({label}):')
+    for diff in itertools.islice(iter_report_differences(report), 5):
+        print(f'  [{diff["type"]}] Zeile {diff["line1"]}/{diff["line2"]}: '
+              f'{stats["method1"]}="{diff["text1"]}" vs {stats["method2"]}="{diff["text2"]}"')
+        print(f'    Kontext: {diff["context1"]!r}')
+    print()
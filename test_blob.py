@@ -1,7 +1,10 @@
 import os
+import sys
 from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient
-from urllib.parse import urlparse
+
+# Gleicher Modulpfad wie in document_training (ein blob_access-Modul, ein Client-Pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from blob_access import get_container_client, parse_sas_url
 
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
@@ -9,25 +12,18 @@ load_dotenv('config.env')
 blob_sas_url = os.getenv('BLOBSASURL')
 print(f"Blob URL: {blob_sas_url}")
 
-# Erstelle BlobServiceClient mit SAS URL - alternative Methode
+# Erstelle Container Client über den gemeinsamen Blob-Zugriff
 try:
-    blob_service_client = BlobServiceClient(account_url=blob_sas_url)
-    print("BlobServiceClient erfolgreich erstellt")
+    container_name = parse_sas_url(blob_sas_url).container_name
+    container_client = get_container_client(sas_url=blob_sas_url)
+    print("ContainerClient erfolgreich erstellt")
 except Exception as e:
-    print(f"Fehler beim Erstellen des BlobServiceClient: {e}")
+    print(f"Fehler beim Erstellen des ContainerClient: {e}")
     exit(1)
 
-# Parse die SAS URL um Container-Name zu extrahieren
-parsed_url = urlparse(blob_sas_url)
-container_name = parsed_url.path.split('/')[-1]
-if not container_name:
-    container_name = "container2"  # Fallback falls Container-Name nicht extrahiert werden kann
-
 print(f"Container Name: {container_name}")
 
 try:
-    # Erstelle Container Client
-    container_client = blob_service_client.get_container_client(container_name)
     
     # Liste alle Blobs im Container
     blobs = container_client.list_blobs()
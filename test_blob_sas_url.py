@@ -1,9 +1,13 @@
 import os
+import sys
 from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient
 from urllib.parse import urlparse
 import requests
 
+# Gleicher Modulpfad wie in document_training (ein blob_access-Modul, ein Client-Pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_training'))
+from blob_access import get_container_client, parse_sas_url
+
 # Lade Umgebungsvariablen aus config.env
 load_dotenv('config.env')
 
@@ -24,7 +28,7 @@ print(f"Pfad: {parsed_url.path}")
 print(f"Query: {parsed_url.query[:50]}..." if len(parsed_url.query) > 50 else f"Query: {parsed_url.query}")
 
 # Extrahiere Container-Name
-container_name = parsed_url.path.split('/')[-1]
+container_name = parse_sas_url(blob_sas_url).container_name
 print(f"Container Name: {container_name}")
 
 # Teste HTTP-Zugriff
@@ -43,10 +47,8 @@ except Exception as e:
 # Teste Container Client direkt (KORREKT für Container-SAS URLs)
 print(f"\nContainer Client Test (KORREKT):")
 try:
-    from azure.storage.blob import ContainerClient
-    
-    # Verwende ContainerClient direkt mit der Container-SAS URL
-    container_client = ContainerClient.from_container_url(blob_sas_url)
+    # Gemeinsamer ContainerClient aus der Container-SAS URL
+    container_client = get_container_client(sas_url=blob_sas_url)
     print("✅ ContainerClient erfolgreich erstellt")
     
     # Teste Container-Zugriff
@@ -70,8 +72,8 @@ except Exception as e:
 # Teste spezifische Blob-Operationen
 print(f"\nSpezifische Blob-Operationen Test:")
 try:
-    # Verwende den bereits erstellten ContainerClient
-    container_client = ContainerClient.from_container_url(blob_sas_url)
+    # Verwende den bereits erstellten (gecachten) ContainerClient
+    container_client = get_container_client(sas_url=blob_sas_url)
     
     # Teste ob Container existiert
     properties = container_client.get_container_properties()
@@ -3,6 +3,8 @@ import pdfplumber
 import fitz  # pymupdf
 import os
 
+from document_training.protocol_patterns import ANWESENHEIT_SECTION
+
 # Teste alle drei Methoden auf derselben PDF
 pdf_file = '2023_Juli_Stadtverordnetenversammlung_Niederschrift_STV.pdf'
 pdf_path = os.path.join('input', pdf_file)
@@ -103,7 +105,7 @@ print('\n=== TESTE SPEZIFISCHE MUSTER ===')
 # Teste Anwesenheitsliste
 if 'pypdf2_text' in locals():
     print('Anwesenheitsliste (PyPDF2):')
-    anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', pypdf2_text, re.DOTALL | re.IGNORECASE)
+    anwesen_match = ANWESENHEIT_SECTION.search(pypdf2_text)
     if anwesen_match:
         anwesen_text = anwesen_match.group(1).strip()
         print('   Gefunden:', len(anwesen_text), 'Zeichen')
@@ -114,7 +116,7 @@ if 'pypdf2_text' in locals():
 
 if 'pdfplumber_text' in locals():
     print('Anwesenheitsliste (pdfplumber):')
-    anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', pdfplumber_text, re.DOTALL | re.IGNORECASE)
+    anwesen_match = ANWESENHEIT_SECTION.search(pdfplumber_text)
     if anwesen_match:
         anwesen_text = anwesen_match.group(1).strip()
         print('   Gefunden:', len(anwesen_text), 'Zeichen')
@@ -125,7 +127,7 @@ if 'pdfplumber_text' in locals():
 
 if 'pymupdf_text' in locals():
     print('Anwesenheitsliste (pymupdf):')
-    anwesen_match = re.search(r'Anwesend[:\s]*(.*?)(?=Abwesend|TOP|Tagesordnung)', pymupdf_text, re.DOTALL | re.IGNORECASE)
+    anwesen_match = ANWESENHEIT_SECTION.search(pymupdf_text)
     if anwesen_match:
         anwesen_text = anwesen_match.group(1).strip()
         print('   Gefunden:', len(anwesen_text), 'Zeichen')
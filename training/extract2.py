@@ -1,5 +1,5 @@
-import re
 import os
+import sys
 import json
 import base64
 import pdfplumber
@@ -8,6 +8,11 @@ from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
 
+# Gemeinsame Protokoll-Muster aus document_training
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'document_training'))
+import protocol_patterns as patterns
+import attendance
+
 # Lade Umgebungsvariablen - angepasst für training Verzeichnis
 load_dotenv('../config.env')
 
@@ -40,7 +45,7 @@ class DocumentAnalyzer:
         
         try:
             # Versuche deutsches Format zu parsen (dd.mm.yyyy)
-            if re.match(r'\d{1,2}\.\d{1,2}\.\d{4}', date_string):
+            if patterns.DATE.match(date_string):
                 date_obj = datetime.strptime(date_string, '%d.%m.%Y')
                 return date_obj.strftime('%Y-%m-%dT00:00:00Z')
             else:
@@ -61,7 +66,7 @@ class DocumentAnalyzer:
             list: Liste von TOP-Dictionaries mit nummer, ueberschrift, vorlage, inhalt, abstimmung
         """
         # Finde das Ende der Tagesordnung (vor der Beschlussphase)
-        tagesordnung_match = re.search(r'TAGESORDNUNG\s*:?', text, re.IGNORECASE)
+        tagesordnung_match = patterns.AGENDA_HEADING.search(text)
         if not tagesordnung_match:
             return []
         
@@ -69,7 +74,7 @@ class DocumentAnalyzer:
         
         # Finde alle TOPs nach der Tagesordnung - nur am Zeilenanfang
         # Verwende MULTILINE Flag um ^ am Zeilenanfang zu erkennen
-        top_matches = list(re.finditer(r'^TOP\s+(\d+(?:\.\d+)?)', text[agenda_start:], re.IGNORECASE | re.MULTILINE))
+        top_matches = list(patterns.TOP_LINE_NUMBER.finditer(text[agenda_start:]))
         
         if len(top_matches) < 2:
             return []
@@ -98,19 +103,8 @@ class DocumentAnalyzer:
         beschluss_text = text[agenda_end:]
         
         # Finde das Ende der Beschlussphase (vor Unterschriften)
-        unterschrift_patterns = [
-            r'Die Vorsitzende.*?Schriftführer',
-            r'Vorsitzende.*?Schriftführer',
-            r'Unterschriften',
-            r'gez\..*?gez\.'
-        ]
-        
-        beschluss_end = len(beschluss_text)
-        for pattern in unterschrift_patterns:
-            match = re.search(pattern, beschluss_text, re.DOTALL | re.IGNORECASE)
-            if match:
-                beschluss_end = match.start()
-                break
+        _, match = patterns.first_match(patterns.SIGNATURE_SECTIONS, beschluss_text)
+        beschluss_end = match.start() if match else len(beschluss_text)
         
         beschluss_text = beschluss_text[:beschluss_end]
         
@@ -118,7 +112,7 @@ class DocumentAnalyzer:
         tops = []
         
         # Finde alle TOP-Positionen
-        top_positions = list(re.finditer(r'TOP\s+(\d+(?:\.\d+)?)', beschluss_text, re.IGNORECASE))
+        top_positions = list(patterns.TOP_NUMBER.finditer(beschluss_text))
         
         for i, match in enumerate(top_positions):
             top_num = match.group(1)
@@ -134,10 +128,7 @@ class DocumentAnalyzer:
             content = beschluss_text[start_pos:end_pos].strip()
             
             # Bereinige den Inhalt
-            content = re.sub(r'\n--- SEITE \d+ ---\n', '\n', content)
-            content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-            content = re.sub(r'Seite \d+ von \d+', '', content)
-            content = re.sub(r'STV/\d+/\d+-\d+', '', content)
+            content = patterns.clean_page_artifacts(content)
             
             # Teile in Überschrift, Vorlage, Inhalt und Abstimmung
             lines = content.split('\n')
@@ -179,20 +170,11 @@ class DocumentAnalyzer:
                 
                 # Suche nach Abstimmung
                 abstimmung = ''
-                abstimmung_patterns = [
-                    r'Abstimmungsergebnis:.*?(?=\n\n|\nTOP|\nDie Vorsitzende|$)',
-                    r'Abstimmung:.*?(?=\n\n|\nTOP|\nDie Vorsitzende|$)',
-                    r'Einstimmig beschlossen.*?(?=\n\n|\nTOP|\nDie Vorsitzende|$)',
-                    r'Mit Stimmenmehrheit beschlossen.*?(?=\n\n|\nTOP|\nDie Vorsitzende|$)'
-                ]
-                
-                for pattern in abstimmung_patterns:
-                    abstimmung_match = re.search(pattern, inhalt, re.DOTALL | re.IGNORECASE)
-                    if abstimmung_match:
-                        abstimmung = abstimmung_match.group(0).strip()
-                        # Entferne Abstimmung aus dem Inhalt
-                        inhalt = re.sub(pattern, '', inhalt, flags=re.DOTALL | re.IGNORECASE).strip()
-                        break
+                pattern, abstimmung_match = patterns.first_match(patterns.VOTE_SECTIONS, inhalt)
+                if abstimmung_match:
+                    abstimmung = abstimmung_match.group(0).strip()
+                    # Entferne Abstimmung aus dem Inhalt
+                    inhalt = pattern.sub('', inhalt).strip()
                 
                 tops.append({
                     'nummer': top_num,
@@ -215,7 +197,7 @@ class DocumentAnalyzer:
             str: Die vollständige Tagesordnung oder Fehlermeldung
         """
         # Finde TAGESORDNUNG: (flexibler)
-        tagesordnung_match = re.search(r'TAGESORDNUNG\s*:?', text, re.IGNORECASE)
+        tagesordnung_match = patterns.AGENDA_HEADING.search(text)
         if not tagesordnung_match:
             return 'TAGESORDNUNG: nicht gefunden'
         
@@ -223,7 +205,7 @@ class DocumentAnalyzer:
         
         # Finde alle TOPs nach der Tagesordnung - nur am Zeilenanfang
         # Verwende MULTILINE Flag um ^ am Zeilenanfang zu erkennen
-        top_matches = list(re.finditer(r'^TOP\s+(\d+(?:\.\d+)?)', text[agenda_start:], re.IGNORECASE | re.MULTILINE))
+        top_matches = list(patterns.TOP_LINE_NUMBER.finditer(text[agenda_start:]))
         
         if len(top_matches) < 2:
             return 'Nicht genügend TOPs gefunden'
@@ -254,10 +236,7 @@ class DocumentAnalyzer:
             agenda_text = text[agenda_start:agenda_end].strip()
             
             # Bereinige den Text
-            agenda_text = re.sub(r'\n--- SEITE \d+ ---\n', '\n', agenda_text)
-            agenda_text = re.sub(r'\n\s*\n\s*\n', '\n\n', agenda_text)
-            agenda_text = re.sub(r'Seite \d+ von \d+', '', agenda_text)
-            agenda_text = re.sub(r'STV/\d+/\d+-\d+', '', agenda_text)
+            agenda_text = patterns.clean_page_artifacts(agenda_text)
             
             return agenda_text.strip()
         
@@ -307,19 +286,9 @@ class DocumentAnalyzer:
         """
         # Erweiterte Suche nach Anwesenheitsbereich - berücksichtigt Seitenwechsel
         # Suche nach "Anwesend:" und dann alles bis zum nächsten Hauptabschnitt
-        attendance_patterns = [
-            r"Anwesend:(.*?)(?=TAGESORDNUNG:|Tagesordnung:)",  # Bis Tagesordnung (nur Hauptüberschrift)
-            r"Anwesend:(.*?)(?=\n\s*TOP\s+1\s)",  # Bis TOP 1 (erste Tagesordnung)
-            r"Anwesend:(.*?)(?=\n\s*[A-ZÄÖÜ][a-zäöüß]+\s*:|$)",  # Bis nächster Hauptabschnitt oder Ende
-            r"Anwesend:(.*?)(?=\n\s*\d+\.\s*[A-Z]|$)"  # Bis nummerierte Liste oder Ende
-        ]
-        
-        attendance_text = None
-        for pattern in attendance_patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                attendance_text = match.group(1)
-                break
+        # (Bis Tagesordnung, bis TOP 1, bis nächster Hauptabschnitt, bis nummerierte Liste)
+        _, match = patterns.first_match(patterns.ATTENDANCE_SECTIONS, text)
+        attendance_text = match.group(1) if match else None
         
         if not attendance_text:
             return {"error": "Anwesenheitsbereich nicht gefunden"}
@@ -328,20 +297,12 @@ class DocumentAnalyzer:
         result = {
             "anwesend": [],
             "entschuldigt": [],
-            "funktionen": {}
+            "funktionen": {},
+            "personen": []  # Strukturierte Einträge (attendance.py)
         }
         
         # Teile in Anwesend und Entschuldigt - erweitert für mehrseitige Suche
-        entschuldigt_patterns = [
-            r"Entschuldigt:(.*?)(?=Tagesordnung:|TOP\s*\d+|Beschluss|Protokoll|$)",
-            r"Entschuldigt:(.*?)$"
-        ]
-        
-        entschuldigt_match = None
-        for pattern in entschuldigt_patterns:
-            entschuldigt_match = re.search(pattern, attendance_text, re.DOTALL | re.IGNORECASE)
-            if entschuldigt_match:
-                break
+        _, entschuldigt_match = patterns.first_match(patterns.ENTSCHULDIGT_SECTIONS, attendance_text)
         
         if entschuldigt_match:
             anwesend_text = attendance_text[:entschuldigt_match.start()]
@@ -351,89 +312,31 @@ class DocumentAnalyzer:
             entschuldigt_text = ""
         
         # Parse Anwesende
-        result["anwesend"] = self._parse_attendance_section(anwesend_text)
+        result["anwesend"] = self._parse_attendance_section(anwesend_text, "present", result["personen"])
         
         # Parse Entschuldigte
         if entschuldigt_text:
-            result["entschuldigt"] = self._parse_attendance_section(entschuldigt_text)
+            result["entschuldigt"] = self._parse_attendance_section(entschuldigt_text, "excused", result["personen"])
         
         return result
     
-    def _parse_attendance_section(self, text):
+    def _parse_attendance_section(self, text, status="present", records=None):
         """
         Parst einen Anwesenheitsbereich und extrahiert Funktionen und Personen
-        Erweitert für mehrseitige Dokumente
+        (ein Muster je Zeile, TOP-Angaben und Vertretungen strukturiert, siehe attendance.py)
         
         Args:
             text (str): Text des Anwesenheitsbereichs
+            status (str): "present" oder "excused"
+            records (list): Sammelt die strukturierten Einträge (optional)
             
         Returns:
             list: Liste der Funktionen mit Personen
         """
-        functions = []
-        current_function = None
-        
-        # Bereinige den Text von Seitenmarkierungen und anderen Störungen
-        cleaned_text = self._clean_text_for_parsing(text)
-        lines = cleaned_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Ignoriere Seitennummern und Dokumentennamen
-            if re.match(r"^Seite \d+ von \d+$", line) or re.match(r"^STV/\d+/\d+-\d+$", line):
-                continue
-            
-            # Prüfe ob es eine Funktionsüberschrift ist (erweitert um "Von der Verwaltung:")
-            if re.match(r"^(Von der|Vom|Schriftführer)", line, re.IGNORECASE):
-                current_function = line
-                functions.append({
-                    "funktion": current_function,
-                    "personen": []
-                })
-            # Prüfe ob es eine Person ist (beginnt mit STV, Stadtrat, etc.)
-            elif re.match(r"^(STV|Stadtrat|Bürgermeister|Erster Stadtrat)", line, re.IGNORECASE):
-                if current_function and functions:
-                    functions[-1]["personen"].append(line)
-                else:
-                    # Fallback für Personen ohne Funktionsüberschrift
-                    functions.append({
-                        "funktion": "Unbekannt",
-                        "personen": [line]
-                    })
-            # Spezialfall: Schriftführer oder Verwaltung mit Namen (ohne Funktionspräfix)
-            elif current_function and ("Schriftführer" in current_function or "Verwaltung" in current_function) and not re.match(r"^(STV|Stadtrat|Bürgermeister|Erster Stadtrat)", line, re.IGNORECASE):
-                # Wenn wir bei Schriftführer oder Verwaltung sind und die Zeile nicht mit einer Funktion beginnt, ist es wahrscheinlich der Name
-                if functions and functions[-1]["funktion"] == current_function:
-                    functions[-1]["personen"].append(line)
-        
-        return functions
-    
-    def _clean_text_for_parsing(self, text):
-        """
-        Bereinigt Text für besseres Parsing - entfernt Seitenwechsel-Störungen
-        
-        Args:
-            text (str): Roher Text
-            
-        Returns:
-            str: Bereinigter Text
-        """
-        # Entferne Seitenwechsel-Markierungen, aber behalte den Inhalt
-        cleaned = text
-        
-        # Entferne "--- SEITE X ---" Markierungen
-        cleaned = re.sub(r'\n--- SEITE \d+ ---\n', '\n', cleaned)
-        
-        # Entferne mehrfache Leerzeilen
-        cleaned = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned)
-        
-        # Entferne Seitenzahlen am Ende von Zeilen
-        cleaned = re.sub(r'\s+\d+\s*$', '', cleaned, flags=re.MULTILINE)
-        
-        return cleaned
+        section_records = attendance.parse_section(text, status)
+        if records is not None:
+            records.extend(section_records)
+        return attendance.group_by_function(section_records)
     
     def convert_to_custom_format(self, results):
         """
@@ -459,7 +362,19 @@ class DocumentAnalyzer:
         # Anwesenheitsdaten konvertieren - vereinfachte Struktur
         attendance = []
         
-        if isinstance(attendance_data, dict) and 'error' not in attendance_data:
+        if isinstance(attendance_data, dict) and 'error' not in attendance_data and attendance_data.get('personen'):
+            # Strukturierte Einträge (attendance.py) mit Teilnahme an einzelnen TOPs und Vertretung
+            for record in attendance_data['personen']:
+                attendance.append({
+                    "name": record['label'],
+                    "function": record['function'],
+                    "status": record['status'],
+                    "partial": record['partial'],
+                    "from_top": record['from_top'],
+                    "to_top": record['to_top'],
+                    "substitute_for": record['substitute_for']
+                })
+        elif isinstance(attendance_data, dict) and 'error' not in attendance_data:
             # Anwesende Personen konvertieren
             for func in attendance_data.get('anwesend', []):
                 for person in func.get('personen', []):
@@ -562,27 +477,27 @@ class DocumentAnalyzer:
         }
         
         # 1. Dokumenttyp erkennen (nach "NIEDERSCHRIFT")
-        niederschrift_match = re.search(r"NIEDERSCHRIFT", text, re.IGNORECASE)
+        niederschrift_match = patterns.NIEDERSCHRIFT.search(text)
         if niederschrift_match:
             metadata["dokumenttyp"] = "Niederschrift"
         
         # 2. Sitzungsart extrahieren (nach "über die Sitzung der" und vor "der Stadt Pohlheim")
-        sitzung_match = re.search(r"über die Sitzung der ([^\n]+) der Stadt Pohlheim", text, re.IGNORECASE)
+        sitzung_match = patterns.SITZUNG.search(text)
         if sitzung_match:
             metadata["sitzungsart"] = sitzung_match.group(1).strip()
         
         # 3. Tag extrahieren (nach "Tag:")
-        tag_match = re.search(r"Tag:\s*([^\n]+)", text, re.IGNORECASE)
+        tag_match = patterns.TAG.search(text)
         if tag_match:
             metadata["tag"] = tag_match.group(1).strip()
         
         # 4. Dauer extrahieren (nach "Dauer:")
-        dauer_match = re.search(r"Dauer:\s*([^\n]+)", text, re.IGNORECASE)
+        dauer_match = patterns.DAUER.search(text)
         if dauer_match:
             metadata["dauer"] = dauer_match.group(1).strip()
         
         # 5. Ort extrahieren (nach "Ort:")
-        ort_match = re.search(r"Ort:\s*([^\n]+)", text, re.IGNORECASE)
+        ort_match = patterns.ORT_FIELD.search(text)
         if ort_match:
             metadata["ort"] = ort_match.group(1).strip()
         
@@ -629,7 +544,7 @@ class DocumentAnalyzer:
             list: Liste aller Anwesenheits-Vorkommen
         """
         # Finde alle Anwesenheits-Vorkommen
-        attendance_matches = re.findall(r"(STV|Stadtrat|Bürgermeister|Erster Stadtrat)\s+[^\\n]+", text, re.IGNORECASE)
+        attendance_matches = patterns.PERSON_LINE.findall(text)
         return attendance_matches
     
     def find_all_tops_in_text(self, text):
@@ -643,7 +558,7 @@ class DocumentAnalyzer:
             list: Liste aller TOP-Vorkommen
         """
         # Finde alle TOP-Vorkommen
-        top_matches = re.findall(r"TOP\s\d+[^\n]*", text, re.IGNORECASE)
+        top_matches = patterns.TOP_MENTION.findall(text)
         return top_matches
     
     def extract_tops_from_layout(self, response):
@@ -660,7 +575,7 @@ class DocumentAnalyzer:
         
         for page in response.pages:
             for line in page.lines:
-                if re.match(r"TOP\s\d+:", line.content):
+                if patterns.TOP_HEADING.match(line.content):
                     top_info = {
                         "content": line.content,
                         "page_number": page.page_number,
@@ -827,6 +742,10 @@ def process_all_pdfs_in_folder(folder_path):
     analyzer = DocumentAnalyzer()
     successful_count = 0
     
+    # Personen-Index über alle Sitzungen (neben dem output Ordner)
+    roster_file = os.path.join(os.path.dirname(folder_path), "roster_index.json")
+    roster = attendance.RosterIndex(roster_file)
+    
     for i, pdf_file in enumerate(pdf_files, 1):
         pdf_path = os.path.join(folder_path, pdf_file)
         print(f"\n📄 [{i}/{len(pdf_files)}] Verarbeite: {pdf_file}")
@@ -864,6 +783,10 @@ def process_all_pdfs_in_folder(folder_path):
                 anwesend_count = sum(len(func['personen']) for func in results['attendance_data']['anwesend'])
                 entschuldigt_count = sum(len(func['personen']) for func in results['attendance_data']['entschuldigt'])
                 print(f"   👥 Anwesend: {anwesend_count}, ❌ Entschuldigt: {entschuldigt_count}")
+                
+                roster.add_session(custom_format["id"], results['attendance_data']['personen'],
+                                   custom_format["date"], custom_format["session_type"],
+                                   os.stat(custom_file).st_mtime_ns)
             
             successful_count += 1
             
@@ -874,6 +797,9 @@ def process_all_pdfs_in_folder(folder_path):
     print("\n" + "=" * 60)
     print(f"🎉 VERARBEITUNG ABGESCHLOSSEN!")
     print(f"   ✅ Erfolgreich verarbeitet: {successful_count}/{len(pdf_files)} Dateien")
+    if successful_count > 0:
+        roster.save()
+        print(f"   👥 Personen-Index: {roster_file} ({len(roster.people)} Personen, {len(roster.sessions)} Sitzungen)")
     output_folder = os.path.join(os.path.dirname(folder_path), "output")
     print(f"   📁 Alle .json Dateien wurden im Ordner gespeichert:")
     print(f"      {output_folder}")